@@ -1,7 +1,12 @@
 """Точка входа CLI-утилиты passgen."""
 
 import argparse
+from passgen.bloom import DEFAULT_ERROR_RATE
 from passgen.commands import handle_commands
+from passgen.generator import BACKENDS, available_backends
+from passgen.exporter import EXPORT_FORMATS
+from passgen.importer import IMPORT_FORMATS
+from passgen.passphrase import DEFAULT_WORDS, WORDLIST_FILE
 
 
 def main() -> None:
@@ -21,6 +26,41 @@ def main() -> None:
         "-l", "--length", type=int, default=12,
         help="Длина пароля (по умолчанию %(default)s)"
     )
+    gen_group.add_argument(
+        "-p", "--pattern", type=str, metavar="'шаблон'",
+        help="Генерировать по шаблону, например 'Cvcc-9999-ssss' "
+             "(c/C — согласная, v/V — гласная, a/A — буква, 9 — цифра, "
+             "s — спецсимвол, x — буква или цифра, * — любой, \\ — литерал)"
+    )
+    gen_group.add_argument(
+        "-n", "--count", type=int, default=1,
+        help="Количество паролей (по умолчанию %(default)s)"
+    )
+    gen_group.add_argument(
+        "-o", "--output", type=str, metavar="FILE",
+        help="Потоково записать пароли в файл ('-' — в stdout), без сохранения в БД"
+    )
+    gen_group.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help="Количество процессов для потоковой генерации (по умолчанию — число CPU)"
+    )
+    gen_group.add_argument(
+        "--unordered", action="store_true",
+        help="Выводить пакеты по мере готовности, а не в порядке постановки"
+    )
+    gen_group.add_argument(
+        "--unique", action="store_true",
+        help="Гарантировать отсутствие повторов в пакете (фильтр Блума)"
+    )
+    gen_group.add_argument(
+        "--unique-error-rate", type=float, default=DEFAULT_ERROR_RATE, metavar="P",
+        help="Доля ложных срабатываний фильтра Блума (по умолчанию %(default)s)"
+    )
+    gen_group.add_argument(
+        "--backend", choices=BACKENDS, default="python",
+        help="Бэкенд пакетной генерации (по умолчанию %(default)s; numpy — при установленном "
+             "NumPy, только для обычного алфавита: без --pattern, --passphrase и параметров политики)"
+    )
     gen_group.add_argument(
         "-s", "--special", action="store_true",
         help="Включать спецсимволы"
@@ -34,6 +74,71 @@ def main() -> None:
         help="Включать заглавные буквы"
     )
     
+    # Группа для парольных фраз
+    phrase_group = parser.add_argument_group("Парольные фразы")
+    phrase_group.add_argument(
+        "--passphrase", action="store_true",
+        help="Вместе с -g: сгенерировать парольную фразу из списка слов"
+    )
+    phrase_group.add_argument(
+        "--words", type=int, default=DEFAULT_WORDS, metavar="N",
+        help="Количество слов в фразе (по умолчанию %(default)s)"
+    )
+    phrase_group.add_argument(
+        "--wordlist", type=str, default=WORDLIST_FILE, metavar="FILE",
+        help="Файл со списком слов (по умолчанию — список, поставляемый с пакетом)"
+    )
+    phrase_group.add_argument(
+        "--separator", type=str, default="-",
+        help="Разделитель слов (по умолчанию '%(default)s')"
+    )
+    
+    # Группа для политики генерации
+    policy_group = parser.add_argument_group("Политика генерации")
+    policy_group.add_argument(
+        "--require-all", action="store_true",
+        help="Гарантировать хотя бы один символ каждого включенного типа"
+    )
+    policy_group.add_argument(
+        "--min-upper", dest="min_uppercase", type=int, default=0, metavar="N",
+        help="Минимальное количество заглавных букв"
+    )
+    policy_group.add_argument(
+        "--min-digits", type=int, default=0, metavar="N",
+        help="Минимальное количество цифр"
+    )
+    policy_group.add_argument(
+        "--min-special", type=int, default=0, metavar="N",
+        help="Минимальное количество спецсимволов"
+    )
+    policy_group.add_argument(
+        "--exclude-ambiguous", action="store_true",
+        help="Исключить похожие символы (I, l, 1, O, 0 и т.п.)"
+    )
+    policy_group.add_argument(
+        "--alphabet", type=str, metavar="'символы'",
+        help="Собственный алфавит вместо стандартных типов символов"
+    )
+    
+    # Группа для оценки стойкости
+    score_group = parser.add_argument_group("Оценка стойкости")
+    score_group.add_argument(
+        "--score", action="store_true",
+        help="Вместе с -g: показать оценку стойкости сгенерированных паролей"
+    )
+    score_group.add_argument(
+        "--audit", action="store_true",
+        help="Проверить стойкость всех паролей в БД и показать слабые"
+    )
+    score_group.add_argument(
+        "--min-score", type=int, default=2, choices=range(5), metavar="0-4",
+        help="Пароли с оценкой ниже этой считаются слабыми (по умолчанию %(default)s)"
+    )
+    score_group.add_argument(
+        "--dictionary", type=str, metavar="FILE",
+        help="Файл словаря для поиска словарных слов в паролях"
+    )
+    
     # Группа для сохранения пароля
     save_group = parser.add_argument_group("Сохранение пароля")
     save_group.add_argument(
@@ -51,17 +156,75 @@ def main() -> None:
         "--find-by-service", type=str, metavar="'service'",
         help="Найти все пароли для указанного сервиса"
     )
+    find_group.add_argument(
+        "--find-service-like", type=str, metavar="'text'",
+        help="Найти записи, у которых сервис начинается с текста, содержит его "
+             "или похож на него. Пример: --find-service-like 'goog'"
+    )
+    find_group.add_argument(
+        "--find-username-like", type=str, metavar="'text'",
+        help="То же для имени пользователя"
+    )
     find_group.add_argument(
         "--find-by-both", type=str, metavar="'username:service'",
         help="Найти пароль по имени и сервису. Формат: --find-by-both 'ivan:gmail'"
     )
     
+    # Группа для импорта и экспорта
+    transfer_group = parser.add_argument_group("Импорт и экспорт")
+    transfer_group.add_argument(
+        "--import", dest="import_file", type=str, metavar="FILE",
+        help="Импортировать пароли из CSV (username,service,password) или "
+             "JSON Lines; '-' — из stdin"
+    )
+    transfer_group.add_argument(
+        "--import-format", choices=IMPORT_FORMATS, default=None,
+        help="Формат файла импорта (по умолчанию — по расширению)"
+    )
+    transfer_group.add_argument(
+        "--export", dest="export_file", type=str, metavar="FILE",
+        help="Экспортировать все записи с паролями в открытом виде; '-' — в stdout"
+    )
+    transfer_group.add_argument(
+        "--export-format", choices=EXPORT_FORMATS, default="csv",
+        help="Формат экспорта (по умолчанию: csv)"
+    )
+    
+    # Группа для обслуживания БД
+    maintenance_group = parser.add_argument_group("Обслуживание БД")
+    maintenance_group.add_argument(
+        "--migrate", action="store_true",
+        help="Создать или обновить схему БД (применить недостающие миграции)"
+    )
+    maintenance_group.add_argument(
+        "--migrate-storage", action="store_true",
+        help="Перевести зашифрованные пароли в компактный формат хранения v2"
+    )
+    maintenance_group.add_argument(
+        "--rekey", action="store_true",
+        help="Добавить новый ключ шифрования и перешифровать им все пароли "
+             "(прерванный запуск продолжается с места остановки)"
+    )
+    
     # Группа для отображения
     display_group = parser.add_argument_group("Отображение данных")
     display_group.add_argument(
         "--show-all", action="store_true",
         help="Показать все записи из базы данных"
     )
+    display_group.add_argument(
+        "--masked", action="store_true",
+        help="Вместе с --show-all: не читать и не расшифровывать пароли"
+    )
+    display_group.add_argument(
+        "--limit", type=int, default=None, metavar="N",
+        help="Выводить по N записей (для --show-all, --find-by-username, --find-by-service; "
+             "для поиска --find-*-like — не более N результатов)"
+    )
+    display_group.add_argument(
+        "--after", type=str, default=None, metavar="CURSOR",
+        help="Курсор следующей страницы из предыдущего вывода с --limit"
+    )
 
     args = parser.parse_args()
     
@@ -78,9 +241,49 @@ def main() -> None:
             "Пример: --find-by-both 'ivan:gmail'"
         )
     
+    if args.output and not args.generate:
+        parser.error("Аргумент --output используется только вместе с --generate")
+    
+    if args.workers is not None and args.workers <= 0:
+        parser.error("Аргумент --workers должен быть положительным числом")
+    
+    if not 0 < args.unique_error_rate < 1:
+        parser.error("Аргумент --unique-error-rate должен быть в интервале (0, 1)")
+    
+    if args.passphrase and not args.generate:
+        parser.error("Аргумент --passphrase используется только вместе с --generate")
+    
+    if args.words <= 0:
+        parser.error("Аргумент --words должен быть положительным числом")
+    
+    if args.masked and not args.show_all:
+        parser.error("Аргумент --masked используется только вместе с --show-all")
+    
+    if args.limit is not None and args.limit <= 0:
+        parser.error("Аргумент --limit должен быть положительным числом")
+    
+    if args.after and args.limit is None:
+        parser.error("Аргумент --after используется только вместе с --limit")
+    
+    if args.after and (args.find_service_like or args.find_username_like):
+        parser.error("Поиск --find-service-like/--find-username-like не постраничный: "
+                     "--after с ним не используется (--limit задает число результатов)")
+    
+    uses_policy = (args.require_all or args.min_uppercase or args.min_digits
+                   or args.min_special or args.exclude_ambiguous or args.alphabet)
+    if args.backend != "python" and (args.pattern or args.passphrase or uses_policy):
+        parser.error(f"Бэкенд '{args.backend}' не поддерживает --pattern, --passphrase "
+                     "и параметры политики")
+    
+    if args.backend not in available_backends():
+        parser.error(f"Бэкенд '{args.backend}' недоступен: установите пакет {args.backend}")
+    
     # Проверка, что передана хотя бы одна команда
     if not any([args.generate, args.save, args.find_by_username, 
-                args.find_by_service, args.find_by_both, args.show_all]):
+                args.find_by_service, args.find_service_like,
+                args.find_username_like, args.find_by_both, args.show_all,
+                args.audit, args.import_file, args.export_file, args.migrate,
+                args.migrate_storage, args.rekey]):
         parser.print_help()
         return
 
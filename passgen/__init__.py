@@ -1,6 +1,6 @@
 """Пакет passgen — генератор и менеджер безопасных паролей."""
 
-from .generator import generate_password
+from .generator import generate_password, generate_passwords
 from .utils import validate_args
 from .storage import encrypt_password, decrypt_password
 from .commands import handle_commands
@@ -8,6 +8,7 @@ from .database import PasswordDatabase
 
 __all__ = [
     'generate_password',
+    'generate_passwords',
     'validate_args',
     'encrypt_password',
     'decrypt_password',
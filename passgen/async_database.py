@@ -0,0 +1,207 @@
+"""Модуль асинхронного доступа к базе данных PostgreSQL.
+
+AsyncPasswordDatabase повторяет основные методы PasswordDatabase для
+приложений на asyncio. Запросы выполняются драйвером asyncpg через его
+асинхронный пул соединений и не блокируют цикл событий. Шифрование
+и расшифровка — работа процессора — выносятся в пул потоков
+(run_in_executor), поэтому сотни одновременных запросов перекрываются,
+а не выполняются по очереди.
+
+Необязательная зависимость: если asyncpg не установлен, модуль
+импортируется, но is_available() возвращает False.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - зависит от окружения
+    asyncpg = None
+
+from .config import get_crypto_params, get_db_params, get_pool_params
+from .crypto_engine import CryptoEngine
+from .database import TOKEN_COLUMN
+from .records import PasswordRecord, decrypt_records
+from .storage import decrypt_password, encrypt_token
+
+
+def is_available() -> bool:
+    """Проверяет, установлен ли asyncpg."""
+    return asyncpg is not None
+
+
+class AsyncPasswordDatabase:
+    """Класс асинхронного управления паролями в базе данных PostgreSQL.
+
+    Схема не создается и не проверяется: она должна быть обновлена
+    заранее (python main.py --migrate).
+    """
+
+    def __init__(self, executor: Optional[Executor] = None):
+        """Инициализация без подключения к БД.
+
+        Пул соединений создается при первом запросе.
+
+        Args:
+            executor (Optional[Executor]): Пул для шифрования и расшифровки.
+                По умолчанию — пул потоков цикла событий.
+        """
+        self.config = get_db_params()
+        self.crypto = CryptoEngine(**get_crypto_params())
+        self._executor = executor
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        """Возвращает пул соединений asyncpg, создавая его при первом обращении.
+
+        Raises:
+            RuntimeError: Если asyncpg не установлен
+        """
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    if asyncpg is None:
+                        raise RuntimeError(
+                            "Асинхронный доступ недоступен: установите пакет asyncpg"
+                        )
+                    pool_params = get_pool_params()
+                    params = dict(self.config)
+                    params['database'] = params.pop('dbname')
+                    self._pool = await asyncpg.create_pool(
+                        min_size=pool_params['minconn'],
+                        max_size=pool_params['maxconn'],
+                        **params
+                    )
+        return self._pool
+
+    async def _run(self, func: Callable, *args):
+        """Выполняет func в пуле потоков, не блокируя цикл событий."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def close(self) -> None:
+        """Закрывает пул соединений и пул движка шифрования."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        self.crypto.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def save_password(self, username: str, service: str, password: str) -> None:
+        """Сохраняет пароль в базу данных.
+
+        Args:
+            username (str): Имя пользователя
+            service (str): Название сервиса
+            password (str): Пароль в открытом виде
+        """
+        encrypted = await self._run(encrypt_token, password)
+        query = """
+        INSERT INTO passwords (username, service, encrypted_token)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (username, service)
+        DO UPDATE SET
+            encrypted_token = EXCLUDED.encrypted_token,
+            encrypted_password = NULL,
+            created_at = CURRENT_TIMESTAMP
+        """
+        pool = await self._get_pool()
+        await pool.execute(query, username, service, encrypted)
+
+    async def get_password(self, username: str, service: str) -> Optional[str]:
+        """Получает и расшифровывает пароль.
+
+        Args:
+            username (str): Имя пользователя
+            service (str): Название сервиса
+
+        Returns:
+            Optional[str]: Пароль в открытом виде или None
+        """
+        query = f"""
+        SELECT {TOKEN_COLUMN} FROM passwords
+        WHERE username = $1 AND service = $2
+        """
+        pool = await self._get_pool()
+        row = await pool.fetchrow(query, username, service)
+        if row is None:
+            return None
+        return await self._run(decrypt_password, row[0])
+
+    async def _search(self, query: str, value: str) -> List[Tuple[str, str]]:
+        """Выполняет поиск и расшифровывает пароли одним пакетом в пуле потоков."""
+        pool = await self._get_pool()
+        rows = await pool.fetch(query, value)
+        passwords = await self._run(self.crypto.decrypt_many, [row[1] for row in rows])
+        return [(row[0], password) for row, password in zip(rows, passwords)]
+
+    async def search_by_username(self, username: str) -> List[Tuple[str, str]]:
+        """Ищет все записи по имени пользователя.
+
+        Args:
+            username (str): Имя пользователя
+
+        Returns:
+            List[Tuple[str, str]]: Список (сервис, пароль в открытом виде)
+        """
+        query = f"""
+        SELECT service, {TOKEN_COLUMN} FROM passwords
+        WHERE username = $1
+        ORDER BY service
+        """
+        return await self._search(query, username)
+
+    async def search_by_service(self, service: str) -> List[Tuple[str, str]]:
+        """Ищет все записи по названию сервиса.
+
+        Args:
+            service (str): Название сервиса
+
+        Returns:
+            List[Tuple[str, str]]: Список (имя пользователя, пароль в открытом виде)
+        """
+        query = f"""
+        SELECT username, {TOKEN_COLUMN} FROM passwords
+        WHERE service = $1
+        ORDER BY username
+        """
+        return await self._search(query, service)
+
+    async def get_all_records(self, with_passwords: bool = True) -> List[PasswordRecord]:
+        """Возвращает все записи из БД.
+
+        Пароли не расшифровываются: обращение к password у записи
+        выполнит расшифровку синхронно. Чтобы не блокировать цикл событий,
+        расшифруйте нужные записи через decrypt_records.
+
+        Args:
+            with_passwords (bool): Выбирать ли зашифрованные пароли
+
+        Returns:
+            List[PasswordRecord]: Список записей
+        """
+        token_column = TOKEN_COLUMN if with_passwords else "NULL"
+        query = f"""
+        SELECT username, service, {token_column}, created_at
+        FROM passwords
+        ORDER BY username, service
+        """
+        pool = await self._get_pool()
+        rows = await pool.fetch(query)
+        return [PasswordRecord(*row) for row in rows]
+
+    async def decrypt_records(self, records: List[PasswordRecord]) -> None:
+        """Расшифровывает пароли записей одним пакетом в пуле потоков.
+
+        Args:
+            records (List[PasswordRecord]): Записи из get_all_records
+        """
+        await self._run(decrypt_records, records, self.crypto)
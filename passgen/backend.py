@@ -0,0 +1,174 @@
+"""Модуль интерфейса хранилища паролей и выбора его реализации.
+
+StorageBackend описывает операции, которые команды выполняют над
+хранилищем. Реализации:
+
+    postgresql — PasswordDatabase (passgen.database), сервер PostgreSQL;
+    sqlite     — SQLitePasswordDatabase (passgen.sqlite_backend),
+                 встроенная БД в локальном файле.
+
+Реализация выбирается в config.BACKEND; create_database() создает ее.
+Шифрование, записи с ленивой расшифровкой и курсоры страниц у всех
+реализаций общие, поэтому данные, экспортированные из одной, без
+изменений импортируются в другую.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import get_backend_name, get_sqlite_params
+from .crypto_engine import CryptoEngine
+from .pagination import Page
+from .records import PasswordRecord, decrypt_records
+
+BACKENDS = ("postgresql", "sqlite")
+
+# Колонки, по которым возможен поиск по префиксу и подстроке
+SEARCH_COLUMNS = ("username", "service")
+
+# Максимальное количество результатов поиска по умолчанию
+SEARCH_LIMIT = 20
+
+# Количество строк, получаемых за один fetchmany при экспорте
+EXPORT_BATCH_SIZE = 2000
+
+# Количество строк, переводимых в формат v2 за одну транзакцию
+MIGRATION_BATCH_SIZE = 5000
+
+# Количество строк, перешифровываемых за одну транзакцию
+REKEY_BATCH_SIZE = 2000
+
+
+class StorageBackend(ABC):
+    """Интерфейс хранилища паролей.
+
+    Attributes:
+        crypto (CryptoEngine): Движок пакетного шифрования.
+    """
+
+    crypto: CryptoEngine
+
+    @abstractmethod
+    def schema_is_current(self) -> bool:
+        """Проверяет, что к хранилищу применены все миграции схемы."""
+
+    @abstractmethod
+    def migrate(self) -> List[int]:
+        """Применяет недостающие миграции; возвращает их номера."""
+
+    def create_table(self) -> None:
+        """Создает таблицу для хранения паролей (применяет миграции схемы)."""
+        self.migrate()
+
+    @abstractmethod
+    def save_password(self, username: str, service: str, password: str) -> None:
+        """Сохраняет пароль (вставка или замена по паре username, service)."""
+
+    @abstractmethod
+    def save_passwords(self, records: Iterable[Tuple[str, str, str]]) -> int:
+        """Сохраняет пакет (username, service, пароль) одной операцией."""
+
+    @abstractmethod
+    def import_records(self, batches: Iterable[List[Tuple[str, str, str]]],
+                       progress=None) -> int:
+        """Загружает пакеты записей в одной транзакции."""
+
+    @abstractmethod
+    def get_password(self, username: str, service: str) -> Optional[str]:
+        """Возвращает расшифрованный пароль или None."""
+
+    @abstractmethod
+    def search_by_username(self, username: str) -> List[Tuple[str, str]]:
+        """Возвращает (сервис, пароль) для пользователя."""
+
+    @abstractmethod
+    def search_by_service(self, service: str) -> List[Tuple[str, str]]:
+        """Возвращает (имя пользователя, пароль) для сервиса."""
+
+    @abstractmethod
+    def get_all_records(self, with_passwords: bool = True) -> List[PasswordRecord]:
+        """Возвращает все записи в порядке (username, service)."""
+
+    @abstractmethod
+    def search_like(self, column: str, term: str,
+                    limit: int = SEARCH_LIMIT) -> List[PasswordRecord]:
+        """Ищет записи по префиксу или подстроке в column."""
+
+    @abstractmethod
+    def get_records_page(self, limit: int, after: Optional[str] = None,
+                         with_passwords: bool = True) -> Page:
+        """Возвращает страницу записей в порядке (username, service)."""
+
+    @abstractmethod
+    def search_by_username_page(self, username: str, limit: int,
+                                after: Optional[str] = None) -> Page:
+        """Возвращает страницу результатов search_by_username."""
+
+    @abstractmethod
+    def search_by_service_page(self, service: str, limit: int,
+                               after: Optional[str] = None) -> Page:
+        """Возвращает страницу результатов search_by_service."""
+
+    @abstractmethod
+    def iter_records(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[PasswordRecord]:
+        """Потоково возвращает все записи с расшифрованными паролями."""
+
+    @abstractmethod
+    def migrate_storage(self, batch_size: int = MIGRATION_BATCH_SIZE,
+                        progress=None) -> int:
+        """Переводит строки формата v1 в формат v2."""
+
+    @abstractmethod
+    def rekey(self, batch_size: int = REKEY_BATCH_SIZE,
+              checkpoint_file: Optional[str] = None,
+              progress=None) -> Dict[str, int]:
+        """Перешифровывает все пароли основным ключом."""
+
+    def decrypt_records(self, records: List[PasswordRecord]) -> None:
+        """Расшифровывает пароли всех записей одним пакетом через CryptoEngine.
+
+        Args:
+            records (List[PasswordRecord]): Записи из get_all_records
+        """
+        decrypt_records(records, self.crypto)
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+        self.crypto.close()
+
+    @staticmethod
+    def _check_search(column: str, term: str) -> str:
+        """Проверяет параметры поиска и возвращает строку без пробелов по краям.
+
+        Raises:
+            ValueError: Если колонка не поддерживается или строка пуста
+        """
+        if column not in SEARCH_COLUMNS:
+            raise ValueError(f"Поиск по колонке '{column}' не поддерживается")
+        term = term.strip()
+        if not term:
+            raise ValueError("Строка поиска не может быть пустой")
+        return term
+
+
+def create_database(backend: Optional[str] = None) -> StorageBackend:
+    """Создает хранилище, выбранное в config.BACKEND.
+
+    Args:
+        backend (Optional[str]): "postgresql" или "sqlite". По умолчанию —
+            из config.BACKEND.
+
+    Returns:
+        StorageBackend: Хранилище
+
+    Raises:
+        ValueError: Если реализация неизвестна
+    """
+    backend = backend or get_backend_name()
+    if backend == "postgresql":
+        from .database import PasswordDatabase
+        return PasswordDatabase()
+    if backend == "sqlite":
+        from .sqlite_backend import SQLitePasswordDatabase
+        return SQLitePasswordDatabase(**get_sqlite_params())
+    raise ValueError(f"Неизвестное хранилище: {backend}")
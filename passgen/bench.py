@@ -0,0 +1,362 @@
+"""Набор бенчмарков для путей генерации паролей.
+
+Запуск как отдельного скрипта:
+
+    python -m passgen.bench generate [--quick] [--output results.json]
+    python -m passgen.bench cipher [--quick] [--output results.json]
+
+Результат выводится в JSON. Набор generate: скорость в паролях и байтах
+в секунду для generate_password и generate_passwords по длинам, комбинациям
+флагов алфавита, размерам пакетов и всем доступным бэкендам, а также
+проверка равномерности распределения символов по критерию хи-квадрат для
+каждого алфавита из комбинаций флагов и каждого пути генерации (бэкенды,
+многопроцессная генерация, политики), чтобы ускорение не внесло смещение
+незаметно.
+
+Набор cipher: скорость шифрования и расшифровки и размер токена для каждого
+шифра хранилища (Fernet и AEAD) на одноразовом ключе в памяти.
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import math
+import platform
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence
+
+from cryptography.fernet import Fernet
+
+from .ciphers import AEAD_VERSIONS, FERNET, AeadCipher
+from .generator import (
+    available_backends, build_alphabet, generate_password, generate_passwords
+)
+from .parallel import iter_passwords_parallel
+from .policy import compile_policy
+
+# Уровень значимости, ниже которого распределение считается неравномерным
+UNIFORMITY_ALPHA = 0.001
+
+# Параметры полного прогона
+DEFAULT_LENGTHS = (8, 16, 32, 64)
+DEFAULT_BATCH_SIZES = (1, 100, 10000)
+FLAG_COMBINATIONS = tuple(itertools.product((False, True), repeat=3))
+
+# Длина паролей политики при проверке равномерности
+POLICY_LENGTH = 16
+
+
+def _measure(func: Callable[[], int], min_time: float) -> tuple:
+    """Многократно вызывает func, пока не наберется min_time секунд.
+
+    Args:
+        func (Callable[[], int]): Функция, возвращающая число сгенерированных паролей.
+        min_time (float): Минимальное суммарное время замера в секундах.
+
+    Returns:
+        tuple: (всего паролей, затраченное время в секундах)
+    """
+    total = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        total += func()
+        elapsed = time.perf_counter() - start
+    return total, elapsed
+
+
+def _chi_square(observed: Sequence[int], alpha: float = UNIFORMITY_ALPHA) -> Dict:
+    """Проверяет, что наблюдаемые частоты категорий одинаковы.
+
+    p-значение считается по аппроксимации Уилсона–Хилферти, достаточно
+    точной при числе степеней свободы больше 10.
+
+    Args:
+        observed (Sequence[int]): Количество наблюдений в каждой категории.
+        alpha (float): Уровень значимости.
+
+    Returns:
+        Dict: Словарь с ключами 'chi2', 'df', 'p_value', 'uniform'.
+    """
+    expected = sum(observed) / len(observed)
+    chi2 = sum((count - expected) ** 2 / expected for count in observed)
+    df = len(observed) - 1
+
+    k = 2 / (9 * df)
+    z = ((chi2 / df) ** (1 / 3) - (1 - k)) / math.sqrt(k)
+    p_value = 0.5 * math.erfc(z / math.sqrt(2))
+    return {
+        'chi2': round(chi2, 2),
+        'df': df,
+        'p_value': round(p_value, 6),
+        'uniform': p_value >= alpha,
+    }
+
+
+def _char_counts(sample: str, alphabet: str) -> tuple:
+    """Возвращает (частоты символов alphabet, нет ли в sample чужих символов)."""
+    counts = Counter(sample)
+    return [counts.get(c, 0) for c in alphabet], set(counts) <= set(alphabet)
+
+
+def chi_square_uniformity(sample: str, alphabet: str, alpha: float = UNIFORMITY_ALPHA) -> Dict:
+    """Проверяет равномерность символов выборки по критерию хи-квадрат.
+
+    Args:
+        sample (str): Сгенерированные символы.
+        alphabet (str): Алфавит, из которого они выбирались.
+        alpha (float): Уровень значимости. По умолчанию UNIFORMITY_ALPHA.
+
+    Returns:
+        Dict: Словарь с ключами 'chi2', 'df', 'p_value', 'uniform'.
+    """
+    observed, known = _char_counts(sample, alphabet)
+    result = _chi_square(observed, alpha)
+    result['uniform'] = result['uniform'] and known
+    return result
+
+
+def bench_generate(
+    lengths: Sequence[int] = DEFAULT_LENGTHS,
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    flag_combinations: Sequence[tuple] = FLAG_COMBINATIONS,
+    backends: Optional[Sequence[str]] = None,
+    min_time: float = 0.2
+) -> List[Dict]:
+    """Замеряет скорость генерации по всем комбинациям параметров.
+
+    Размер пакета 1 соответствует generate_password, остальные —
+    generate_passwords с указанным бэкендом.
+
+    Returns:
+        List[Dict]: Результаты замеров.
+    """
+    backends = backends or available_backends()
+    results = []
+    for length, (special, digits, upper), batch_size in itertools.product(
+            lengths, flag_combinations, batch_sizes):
+        if batch_size == 1:
+            runs = [("generate_password", None,
+                     lambda: (generate_password(length, special, digits, upper), 1)[1])]
+        else:
+            runs = [
+                ("generate_passwords", backend,
+                 lambda b=backend: len(generate_passwords(
+                     batch_size, length, special, digits, upper, b)))
+                for backend in backends
+            ]
+        for func_name, backend, func in runs:
+            total, elapsed = _measure(func, min_time)
+            results.append({
+                'function': func_name,
+                'backend': backend,
+                'length': length,
+                'special': special,
+                'digits': digits,
+                'uppercase': upper,
+                'batch_size': batch_size,
+                'passwords_per_sec': round(total / elapsed, 1),
+                'bytes_per_sec': round(total * length / elapsed, 1),
+            })
+    return results
+
+
+def check_uniformity(
+    backends: Optional[Sequence[str]] = None,
+    sample_size: int = 200000
+) -> Dict[str, Dict]:
+    """Проверяет равномерность всех путей генерации для каждого алфавита.
+
+    Для каждой комбинации флагов (алфавиты из 26, 36, 52, 58, 62, 68, 84
+    и 94 символов) проверяются generate_password, generate_passwords
+    с каждым бэкендом и iter_passwords_parallel. Для политики с
+    require_all проверяется равномерность символов внутри каждого
+    обязательного класса и равномерность позиций символов класса
+    (перемешивание не должно оставлять обязательные символы на своих местах).
+
+    Проверок много, поэтому уровень значимости делится на их число
+    (поправка Бонферрони): иначе случайный ложный сигнал был бы частым.
+
+    Args:
+        backends (Optional[Sequence[str]]): Бэкенды. По умолчанию — все доступные.
+        sample_size (int): Количество символов в выборке каждого пути.
+
+    Returns:
+        Dict[str, Dict]: Результат проверки хи-квадрат по имени пути генерации
+            и размеру алфавита.
+    """
+    backends = backends or available_backends()
+    count = sample_size // 100
+    observed = {}
+    for flags in FLAG_COMBINATIONS:
+        alphabet = build_alphabet(*flags)
+        size = len(alphabet)
+        observed[f'generate_password[{size}]'] = _char_counts(
+            generate_password(sample_size, *flags), alphabet
+        )
+        for backend in backends:
+            sample = ''.join(generate_passwords(count, 100, *flags, backend=backend))
+            observed[f'generate_passwords[{backend}, {size}]'] = _char_counts(sample, alphabet)
+
+        batches = iter_passwords_parallel(
+            count, 100, *flags, workers=2, batch_size=max(1, count // 8)
+        )
+        sample = ''.join(''.join(batch) for batch in batches)
+        observed[f'iter_passwords_parallel[{size}]'] = _char_counts(sample, alphabet)
+
+        policy = compile_policy(POLICY_LENGTH, *flags, require_all=True)
+        passwords = policy.generate_many(sample_size // POLICY_LENGTH)
+        sample = ''.join(passwords)
+        columns = [''.join(column) for column in zip(*passwords)]
+        for name, chars, _ in policy.requirements:
+            charset = set(chars)
+            observed[f'policy[{size}, {name}]'] = _char_counts(
+                ''.join(c for c in sample if c in charset), chars
+            )
+            observed[f'policy[{size}, {name}, positions]'] = (
+                [sum(map(charset.__contains__, column)) for column in columns], True
+            )
+
+    alpha = UNIFORMITY_ALPHA / len(observed)
+    checks = {}
+    for name, (counts, known) in observed.items():
+        checks[name] = _chi_square(counts, alpha)
+        checks[name]['uniform'] = checks[name]['uniform'] and known
+    return checks
+
+
+def run_generate_benchmark(quick: bool = False) -> Dict:
+    """Выполняет полный набор бенчмарков генерации.
+
+    Args:
+        quick (bool): Сокращенный прогон (меньше комбинаций и короче замеры).
+
+    Returns:
+        Dict: Отчет для сериализации в JSON.
+    """
+    if quick:
+        results = bench_generate(
+            lengths=(16,), batch_sizes=(1, 1000),
+            flag_combinations=((True, True, True),), min_time=0.05
+        )
+        uniformity = check_uniformity(sample_size=50000)
+    else:
+        results = bench_generate()
+        uniformity = check_uniformity()
+    return {
+        'suite': 'generate',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backends': available_backends(),
+        'results': results,
+        'uniformity': uniformity,
+        'uniform': all(check['uniform'] for check in uniformity.values()),
+    }
+
+
+def _cipher_functions(name: str, key: bytes) -> tuple:
+    """Возвращает (encrypt, decrypt) шифра name над двоичными токенами."""
+    if name == FERNET:
+        fernet = Fernet(key)
+        return (
+            lambda data: base64.urlsafe_b64decode(fernet.encrypt(data)),
+            lambda token: fernet.decrypt(base64.urlsafe_b64encode(token)),
+        )
+    cipher = AeadCipher(name, [key])
+    return cipher.encrypt, cipher.decrypt
+
+
+def bench_ciphers(
+    lengths: Sequence[int] = (16, 64),
+    batch_size: int = 1000,
+    min_time: float = 0.2
+) -> List[Dict]:
+    """Замеряет шифры хранилища: скорость и размер токена.
+
+    Args:
+        lengths (Sequence[int]): Длины шифруемых паролей.
+        batch_size (int): Количество паролей в одном замеряемом пакете.
+        min_time (float): Минимальное время замера каждой операции.
+
+    Returns:
+        List[Dict]: Результаты замеров по шифрам и длинам.
+    """
+    key = Fernet.generate_key()
+    names = [FERNET] + sorted(AEAD_VERSIONS.values())
+    results = []
+    for name, length in itertools.product(names, lengths):
+        encrypt, decrypt = _cipher_functions(name, key)
+        passwords = [p.encode() for p in generate_passwords(batch_size, length)]
+        tokens = [encrypt(p) for p in passwords]
+        if [decrypt(t) for t in tokens] != passwords:
+            raise RuntimeError(f"Шифр {name} не прошел проверку расшифровки")
+
+        enc_total, enc_elapsed = _measure(
+            lambda: len([encrypt(p) for p in passwords]), min_time)
+        dec_total, dec_elapsed = _measure(
+            lambda: len([decrypt(t) for t in tokens]), min_time)
+        results.append({
+            'cipher': name,
+            'length': length,
+            'token_bytes': len(tokens[0]),
+            'encrypt_per_sec': round(enc_total / enc_elapsed, 1),
+            'decrypt_per_sec': round(dec_total / dec_elapsed, 1),
+        })
+    return results
+
+
+def run_cipher_benchmark(quick: bool = False) -> Dict:
+    """Выполняет сравнение шифров хранилища.
+
+    Args:
+        quick (bool): Сокращенный прогон.
+
+    Returns:
+        Dict: Отчет для сериализации в JSON.
+    """
+    if quick:
+        results = bench_ciphers(lengths=(16,), batch_size=100, min_time=0.05)
+    else:
+        results = bench_ciphers()
+    return {
+        'suite': 'cipher',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+SUITES = {
+    'generate': run_generate_benchmark,
+    'cipher': run_cipher_benchmark,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа скрипта бенчмарков.
+
+    Returns:
+        int: Код возврата: 1, если проверка равномерности не пройдена.
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки passgen")
+    parser.add_argument("suite", choices=sorted(SUITES), help="Набор бенчмарков")
+    parser.add_argument("--quick", action="store_true", help="Сокращенный прогон")
+    parser.add_argument("--output", type=str, metavar="FILE",
+                        help="Записать JSON в файл вместо stdout")
+    args = parser.parse_args(argv)
+
+    report = SUITES[args.suite](quick=args.quick)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if report.get('uniform', True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Модуль гарантированно уникальной пакетной генерации на фильтре Блума.
+
+Вместо множества Python-строк (десятки байт служебных данных на каждую)
+используется битовый массив, размер которого вычисляется заранее по
+ожидаемому количеству элементов и допустимой доле ложных срабатываний.
+Для 100 млн паролей при error_rate=0.001 это около 180 МБ независимо от
+длины паролей.
+
+Фильтр Блума не дает ложноотрицательных ответов, поэтому пароль, который
+фильтр считает новым, гарантированно не встречался. Подозрение на повтор
+(в том числе ложное) проверяется не по всем выданным паролям — это
+потребовало бы хранить их все, — а заменой кандидата новым случайным
+паролем. Ложные срабатывания стоят лишь доли процента лишних генераций,
+а результат всегда уникален.
+"""
+
+import hashlib
+import math
+import struct
+from typing import Callable, Iterator, List
+
+# Доля ложных срабатываний фильтра по умолчанию
+DEFAULT_ERROR_RATE = 0.001
+
+# Если среди сгенерированных паролей новых меньше этой доли, пространство исчерпано
+MIN_UNIQUE_RATIO = 0.01
+
+
+class BloomFilter:
+    """Фильтр Блума на bytearray с позициями из дайджеста blake2b."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        """Вычисляет размер битового массива и число хеш-функций.
+
+        Args:
+            capacity (int): Ожидаемое количество элементов.
+            error_rate (float): Допустимая доля ложных срабатываний (0 < p < 1).
+
+        Raises:
+            ValueError: Если параметры вне допустимого диапазона.
+        """
+        if capacity <= 0:
+            raise ValueError("Емкость фильтра должна быть положительной")
+        if not 0 < error_rate < 1:
+            raise ValueError("Доля ложных срабатываний должна быть в интервале (0, 1)")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+        # Если хватает 32-битных позиций и k <= 16, все k позиций берутся
+        # из одного дайджеста blake2b без арифметики над большими числами
+        if self.num_hashes <= 16 and self.num_bits <= 1 << 32:
+            self._unpack = struct.Struct(f"<{self.num_hashes}I").unpack
+        else:
+            self._unpack = None
+
+    @property
+    def size_bytes(self) -> int:
+        """Размер битового массива в байтах."""
+        return len(self._bits)
+
+    def _positions(self, item: bytes):
+        m = self.num_bits
+        if self._unpack is not None:
+            digest = hashlib.blake2b(item, digest_size=4 * self.num_hashes).digest()
+            return [v % m for v in self._unpack(digest)]
+
+        # Двойное хеширование для очень больших фильтров
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item: bytes) -> bool:
+        """Добавляет элемент.
+
+        Returns:
+            bool: True, если элемент, возможно, уже был добавлен.
+        """
+        bits = self._bits
+        present = True
+        for pos in self._positions(item):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, item: bytes) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def iter_unique(
+    batch_source: Callable[[int], Iterator[List[str]]],
+    count: int,
+    error_rate: float = DEFAULT_ERROR_RATE
+) -> Iterator[List[str]]:
+    """Отбирает из источника ровно count уникальных паролей.
+
+    Args:
+        batch_source (Callable[[int], Iterator[List[str]]]): Функция, которая
+            по количеству n возвращает итератор пакетов из n паролей
+            (например, iter_passwords_parallel с зафиксированными параметрами).
+        count (int): Требуемое количество уникальных паролей.
+        error_rate (float): Доля ложных срабатываний фильтра.
+
+    Yields:
+        List[str]: Пакеты уникальных паролей.
+
+    Raises:
+        RuntimeError: Если источник почти перестал давать новые пароли
+            (пространство паролей слишком мало для count).
+    """
+    bloom = BloomFilter(count, error_rate)
+    produced = 0
+    drawn = 0
+    while produced < count:
+        for batch in batch_source(count - produced):
+            unique = [p for p in batch if not bloom.add(p.encode('utf-8'))]
+            drawn += len(batch)
+            if drawn >= 1000 and produced + len(unique) < drawn * MIN_UNIQUE_RATIO:
+                raise RuntimeError(
+                    "Недостаточно уникальных паролей: увеличьте длину или алфавит"
+                )
+            unique = unique[:count - produced]
+            produced += len(unique)
+            if unique:
+                yield unique
+            if produced >= count:
+                break
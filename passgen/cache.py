@@ -0,0 +1,126 @@
+"""Модуль кеша чтения для PasswordDatabase.
+
+TTLCache — ограниченный по размеру LRU-кеш, записи которого устаревают
+через ttl секунд. ChangeListener держит отдельное соединение с LISTEN на
+канал, в который триггер таблицы passwords отправляет (NOTIFY) пару
+(username, service) каждой измененной строки. Перед каждым чтением из кеша
+накопленные уведомления снимаются без ожидания, и измененные другими
+процессами записи удаляются из кеша до того, как их можно было бы выдать.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+# Канал уведомлений об изменениях таблицы passwords
+NOTIFY_CHANNEL = "passgen_passwords"
+
+# Значение get() для отсутствующего ключа (None — допустимое значение в кеше)
+MISSING = object()
+
+
+class TTLCache:
+    """LRU-кеш с ограничением размера и временем жизни записей."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Инициализация кеша.
+
+        Args:
+            maxsize (int): Максимальное количество записей.
+            ttl (float): Время жизни записи в секундах.
+            clock (Callable[[], float]): Источник времени (для тестов).
+
+        Raises:
+            ValueError: Если maxsize или ttl не положительны.
+        """
+        if maxsize <= 0 or ttl <= 0:
+            raise ValueError("Размер кеша и время жизни должны быть положительными")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default=MISSING):
+        """Возвращает значение или default, если его нет или оно устарело."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= self._clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value) -> None:
+        """Сохраняет значение, вытесняя давно не использованные записи."""
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Удаляет запись, если она есть."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        with self._lock:
+            self._data.clear()
+
+
+class ChangeListener:
+    """Соединение, подписанное (LISTEN) на уведомления об изменениях."""
+
+    def __init__(self, connect: Callable, channel: str = NOTIFY_CHANNEL):
+        """Открывает соединение в режиме autocommit и выполняет LISTEN.
+
+        Args:
+            connect (Callable): Функция, открывающая соединение psycopg2.
+            channel (str): Имя канала.
+        """
+        self.channel = channel
+        self._conn = connect()
+        self._conn.autocommit = True
+        with self._conn.cursor() as cur:
+            cur.execute(f"LISTEN {channel}")
+
+    def poll(self) -> List[Optional[Tuple[str, str]]]:
+        """Снимает накопленные уведомления без ожидания.
+
+        Returns:
+            List[Optional[Tuple[str, str]]]: Измененные пары
+            (username, service); None — изменение, которое не удалось
+            разобрать (нужно сбросить весь кеш).
+
+        Raises:
+            psycopg2.Error: Если соединение потеряно.
+        """
+        self._conn.poll()
+        changes = []
+        notifies = self._conn.notifies
+        while notifies:
+            notify = notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload)
+                changes.append((payload['username'], payload['service']))
+            except (ValueError, KeyError, TypeError):
+                changes.append(None)
+        return changes
+
+    def close(self) -> None:
+        """Закрывает соединение."""
+        try:
+            self._conn.close()
+        except Exception:
+            pass
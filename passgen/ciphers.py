@@ -0,0 +1,109 @@
+"""Модуль AEAD-шифров для формата хранения v2.
+
+Fernet шифрует AES-128-CBC и отдельно считает HMAC-SHA256, а его двоичный
+токен несет 25 байт заголовка и дополнение до блока. AEAD-шифры
+(AES-256-GCM и ChaCha20-Poly1305) шифруют и аутентифицируют данные за один
+проход, а токен получается короче:
+
+    версия (1 байт) | nonce (12 байт) | шифртекст | тег (16 байт)
+
+Первый байт различает форматы: 0x80 — токен Fernet, 0x01 — AES-GCM,
+0x02 — ChaCha20-Poly1305. Поэтому строки, записанные Fernet, читаются и
+после переключения шифра в config.CIPHER.
+
+Ключи AEAD выводятся через HKDF-SHA256 из тех же ключей файла KEY_FILE
+(отдельно для каждого шифра), так что ротация ключей работает одинаково
+для всех шифров.
+"""
+
+import base64
+import os
+from typing import Dict, List, Sequence, Union
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# Имена шифров для config.CIPHER
+FERNET = "fernet"
+AES_GCM = "aes-gcm"
+CHACHA20 = "chacha20-poly1305"
+CIPHERS = (FERNET, AES_GCM, CHACHA20)
+
+# Байты версии токенов AEAD (0x80 занят версией Fernet)
+AEAD_VERSIONS: Dict[int, str] = {0x01: AES_GCM, 0x02: CHACHA20}
+
+NONCE_SIZE = 12
+
+_AEAD_CLASSES = {AES_GCM: AESGCM, CHACHA20: ChaCha20Poly1305}
+
+
+def derive_key(key: bytes, name: str) -> bytes:
+    """Выводит 256-битный ключ шифра name из ключа Fernet.
+
+    Args:
+        key (bytes): Ключ из файла ключей (base64 от 32 байт).
+        name (str): Имя AEAD-шифра.
+
+    Returns:
+        bytes: Ключ AEAD.
+    """
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                info=f"passgen/{name}".encode())
+    return hkdf.derive(base64.urlsafe_b64decode(key))
+
+
+class AeadCipher:
+    """AEAD-шифр с версионным токеном и несколькими ключами.
+
+    Шифрование выполняется первым (основным) ключом, расшифровка пробует
+    ключи по порядку, как MultiFernet.
+    """
+
+    def __init__(self, name: str, keys: Sequence[bytes]):
+        """Инициализация.
+
+        Args:
+            name (str): AES_GCM или CHACHA20.
+            keys (Sequence[bytes]): Ключи файла ключей; первый — основной.
+
+        Raises:
+            ValueError: Если шифр неизвестен или ключи не заданы.
+        """
+        if name not in _AEAD_CLASSES:
+            raise ValueError(f"Неизвестный AEAD-шифр: {name}")
+        if not keys:
+            raise ValueError("Не задано ни одного ключа")
+        self.name = name
+        self.version = next(v for v, n in AEAD_VERSIONS.items() if n == name)
+        self._prefix = bytes([self.version])
+        self._aeads: List = [_AEAD_CLASSES[name](derive_key(key, name)) for key in keys]
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Шифрует данные основным ключом.
+
+        Returns:
+            bytes: Токен: версия, nonce, шифртекст с тегом.
+        """
+        nonce = os.urandom(NONCE_SIZE)
+        return self._prefix + nonce + self._aeads[0].encrypt(nonce, data, None)
+
+    def decrypt(self, token: Union[bytes, memoryview]) -> bytes:
+        """Расшифровывает токен любым из ключей.
+
+        Raises:
+            ValueError: Если токен не того шифра, поврежден или ни один
+                ключ не подходит.
+        """
+        view = memoryview(token)
+        if len(view) < 1 + NONCE_SIZE or view[0] != self.version:
+            raise ValueError(f"Токен не является токеном {self.name}")
+        nonce = view[1:1 + NONCE_SIZE]
+        ciphertext = view[1 + NONCE_SIZE:]
+        for aead in self._aeads:
+            try:
+                return aead.decrypt(nonce, ciphertext, None)
+            except InvalidTag:
+                continue
+        raise ValueError("Неверный ключ или поврежденный токен")
@@ -1,22 +1,54 @@
 """Модуль обработки командной строки."""
 
-from .generator import generate_password
+import sys
+import time
+from contextlib import redirect_stdout
+from .generator import generate_password, generate_passwords
+from .importer import ImportReader
+from .bloom import iter_unique
+from .exporter import export_records
+from .output import write_passwords
+from .parallel import iter_passwords_parallel
+from .passphrase import Wordlist, generate_passphrase, generate_passphrases, iter_passphrases
+from .pattern import compile_pattern
+from .policy import compile_policy
+from .rekey import RekeyCheckpoint
+from .storage import get_key_manager, key_fingerprint
+from .strength import load_dictionary, score_password, score_passwords
 from .utils import validate_args
-from .database import PasswordDatabase
+from .backend import SEARCH_LIMIT, create_database
+from .migrations import MIGRATE_HINT
 
 
 def handle_commands(args: any) -> None:
     """Обрабатывает команды из аргументов командной строки."""
     
-    # Инициализация БД
-    try:
-        db = PasswordDatabase()
-        db.create_table()
-    except Exception as e:
-        print(f"Ошибка подключения к БД: {e}")
-        print("Проверьте параметры в config.py")
+    # Потоковая генерация в файл или stdout не требует БД и не
+    # выводит ничего, кроме самих паролей
+    if args.generate and args.output:
+        _stream_generated(args)
+        return
+
+    # Применение миграций схемы БД
+    if args.migrate:
+        try:
+            applied = create_database().migrate()
+            if applied:
+                print(f"Применены миграции: {', '.join(map(str, applied))}")
+            else:
+                print("Схема БД актуальна")
+        except Exception as e:
+            print(f"Ошибка миграции схемы: {e}")
         return
     
+    # Генерация без сохранения не обращается к БД; соединение
+    # откроется только если пользователь решит сохранить пароль
+    db = None
+    if _needs_database(args):
+        db = _open_database()
+        if db is None:
+            return
+    
     # Сохранение пароля в БД
     if args.save:
         try:
@@ -43,7 +75,10 @@ def handle_commands(args: any) -> None:
     if args.find_by_username:
         try:
             username = args.find_by_username.strip()
-            records = db.search_by_username(username)
+            records, next_cursor = _fetch_page(
+                args, lambda: db.search_by_username(username),
+                lambda limit, after: db.search_by_username_page(username, limit, after)
+            )
             
             if records:
                 print(f"\nНайдено паролей для пользователя '{username}': {len(records)}")
@@ -53,6 +88,7 @@ def handle_commands(args: any) -> None:
                     print(f"     Пароль: {password}")
                     if i < len(records):
                         print("-" * 40)
+                _print_next_page(next_cursor)
             else:
                 print(f"Пароли для пользователя '{username}' не найдены")
                 
@@ -64,7 +100,10 @@ def handle_commands(args: any) -> None:
     if args.find_by_service:
         try:
             service = args.find_by_service.strip()
-            records = db.search_by_service(service)
+            records, next_cursor = _fetch_page(
+                args, lambda: db.search_by_service(service),
+                lambda limit, after: db.search_by_service_page(service, limit, after)
+            )
             
             if records:
                 print(f"\nНайдено паролей для сервиса '{service}': {len(records)}")
@@ -74,6 +113,7 @@ def handle_commands(args: any) -> None:
                     print(f"     Пароль:       {password}")
                     if i < len(records):
                         print("-" * 40)
+                _print_next_page(next_cursor)
             else:
                 print(f"Пароли для сервиса '{service}' не найдены")
                 
@@ -81,6 +121,30 @@ def handle_commands(args: any) -> None:
             print(f"Ошибка поиска: {e}")
         return
     
+    # Поиск по префиксу и подстроке
+    if args.find_service_like or args.find_username_like:
+        try:
+            column = "service" if args.find_service_like else "username"
+            term = args.find_service_like or args.find_username_like
+            records = db.search_like(column, term, args.limit or SEARCH_LIMIT)
+            
+            if records:
+                db.decrypt_records(records)
+                print(f"\nНайдено записей по запросу '{term.strip()}': {len(records)}")
+                print("=" * 60)
+                for i, record in enumerate(records, 1):
+                    print(f"{i}. Пользователь: {record.username}")
+                    print(f"     Сервис:       {record.service}")
+                    print(f"     Пароль:       {record.password}")
+                    if i < len(records):
+                        print("-" * 40)
+            else:
+                print(f"Записи по запросу '{term.strip()}' не найдены")
+                
+        except Exception as e:
+            print(f"Ошибка поиска: {e}")
+        return
+    
     # Поиск по имени и сервису
     if args.find_by_both:
         try:
@@ -111,10 +175,20 @@ def handle_commands(args: any) -> None:
     # Показать все записи
     if args.show_all:
         try:
-            records = db.get_all_records()
+            # В режиме --masked пароли не выбираются и не расшифровываются
+            with_passwords = not args.masked
+            records, next_cursor = _fetch_page(
+                args, lambda: db.get_all_records(with_passwords=with_passwords),
+                lambda limit, after: db.get_records_page(limit, after, with_passwords)
+            )
+            if with_passwords:
+                # Один пакет через CryptoEngine вместо построчной расшифровки
+                db.decrypt_records(records)
             
             if records:
-                print(f"\nВсего записей в базе: {len(records)}")
+                # При --limit известен только размер страницы, а не всей базы
+                label = "Записей на странице" if args.limit else "Всего записей в базе"
+                print(f"\n{label}: {len(records)}")
                 print("=" * 60)
                 
                 for i, record in enumerate(records, 1):
@@ -126,6 +200,7 @@ def handle_commands(args: any) -> None:
                     
                     if i < len(records):
                         print("-" * 60)
+                _print_next_page(next_cursor)
             else:
                 print("База данных пуста")
                 
@@ -133,18 +208,179 @@ def handle_commands(args: any) -> None:
             print(f"Ошибка получения данных: {e}")
         return
     
+    # Пакетный импорт из CSV/JSON Lines
+    if args.import_file:
+        try:
+            reader = ImportReader(args.import_file, args.import_format)
+            start = time.perf_counter()
+            merged = db.import_records(
+                reader, progress=lambda n: print(f"Загружено строк: {n}")
+            )
+            elapsed = time.perf_counter() - start
+            rate = merged / elapsed if elapsed > 0 else 0
+            print(f"Импорт завершен. Записей: {merged} за {elapsed:.1f} с "
+                  f"({rate:.0f} строк/с)")
+            if reader.skipped:
+                print(f"Пропущено некорректных строк: {reader.skipped}")
+        except Exception as e:
+            print(f"Ошибка импорта: {e}")
+        return
+    
+    # Потоковый экспорт в CSV/JSON Lines
+    if args.export_file:
+        try:
+            skipped = []
+            exported = export_records(db.iter_records(), args.export_file,
+                                      args.export_format, on_skip=skipped.append)
+            if args.export_file != '-':
+                print(f"Экспортировано записей: {exported} в {args.export_file}")
+            for record in skipped:
+                print(f"Пропущена запись {record.username}/{record.service}: "
+                      f"пароль не расшифровывается", file=sys.stderr)
+            if skipped:
+                print(f"Не экспортировано записей: {len(skipped)}", file=sys.stderr)
+        except Exception as e:
+            print(f"Ошибка экспорта: {e}", file=sys.stderr)
+        return
+    
+    # Перевод хранилища в формат v2
+    if args.migrate_storage:
+        try:
+            converted = db.migrate_storage(
+                progress=lambda n: print(f"Переведено записей: {n}")
+            )
+            print(f"Миграция завершена. Переведено записей: {converted}")
+        except Exception as e:
+            print(f"Ошибка миграции: {e}")
+        return
+    
+    # Перешифрование хранилища новым ключом
+    if args.rekey:
+        try:
+            manager = get_key_manager()
+            checkpoint = RekeyCheckpoint()
+            if checkpoint.exists() and checkpoint.load(key_fingerprint(manager.get_keys()[0])):
+                print(f"Продолжение перешифрования с записи id > {checkpoint.last_id}")
+            else:
+                manager.add_key()
+                print(f"Добавлен новый основной ключ в {manager.path}")
+            result = db.rekey(
+                progress=lambda c: print(f"Перешифровано записей: {c.rekeyed}")
+            )
+            print(f"Перешифрование завершено. Записей: {result['rekeyed']}, "
+                  f"не расшифровано: {result['failed']}")
+            if not result['failed']:
+                print("Старые ключи больше не используются и могут быть удалены из файла ключей")
+        except Exception as e:
+            print(f"Ошибка перешифрования: {e}")
+        return
+    
+    # Аудит стойкости паролей в БД
+    if args.audit:
+        try:
+            dictionary = load_dictionary(args.dictionary)
+            records = db.get_all_records()
+            db.decrypt_records(records)
+            checked = 0
+            weak = 0
+            passwords = (record['password'] for record in records)
+            for record, result in zip(records, score_passwords(passwords, dictionary)):
+                checked += 1
+                if record['password'] == "[Ошибка расшифровки]":
+                    continue
+                if result['score'] < args.min_score:
+                    weak += 1
+                    print(f"{record['username']}:{record['service']} — "
+                          f"{result['label']} ({result['entropy']} бит)")
+                    for warning in result['warnings']:
+                        print(f"     {warning}")
+            print("=" * 60)
+            print(f"Проверено записей: {checked}, слабых: {weak}")
+        except Exception as e:
+            print(f"Ошибка аудита: {e}")
+        return
+    
+    # Генерация парольной фразы
+    if args.generate and args.passphrase:
+        try:
+            _check_count(args.count)
+        except ValueError as ve:
+            print(f"Ошибка параметров: {ve}")
+            return
+
+        try:
+            wordlist = Wordlist(args.wordlist)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка открытия списка слов: {e}")
+            return
+
+        with wordlist:
+            if args.count > 1:
+                try:
+                    batches = _iter_batches(args, lambda n: iter([generate_passphrases(
+                        n, wordlist, args.words, args.separator
+                    )]))
+                    phrases = [phrase for batch in batches for phrase in batch]
+                except RuntimeError as e:
+                    print(f"Ошибка генерации: {e}")
+                    return
+                print(f"\nСгенерировано парольных фраз: {len(phrases)}")
+                print("=" * 40)
+                _print_batch(phrases, args)
+                return
+            password = generate_passphrase(wordlist, args.words, args.separator)
+            total_words = len(wordlist)
+
+        print(f"\nСгенерирована парольная фраза:")
+        print("=" * 40)
+        print(f"Фраза: {password}")
+        print(f"Слов:  {args.words} из {total_words} в списке")
+        if args.score:
+            _print_score(password, args.dictionary)
+        _offer_save(db, password)
+        return
+    
     # Генерация пароля
     if args.generate:
         try:
-            validate_args(args.length, args.special, args.digits, args.uppercase)
+            source = _build_source(args)
         except ValueError as ve:
             print(f"Ошибка параметров: {ve}")
             return
 
+        # Пакетная генерация
+        if args.count > 1:
+            def make_batch(n: int) -> list:
+                if source is not None:
+                    return source.generate_many(n)
+                return generate_passwords(
+                    n, args.length, args.special, args.digits,
+                    args.uppercase, args.backend
+                )
+
+            try:
+                if args.unique:
+                    batches = iter_unique(lambda n: iter([make_batch(n)]), args.count,
+                                          args.unique_error_rate)
+                    passwords = [p for batch in batches for p in batch]
+                else:
+                    passwords = make_batch(args.count)
+            except (ValueError, RuntimeError) as ve:
+                print(f"Ошибка генерации: {ve}")
+                return
+
+            print(f"\nСгенерировано паролей: {len(passwords)}")
+            print("=" * 40)
+            _print_batch(passwords, args)
+            return
+
         try:
-            password = generate_password(
-                args.length, args.special, args.digits, args.uppercase
-            )
+            if source is not None:
+                password = source.generate()
+            else:
+                password = generate_password(
+                    args.length, args.special, args.digits, args.uppercase
+                )
         except ValueError as ve:
             print(f"Ошибка генерации: {ve}")
             return
@@ -153,27 +389,229 @@ def handle_commands(args: any) -> None:
         print("=" * 40)
         print(f"Пароль: {password}")
         print(f"Длина:  {len(password)} символов")
+        if args.score:
+            _print_score(password, args.dictionary)
         
-        # Предложить сохранить
-        print("\nХотите сохранить этот пароль в БД? (y/n): ", end="")
-        if input().lower() == 'y':
-            print("Введите данные в формате 'пользователь:сервис': ", end="")
-            user_service = input().strip()
+        _offer_save(db, password)
+
+
+def _fetch_page(args: any, fetch_all, fetch_page) -> tuple:
+    """Выбирает все записи или, при --limit, одну страницу.
+
+    Args:
+        args: Аргументы командной строки.
+        fetch_all: Функция без аргументов, возвращающая все записи.
+        fetch_page: Функция (limit, after), возвращающая Page.
+
+    Returns:
+        tuple: (записи, курсор следующей страницы или None)
+    """
+    if args.limit is None:
+        return fetch_all(), None
+    page = fetch_page(args.limit, args.after)
+    return page.items, page.next_cursor
+
+
+def _print_next_page(next_cursor) -> None:
+    """Выводит подсказку для перехода к следующей странице."""
+    if next_cursor:
+        print("=" * 60)
+        print(f"Следующая страница: --after {next_cursor}")
+
+
+def _needs_database(args: any) -> bool:
+    """Требует ли команда обращения к БД до ее выполнения."""
+    return any([args.save, args.find_by_username, args.find_by_service,
+                args.find_service_like, args.find_username_like, args.find_by_both,
+                args.show_all, args.import_file, args.export_file,
+                args.migrate_storage, args.rekey, args.audit])
+
+
+def _open_database():
+    """Подключается к БД и проверяет версию схемы.
+
+    Returns:
+        Optional[StorageBackend]: Хранилище из config.BACKEND или None,
+        если подключиться не удалось или схема устарела (сообщение уже
+        выведено).
+    """
+    try:
+        db = create_database()
+        current = db.schema_is_current()
+    except Exception as e:
+        print(f"Ошибка подключения к БД: {e}")
+        print("Проверьте параметры в config.py")
+        return None
+    if not current:
+        print(MIGRATE_HINT)
+        return None
+    return db
+
+
+def _stream_generated(args: any) -> None:
+    """Генерирует пароли потоком и пишет их в args.output.
+
+    Сообщения об ошибках выводятся в stderr, чтобы не смешиваться
+    с паролями при выводе в stdout.
+    """
+    try:
+        source = None
+        if args.passphrase:
+            _check_count(args.count)
+        else:
+            # Предупреждения валидации не должны попадать в поток паролей
+            with redirect_stdout(sys.stderr):
+                source = _build_source(args)
+    except ValueError as ve:
+        print(f"Ошибка параметров: {ve}", file=sys.stderr)
+        return
+
+    wordlist = None
+    if args.passphrase:
+        try:
+            wordlist = Wordlist(args.wordlist)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка открытия списка слов: {e}", file=sys.stderr)
+            return
+
+    try:
+        if wordlist is not None:
+            with wordlist:
+                batches = _iter_batches(args, lambda n: iter_passphrases(
+                    n, wordlist, args.words, args.separator
+                ))
+                written = write_passwords(batches, args.output)
+        else:
+            batches = _iter_batches(args, lambda n: iter_passwords_parallel(
+                n, args.length, args.special, args.digits, args.uppercase,
+                workers=args.workers, ordered=not args.unordered,
+                backend=args.backend, source=source
+            ))
+            written = write_passwords(batches, args.output)
+    except RuntimeError as e:
+        # Например, при --unique пространство паролей исчерпано
+        print(f"Ошибка параметров: {e}", file=sys.stderr)
+        return
+    except (OSError, ValueError) as e:
+        print(f"Ошибка записи: {e}", file=sys.stderr)
+        return
+
+    if args.output != '-':
+        print(f"Записано паролей: {written} в {args.output}")
+
+
+def _iter_batches(args: any, make_batches):
+    """Возвращает пакеты из args.count паролей, при --unique — без повторов.
+
+    Args:
+        args: Аргументы командной строки.
+        make_batches: Функция, возвращающая итератор пакетов по их количеству.
+    """
+    if args.unique:
+        return iter_unique(make_batches, args.count, args.unique_error_rate)
+    return make_batches(args.count)
+
+
+def _check_count(count: int) -> None:
+    """Проверяет, что количество паролей положительно."""
+    if count <= 0:
+        raise ValueError("Количество паролей должно быть положительным числом")
+
+
+def _build_source(args: any):
+    """Проверяет параметры генерации и компилирует источник паролей.
+
+    Returns:
+        Optional[object]: CompiledPattern для --pattern, PasswordPolicy при
+        заданных параметрах политики или None для обычной генерации.
+
+    Raises:
+        ValueError: Если параметры некорректны.
+    """
+    if args.pattern:
+        _check_count(args.count)
+        return compile_pattern(args.pattern)
+
+    policy = _build_policy(args)
+    validate_args(args.length, args.special, args.digits, args.uppercase,
+                  args.count, policy)
+    return policy
+
+
+def _build_policy(args: any):
+    """Компилирует политику генерации, если заданы её параметры.
+
+    Returns:
+        Optional[PasswordPolicy]: Политика или None, если достаточно
+        обычного выбора алфавита.
+
+    Raises:
+        ValueError: Если параметры политики противоречивы.
+    """
+    if not (args.require_all or args.min_uppercase or args.min_digits
+            or args.min_special or args.exclude_ambiguous or args.alphabet):
+        return None
+    return compile_policy(
+        args.length, args.special, args.digits, args.uppercase,
+        require_all=args.require_all,
+        min_uppercase=args.min_uppercase,
+        min_digits=args.min_digits,
+        min_special=args.min_special,
+        exclude_ambiguous=args.exclude_ambiguous,
+        alphabet=args.alphabet
+    )
+
+
+def _print_batch(passwords: list, args: any) -> None:
+    """Выводит пакет паролей, при --score — с оценкой стойкости каждого."""
+    if not args.score:
+        for password in passwords:
+            print(password)
+        return
+    dictionary = load_dictionary(args.dictionary)
+    for password, result in zip(passwords, score_passwords(passwords, dictionary)):
+        print(f"{password}  [{result['label']}, {result['entropy']} бит]")
+
+
+def _print_score(password: str, dictionary_path: str = None) -> None:
+    """Выводит оценку стойкости пароля."""
+    result = score_password(password, load_dictionary(dictionary_path))
+    print(f"Оценка: {result['label']} ({result['score']}/4, {result['entropy']} бит)")
+    for warning in result['warnings']:
+        print(f"        {warning}")
+
+
+def _offer_save(db, password: str) -> None:
+    """Предлагает сохранить сгенерированный пароль в БД.
+
+    Args:
+        db (Optional[StorageBackend]): БД; если None, подключение
+            открывается только при согласии пользователя.
+        password (str): Сгенерированный пароль.
+    """
+    print("\nХотите сохранить этот пароль в БД? (y/n): ", end="")
+    if input().lower() == 'y':
+        print("Введите данные в формате 'пользователь:сервис': ", end="")
+        user_service = input().strip()
+        
+        if ":" in user_service:
+            username, service = user_service.split(":", 1)
+            username = username.strip()
+            service = service.strip()
             
-            if ":" in user_service:
-                username, service = user_service.split(":", 1)
-                username = username.strip()
-                service = service.strip()
-                
-                if username and service:
-                    try:
-                        db.save_password(username, service, password)
-                        print(f"Пароль сохранен!")
-                        print(f"Пользователь: {username}")
-                        print(f"Сервис:       {service}")
-                    except Exception as e:
-                        print(f"Ошибка сохранения: {e}")
-                else:
-                    print("Имя пользователя и сервис не могут быть пустыми")
+            if username and service:
+                if db is None:
+                    db = _open_database()
+                    if db is None:
+                        return
+                try:
+                    db.save_password(username, service, password)
+                    print(f"Пароль сохранен!")
+                    print(f"Пользователь: {username}")
+                    print(f"Сервис:       {service}")
+                except Exception as e:
+                    print(f"Ошибка сохранения: {e}")
             else:
-                print("Неверный формат. Используйте: пользователь:сервис")
\ No newline at end of file
+                print("Имя пользователя и сервис не могут быть пустыми")
+        else:
+            print("Неверный формат. Используйте: пользователь:сервис")
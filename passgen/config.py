@@ -1,5 +1,8 @@
 """Модуль конфигурации подключения к БД."""
 
+# Хранилище: "postgresql" (сервер из CONFIG) или "sqlite" (файл из SQLITE)
+BACKEND = "postgresql"
+
 CONFIG = {
     "dbname": "passwords_db",
     "host": "localhost", 
@@ -8,7 +11,69 @@ CONFIG = {
     "password": "postgre_471"
 }
 
+# Встроенное хранилище SQLite (при BACKEND = "sqlite")
+SQLITE = {
+    "path": "passgen.db"
+}
+
+# Пул соединений (см. passgen.pool.ConnectionPool)
+POOL = {
+    "minconn": 1,
+    "maxconn": 10,
+    "health_check_interval": 30.0
+}
+
+# Параметры пакетного шифрования (см. passgen.crypto_engine.CryptoEngine)
+CRYPTO = {
+    "mode": "serial",
+    "workers": None,
+    "chunk_size": 512
+}
+
+# Шифр для новых записей: "fernet", "aes-gcm" или "chacha20-poly1305".
+# Записи, зашифрованные любым из них, читаются независимо от этой настройки.
+CIPHER = "fernet"
+
+# Кеш чтения get_password (выключен по умолчанию, см. passgen.cache).
+# Свежесть обеспечивается LISTEN/NOTIFY на указанном канале.
+CACHE = {
+    "enabled": False,
+    "maxsize": 1024,
+    "ttl": 30.0,
+    "channel": "passgen_passwords"
+}
+
 
 def get_db_params() -> dict:
     """Возвращает параметры подключения к БД."""
-    return CONFIG.copy()
\ No newline at end of file
+    return CONFIG.copy()
+
+
+def get_backend_name() -> str:
+    """Возвращает имя выбранного хранилища."""
+    return BACKEND
+
+
+def get_sqlite_params() -> dict:
+    """Возвращает параметры хранилища SQLite."""
+    return SQLITE.copy()
+
+
+def get_pool_params() -> dict:
+    """Возвращает параметры пула соединений."""
+    return POOL.copy()
+
+
+def get_crypto_params() -> dict:
+    """Возвращает параметры пакетного шифрования."""
+    return CRYPTO.copy()
+
+
+def get_cache_params() -> dict:
+    """Возвращает параметры кеша чтения."""
+    return CACHE.copy()
+
+
+def get_cipher_name() -> str:
+    """Возвращает имя шифра для новых записей."""
+    return CIPHER
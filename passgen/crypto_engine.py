@@ -0,0 +1,169 @@
+"""Модуль пакетного шифрования и расшифровки паролей.
+
+CryptoEngine обрабатывает списки значений частями (chunk) в одном из режимов:
+
+    serial  — в текущем потоке (по умолчанию);
+    thread  — в пуле потоков;
+    process — в пуле процессов, каждый со своим KeyManager.
+
+Порядок результатов всегда совпадает с порядком входных значений, а строка,
+которую не удалось расшифровать, заменяется на DECRYPT_ERROR, как и при
+построчной расшифровке в PasswordDatabase.
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Optional, Sequence
+
+from . import storage
+from .storage import Token, decrypt_password, get_encryptor, rotate_token
+
+# Значение вместо пароля, который не удалось расшифровать
+DECRYPT_ERROR = "[Ошибка расшифровки]"
+
+# Режимы работы движка
+MODES = ("serial", "thread", "process")
+
+# Размер части, передаваемой в пул за один раз
+DEFAULT_CHUNK_SIZE = 512
+
+
+def decrypt_or_error(token: Token) -> str:
+    """Расшифровывает одно значение; при ошибке возвращает DECRYPT_ERROR."""
+    try:
+        return decrypt_password(token)
+    except Exception:
+        return DECRYPT_ERROR
+
+
+def _decrypt_chunk(tokens: Sequence[Token]) -> List[str]:
+    """Расшифровывает часть значений с заменой ошибок на DECRYPT_ERROR."""
+    return [decrypt_or_error(token) for token in tokens]
+
+
+def _encrypt_chunk(passwords: Sequence[str]) -> List[bytes]:
+    """Шифрует часть паролей в формат v2."""
+    encrypt = get_encryptor()
+    return [encrypt(password) for password in passwords]
+
+
+def _rotate_chunk(tokens: Sequence[Token]) -> List[Optional[bytes]]:
+    """Перешифровывает часть значений основным ключом; None для ошибок."""
+    results = []
+    for token in tokens:
+        try:
+            results.append(rotate_token(token))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+def _init_process_worker(key_file: str) -> None:
+    """Создает в процессе пула собственный менеджер ключей."""
+    storage._key_manager = storage.KeyManager(key_file)
+
+
+class CryptoEngine:
+    """Пакетное шифрование и расшифровка с сохранением порядка."""
+
+    def __init__(
+        self,
+        mode: str = "serial",
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """Инициализация движка. Пул создается при первом обращении.
+
+        Args:
+            mode (str): Режим: "serial", "thread" или "process".
+            workers (Optional[int]): Размер пула. По умолчанию — число CPU.
+            chunk_size (int): Количество значений в одной части.
+
+        Raises:
+            ValueError: Если режим неизвестен.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим шифрования: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_process_worker,
+                    initargs=(storage.get_key_manager().path,)
+                )
+        return self._executor
+
+    def _chunks(self, values: Sequence) -> List[Sequence]:
+        size = self.chunk_size
+        return [values[i:i + size] for i in range(0, len(values), size)]
+
+    def _run(self, func, values: Sequence) -> list:
+        """Применяет func к частям values и склеивает результаты по порядку."""
+        if self.mode == "serial" or len(values) <= self.chunk_size:
+            return func(values)
+        results = []
+        for part in self._get_executor().map(func, self._chunks(values)):
+            results.extend(part)
+        return results
+
+    def _picklable(self, tokens: Iterable[Token]) -> list:
+        """Собирает значения в список; для пула процессов — без memoryview."""
+        tokens = list(tokens)
+        if self.mode == "process":
+            # memoryview не передается между процессами
+            tokens = [bytes(t) if isinstance(t, memoryview) else t for t in tokens]
+        return tokens
+
+    def decrypt_many(self, tokens: Iterable[Token]) -> List[str]:
+        """Расшифровывает значения из БД.
+
+        Args:
+            tokens (Iterable[Token]): Зашифрованные значения (v1 или v2).
+
+        Returns:
+            List[str]: Пароли в том же порядке; DECRYPT_ERROR для ошибок.
+        """
+        return self._run(_decrypt_chunk, self._picklable(tokens))
+
+    def encrypt_many(self, passwords: Iterable[str]) -> List[bytes]:
+        """Шифрует пароли в формат хранения v2.
+
+        Args:
+            passwords (Iterable[str]): Пароли в открытом виде.
+
+        Returns:
+            List[bytes]: Двоичные токены в том же порядке.
+        """
+        return self._run(_encrypt_chunk, list(passwords))
+
+    def rotate_many(self, tokens: Iterable[Token]) -> List[Optional[bytes]]:
+        """Перешифровывает значения основным ключом (ротация ключей).
+
+        Args:
+            tokens (Iterable[Token]): Зашифрованные значения (v1 или v2).
+
+        Returns:
+            List[Optional[bytes]]: Токены v2 в том же порядке; None для
+            значений, которые не расшифровываются ни одним ключом.
+        """
+        return self._run(_rotate_chunk, self._picklable(tokens))
+
+    def close(self) -> None:
+        """Останавливает пул, если он был создан."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,38 +1,167 @@
 """Модуль для работы с базой данных PostgreSQL."""
 
+import csv
+import io
+import threading
+from contextlib import contextmanager
+
 import psycopg2
-from typing import Optional, List, Tuple, Dict
-from .storage import encrypt_password, decrypt_password
-from .config import get_db_params
+import psycopg2.errors
+from psycopg2.extras import execute_values
+from typing import Optional, List, Tuple, Dict, Iterable, Iterator
+from .storage import (
+    encrypt_token, decrypt_password, convert_v1_to_v2, get_key_manager, key_fingerprint
+)
+from .backend import (
+    EXPORT_BATCH_SIZE, MIGRATION_BATCH_SIZE, REKEY_BATCH_SIZE, SEARCH_COLUMNS,
+    SEARCH_LIMIT, StorageBackend
+)
+from .cache import MISSING, ChangeListener, TTLCache
+from .config import get_db_params, get_crypto_params, get_cache_params, get_pool_params
+from .crypto_engine import CryptoEngine
+from .migrations import (
+    LATEST_VERSION, MIGRATE_HINT, apply_migrations, database_id,
+    forget_cached_version, get_schema_version, read_cached_version,
+    write_cached_version
+)
+from .pagination import Page, decode_cursor, make_page
+from .pool import ConnectionPool
+from .records import PasswordRecord, decrypt_records
+from .rekey import REKEY_CHECKPOINT_FILE, RekeyCheckpoint
+
+# Зашифрованный пароль в любом формате: v2 (BYTEA) или байты текста v1.
+# decrypt_password различает их по первому байту.
+TOKEN_COLUMN = "COALESCE(encrypted_token, convert_to(encrypted_password, 'UTF8'))"
+
+# Минимальная длина строки для поиска по триграммам (pg_trgm)
+MIN_TRIGRAM_LENGTH = 3
 
 
-class PasswordDatabase:
+class PasswordDatabase(StorageBackend):
     """Класс для управления паролями в базе данных PostgreSQL."""
     
-    def __init__(self):
-        """Инициализация подключения к БД."""
+    def __init__(self, cache: Optional[bool] = None):
+        """Инициализация подключения к БД.
+        
+        Args:
+            cache (Optional[bool]): Включить кеш чтения get_password.
+                По умолчанию — по config.CACHE["enabled"].
+        """
         self.config = get_db_params()
+        self.crypto = CryptoEngine(**get_crypto_params())
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
+        cache_params = get_cache_params()
+        enabled = cache_params["enabled"] if cache is None else cache
+        self.cache = (TTLCache(cache_params["maxsize"], cache_params["ttl"])
+                      if enabled else None)
+        self._channel = cache_params["channel"]
+        self._listener = None
     
-    def _get_connection(self):
-        """Устанавливает соединение с БД."""
+    def _connect(self):
+        """Открывает отдельное соединение с БД вне пула."""
         return psycopg2.connect(**self.config)
     
-    def create_table(self) -> None:
-        """Создает таблицу для хранения паролей, если она не существует."""
-        query = """
-        CREATE TABLE IF NOT EXISTS passwords (
-            id SERIAL PRIMARY KEY,
-            username VARCHAR(100) NOT NULL,
-            service VARCHAR(100) NOT NULL,
-            encrypted_password TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(username, service)
-        )
+    def _get_pool(self) -> ConnectionPool:
+        """Возвращает пул соединений, создавая его при первом обращении."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(**get_pool_params(), **self.config)
+        return self._pool
+    
+    @contextmanager
+    def _get_connection(self):
+        """Берет соединение из пула на время блока with.
+        
+        Блок выполняется в транзакции; после него соединение возвращается
+        в пул, а не закрывается.
+        
+        Raises:
+            RuntimeError: Если таблицы нет (базу удалили или пересоздали
+                после --migrate). Устаревшая версия в локальном кеше
+                при этом сбрасывается.
+        """
+        try:
+            with self._get_pool().connection() as conn:
+                yield conn
+        except psycopg2.errors.UndefinedTable as e:
+            forget_cached_version(database_id(self.config))
+            raise RuntimeError(MIGRATE_HINT) from e
+    
+    def _sync_cache(self) -> bool:
+        """Применяет к кешу уведомления об изменениях из других процессов.
+        
+        Returns:
+            bool: True, если кешу можно доверять. Без соединения LISTEN
+            свежесть не гарантирована, и кеш не используется.
         """
+        if self._listener is None:
+            try:
+                self._listener = ChangeListener(self._connect, self._channel)
+            except psycopg2.Error:
+                return False
+            # Изменения до подписки неизвестны
+            self.cache.clear()
+        try:
+            changes = self._listener.poll()
+        except psycopg2.Error:
+            self._listener.close()
+            self._listener = None
+            self.cache.clear()
+            return False
+        for key in changes:
+            if key is None:
+                self.cache.clear()
+            else:
+                self.cache.invalidate(key)
+        return True
+    
+    def close(self) -> None:
+        """Закрывает пул соединений, соединение LISTEN и пул движка шифрования."""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        super().close()
+    
+    def schema_version(self) -> int:
+        """Возвращает версию схемы БД (0 — схема не создана)."""
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query)
-                conn.commit()
+                return get_schema_version(cur)
+    
+    def schema_is_current(self) -> bool:
+        """Проверяет, что к БД применены все миграции.
+        
+        Если локальный кеш уже содержит последнюю версию для этой базы,
+        БД не запрашивается. Команды не выполняют DDL: устаревшая схема
+        обновляется явно через migrate().
+        
+        Returns:
+            bool: True, если схема актуальна
+        """
+        db_id = database_id(self.config)
+        if read_cached_version(db_id) == LATEST_VERSION:
+            return True
+        version = self.schema_version()
+        if version >= LATEST_VERSION:
+            write_cached_version(db_id, version)
+        return version >= LATEST_VERSION
+    
+    def migrate(self) -> List[int]:
+        """Применяет недостающие миграции схемы.
+        
+        Returns:
+            List[int]: Номера примененных миграций
+        """
+        with self._get_connection() as conn:
+            applied = apply_migrations(conn, {'channel': self._channel})
+        write_cached_version(database_id(self.config), LATEST_VERSION)
+        return applied
     
     def save_password(self, username: str, service: str, password: str) -> None:
         """Сохраняет пароль в базу данных.
@@ -42,25 +171,138 @@ class PasswordDatabase:
             service (str): Название сервиса
             password (str): Пароль в открытом виде
         """
-        # Шифруем пароль перед сохранением
-        encrypted = encrypt_password(password)
+        # Шифруем пароль перед сохранением (формат v2)
+        encrypted = encrypt_token(password)
         
         query = """
-        INSERT INTO passwords (username, service, encrypted_password)
+        INSERT INTO passwords (username, service, encrypted_token)
         VALUES (%s, %s, %s)
         ON CONFLICT (username, service) 
         DO UPDATE SET 
-            encrypted_password = EXCLUDED.encrypted_password,
+            encrypted_token = EXCLUDED.encrypted_token,
+            encrypted_password = NULL,
             created_at = CURRENT_TIMESTAMP
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, (username, service, encrypted))
+                cur.execute(query, (username, service, psycopg2.Binary(encrypted)))
                 conn.commit()
+        if self.cache is not None:
+            self.cache.invalidate((username, service))
+    
+    def save_passwords(self, records: Iterable[Tuple[str, str, str]]) -> int:
+        """Сохраняет пакет паролей одним запросом.
+        
+        Пароли шифруются движком CryptoEngine (параллельно, если так
+        настроено в config.CRYPTO). При повторе пары (username, service)
+        внутри пакета сохраняется последнее значение.
+        
+        Args:
+            records (Iterable[Tuple[str, str, str]]): Кортежи
+                (имя пользователя, сервис, пароль в открытом виде)
+            
+        Returns:
+            int: Количество сохраненных записей
+        """
+        unique = {(username, service): password for username, service, password in records}
+        if not unique:
+            return 0
+        tokens = self.crypto.encrypt_many(unique.values())
+        values = [
+            (username, service, psycopg2.Binary(token))
+            for (username, service), token in zip(unique, tokens)
+        ]
+        
+        query = """
+        INSERT INTO passwords (username, service, encrypted_token)
+        VALUES %s
+        ON CONFLICT (username, service) 
+        DO UPDATE SET 
+            encrypted_token = EXCLUDED.encrypted_token,
+            encrypted_password = NULL,
+            created_at = CURRENT_TIMESTAMP
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, values, page_size=1000)
+                conn.commit()
+        if self.cache is not None:
+            for key in unique:
+                self.cache.invalidate(key)
+        return len(values)
+    
+    def import_records(self, batches: Iterable[List[Tuple[str, str, str]]],
+                       progress=None) -> int:
+        """Загружает пароли пакетами через COPY и сливает их одним запросом.
+        
+        Каждый пакет шифруется движком CryptoEngine и загружается командой
+        COPY во временную таблицу. Затем один INSERT ... SELECT ... ON CONFLICT
+        переносит строки в passwords; при повторе пары (username, service)
+        побеждает последняя строка файла. Весь импорт — одна транзакция:
+        при ошибке в таблице не остается частично загруженных данных.
+        
+        Args:
+            batches (Iterable[List[Tuple[str, str, str]]]): Пакеты кортежей
+                (имя пользователя, сервис, пароль в открытом виде)
+            progress (Optional[Callable[[int], None]]): Вызывается с общим
+                числом загруженных строк после каждого пакета
+            
+        Returns:
+            int: Количество вставленных или обновленных записей
+        """
+        staging_query = """
+        CREATE TEMP TABLE passgen_import (
+            line BIGINT NOT NULL,
+            username TEXT NOT NULL,
+            service TEXT NOT NULL,
+            encrypted_token BYTEA NOT NULL
+        ) ON COMMIT DROP
+        """
+        copy_query = """
+        COPY passgen_import (line, username, service, encrypted_token)
+        FROM STDIN WITH (FORMAT csv)
+        """
+        merge_query = """
+        INSERT INTO passwords (username, service, encrypted_token)
+        SELECT DISTINCT ON (username, service) username, service, encrypted_token
+        FROM passgen_import
+        ORDER BY username, service, line DESC
+        ON CONFLICT (username, service) 
+        DO UPDATE SET 
+            encrypted_token = EXCLUDED.encrypted_token,
+            encrypted_password = NULL,
+            created_at = CURRENT_TIMESTAMP
+        """
+        loaded = 0
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(staging_query)
+                for batch in batches:
+                    tokens = self.crypto.encrypt_many(password for _, _, password in batch)
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    for line, ((username, service, _), token) in enumerate(
+                            zip(batch, tokens), loaded):
+                        writer.writerow((line, username, service, "\\x" + token.hex()))
+                    buffer.seek(0)
+                    cur.copy_expert(copy_query, buffer)
+                    loaded += len(batch)
+                    if progress is not None:
+                        progress(loaded)
+                cur.execute(merge_query)
+                merged = cur.rowcount
+            conn.commit()
+        if self.cache is not None:
+            self.cache.clear()
+        return merged
     
     def get_password(self, username: str, service: str) -> Optional[str]:
         """Получает и расшифровывает пароль.
         
+        При включенном кеше повторный запрос той же пары обслуживается из
+        памяти без обращения к БД и расшифровки, пока запись не устарела
+        и не была изменена (своим save_password или уведомлением NOTIFY).
+        
         Args:
             username (str): Имя пользователя
             service (str): Название сервиса
@@ -68,18 +310,24 @@ class PasswordDatabase:
         Returns:
             Optional[str]: Пароль в открытом виде или None
         """
-        query = """
-        SELECT encrypted_password FROM passwords 
+        use_cache = self.cache is not None and self._sync_cache()
+        if use_cache:
+            cached = self.cache.get((username, service))
+            if cached is not MISSING:
+                return cached
+        
+        query = f"""
+        SELECT {TOKEN_COLUMN} FROM passwords 
         WHERE username = %s AND service = %s
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, (username, service))
                 result = cur.fetchone()
-                if result:
-                    encrypted = result[0]
-                    return decrypt_password(encrypted)
-                return None
+        password = decrypt_password(result[0]) if result else None
+        if use_cache:
+            self.cache.set((username, service), password)
+        return password
     
     def search_by_username(self, username: str) -> List[Tuple[str, str]]:
         """Ищет все записи по имени пользователя.
@@ -90,22 +338,17 @@ class PasswordDatabase:
         Returns:
             List[Tuple[str, str]]: Список (сервис, пароль в открытом виде)
         """
-        query = """
-        SELECT service, encrypted_password FROM passwords 
+        query = f"""
+        SELECT service, {TOKEN_COLUMN} FROM passwords 
         WHERE username = %s
         ORDER BY service
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, (username,))
-                results = []
-                for service, encrypted in cur.fetchall():
-                    try:
-                        password = decrypt_password(encrypted)
-                        results.append((service, password))
-                    except Exception:
-                        results.append((service, "[Ошибка расшифровки]"))
-                return results
+                rows = cur.fetchall()
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return [(service, password) for (service, _), password in zip(rows, passwords)]
     
     def search_by_service(self, service: str) -> List[Tuple[str, str]]:
         """Ищет все записи по названию сервиса.
@@ -116,52 +359,356 @@ class PasswordDatabase:
         Returns:
             List[Tuple[str, str]]: Список (имя пользователя, пароль в открытом виде)
         """
-        query = """
-        SELECT username, encrypted_password FROM passwords 
+        query = f"""
+        SELECT username, {TOKEN_COLUMN} FROM passwords 
         WHERE service = %s
         ORDER BY username
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, (service,))
-                results = []
-                for username, encrypted in cur.fetchall():
-                    try:
-                        password = decrypt_password(encrypted)
-                        results.append((username, password))
-                    except Exception:
-                        results.append((username, "[Ошибка расшифровки]"))
-                return results
+                rows = cur.fetchall()
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return [(username, password) for (username, _), password in zip(rows, passwords)]
     
-    def get_all_records(self) -> List[Dict[str, str]]:
-        """Возвращает все записи из БД с расшифрованными паролями.
+    def get_all_records(self, with_passwords: bool = True) -> List[PasswordRecord]:
+        """Возвращает все записи из БД.
+        
+        Пароли не расшифровываются сразу: запись хранит зашифрованное
+        значение и расшифровывает его при первом обращении к password.
         
+        Args:
+            with_passwords (bool): Выбирать ли зашифрованные пароли. При False
+                запрос их не читает, и записи выводятся в маскированном виде.
+            
         Returns:
-            List[Dict[str, str]]: Список записей
+            List[PasswordRecord]: Список записей
         """
-        query = """
-        SELECT username, service, encrypted_password, created_at 
+        token_column = TOKEN_COLUMN if with_passwords else "NULL"
+        query = f"""
+        SELECT username, service, {token_column}, created_at 
         FROM passwords 
         ORDER BY username, service
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(query)
-                results = []
-                for username, service, encrypted, created_at in cur.fetchall():
-                    try:
-                        password = decrypt_password(encrypted)
-                        results.append({
-                            'username': username,
-                            'service': service,
-                            'password': password,
-                            'created_at': created_at
-                        })
-                    except Exception:
-                        results.append({
-                            'username': username,
-                            'service': service,
-                            'password': "[Ошибка расшифровки]",
-                            'created_at': created_at
-                        })
-                return results
\ No newline at end of file
+                rows = cur.fetchall()
+        return [PasswordRecord(*row) for row in rows]
+    
+    def _search_like_query(self, column: str, term: str, limit: int) -> Tuple[str, dict]:
+        """Строит запрос поиска по префиксу и подстроке.
+        
+        Префикс ищется по индексу lower(column) text_pattern_ops, подстрока
+        и похожие написания — по GIN-индексу pg_trgm (ILIKE и оператор %).
+        Для строк короче MIN_TRIGRAM_LENGTH триграммы бесполезны, и поиск
+        ограничивается префиксом.
+        
+        Returns:
+            Tuple[str, dict]: Запрос и его параметры
+            
+        Raises:
+            ValueError: Если колонка не поддерживается или строка пуста
+        """
+        term = self._check_search(column, term)
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        other = "service" if column == "username" else "username"
+        conditions = f"lower({column}) LIKE %(prefix)s"
+        order = f"lower({column}) LIKE %(prefix)s DESC"
+        if len(term) >= MIN_TRIGRAM_LENGTH:
+            conditions += f" OR {column} ILIKE %(substring)s OR {column} %% %(term)s"
+            order += f", similarity({column}, %(term)s) DESC"
+        query = f"""
+        SELECT username, service, {TOKEN_COLUMN}, created_at 
+        FROM passwords 
+        WHERE {conditions}
+        ORDER BY {order}, {column}, {other}
+        LIMIT %(limit)s
+        """
+        params = {
+            'prefix': escaped.lower() + "%",
+            'substring': "%" + escaped + "%",
+            'term': term,
+            'limit': limit,
+        }
+        return query, params
+    
+    def search_like(self, column: str, term: str,
+                    limit: int = SEARCH_LIMIT) -> List[PasswordRecord]:
+        """Ищет записи по префиксу, подстроке или похожему написанию.
+        
+        Сначала идут совпадения по префиксу (без учета регистра), затем
+        остальные по убыванию сходства.
+        
+        Args:
+            column (str): "service" или "username"
+            term (str): Строка поиска (например, "goog")
+            limit (int): Максимальное количество результатов
+            
+        Returns:
+            List[PasswordRecord]: Найденные записи с ленивой расшифровкой
+        """
+        query, params = self._search_like_query(column, term, limit)
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+        return [PasswordRecord(*row) for row in rows]
+    
+    def _fetch_page(self, query: str, params: tuple, keyset: str, after: Optional[str],
+                    key_size: int, limit: int) -> List[tuple]:
+        """Выбирает limit + 1 строк страницы по ключу.
+        
+        Args:
+            query (str): Запрос с местами {where} для условия по ключу
+                и без LIMIT
+            params (tuple): Параметры запроса до условия по ключу
+            keyset (str): Условие "ключ больше последнего" с key_size параметрами
+            after (Optional[str]): Курсор предыдущей страницы
+            key_size (int): Количество значений в ключе
+            limit (int): Размер страницы
+            
+        Returns:
+            List[tuple]: Строки; лишняя строка показывает, что есть следующая страница
+        """
+        if limit <= 0:
+            raise ValueError("Размер страницы должен быть положительным")
+        if after is not None:
+            query = query.format(where=f"AND {keyset}")
+            params = params + decode_cursor(after, key_size)
+        else:
+            query = query.format(where="")
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query + " LIMIT %s", params + (limit + 1,))
+                return cur.fetchall()
+    
+    def get_records_page(self, limit: int, after: Optional[str] = None,
+                         with_passwords: bool = True) -> Page:
+        """Возвращает страницу записей в порядке (username, service).
+        
+        Страница выбирается диапазоном уникального индекса
+        (username, service), без OFFSET.
+        
+        Args:
+            limit (int): Размер страницы
+            after (Optional[str]): Курсор из next_cursor предыдущей страницы
+            with_passwords (bool): Выбирать ли зашифрованные пароли
+            
+        Returns:
+            Page: Записи PasswordRecord и курсор следующей страницы
+            
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        token_column = TOKEN_COLUMN if with_passwords else "NULL"
+        query = f"""
+        SELECT username, service, {token_column}, created_at 
+        FROM passwords 
+        WHERE TRUE {{where}}
+        ORDER BY username, service
+        """
+        rows = self._fetch_page(query, (), "(username, service) > (%s, %s)",
+                                after, 2, limit)
+        rows, next_cursor = make_page(rows, limit, lambda row: row[:2])
+        return Page([PasswordRecord(*row) for row in rows], next_cursor)
+    
+    def search_by_username_page(self, username: str, limit: int,
+                                after: Optional[str] = None) -> Page:
+        """Возвращает страницу результатов search_by_username.
+        
+        Args:
+            username (str): Имя пользователя
+            limit (int): Размер страницы
+            after (Optional[str]): Курсор предыдущей страницы
+            
+        Returns:
+            Page: Список (сервис, пароль) и курсор следующей страницы
+        """
+        query = f"""
+        SELECT service, {TOKEN_COLUMN} FROM passwords 
+        WHERE username = %s {{where}}
+        ORDER BY service
+        """
+        rows = self._fetch_page(query, (username,), "service > %s", after, 1, limit)
+        rows, next_cursor = make_page(rows, limit, lambda row: row[:1])
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return Page([(service, password) for (service, _), password in zip(rows, passwords)],
+                    next_cursor)
+    
+    def search_by_service_page(self, service: str, limit: int,
+                               after: Optional[str] = None) -> Page:
+        """Возвращает страницу результатов search_by_service.
+        
+        Args:
+            service (str): Название сервиса
+            limit (int): Размер страницы
+            after (Optional[str]): Курсор предыдущей страницы
+            
+        Returns:
+            Page: Список (имя пользователя, пароль) и курсор следующей страницы
+        """
+        query = f"""
+        SELECT username, {TOKEN_COLUMN} FROM passwords 
+        WHERE service = %s {{where}}
+        ORDER BY username
+        """
+        rows = self._fetch_page(query, (service,), "username > %s", after, 1, limit)
+        rows, next_cursor = make_page(rows, limit, lambda row: row[:1])
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return Page([(username, password) for (username, _), password in zip(rows, passwords)],
+                    next_cursor)
+    
+    def iter_records(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[PasswordRecord]:
+        """Потоково возвращает все записи с расшифрованными паролями.
+        
+        Используется именованный (серверный) курсор: строки передаются
+        пакетами по batch_size через fetchmany, каждый пакет расшифровывается
+        движком CryptoEngine. В памяти одновременно находится один пакет,
+        а первая запись доступна сразу, без ожидания выборки всей таблицы.
+        
+        Args:
+            batch_size (int): Количество строк в пакете
+            
+        Yields:
+            PasswordRecord: Записи в порядке (username, service)
+        """
+        query = f"""
+        SELECT username, service, {TOKEN_COLUMN}, created_at 
+        FROM passwords 
+        ORDER BY username, service
+        """
+        with self._get_connection() as conn:
+            with conn.cursor(name="passgen_export") as cur:
+                cur.itersize = batch_size
+                cur.execute(query)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    records = [PasswordRecord(*row) for row in rows]
+                    decrypt_records(records, self.crypto)
+                    yield from records
+    
+    def migrate_storage(self, batch_size: int = MIGRATION_BATCH_SIZE,
+                        progress=None) -> int:
+        """Переводит строки формата v1 в формат v2 пакетами.
+        
+        Преобразование не требует ключа: из текста v1 снимаются два слоя
+        base64. Каждый пакет обновляется одним запросом в отдельной короткой
+        транзакции, поэтому миграцию можно выполнять на работающей базе
+        и прерывать в любой момент.
+        
+        Args:
+            batch_size (int): Количество строк в пакете
+            progress (Optional[Callable[[int], None]]): Вызывается с общим
+                числом переведенных строк после каждого пакета
+            
+        Returns:
+            int: Количество переведенных строк
+        """
+        select_query = """
+        SELECT id, encrypted_password FROM passwords
+        WHERE encrypted_token IS NULL AND id > %s
+        ORDER BY id
+        LIMIT %s
+        """
+        update_query = """
+        UPDATE passwords AS p
+        SET encrypted_token = v.token, encrypted_password = NULL
+        FROM (VALUES %s) AS v(id, token)
+        WHERE p.id = v.id
+        """
+        converted = 0
+        last_id = 0
+        with self._get_connection() as conn:
+            while True:
+                with conn.cursor() as cur:
+                    cur.execute(select_query, (last_id, batch_size))
+                    rows = cur.fetchall()
+                    if not rows:
+                        break
+                    values = []
+                    for row_id, encrypted in rows:
+                        try:
+                            token = convert_v1_to_v2(encrypted)
+                        except ValueError:
+                            # Поврежденная строка остается в формате v1
+                            continue
+                        values.append((row_id, psycopg2.Binary(token)))
+                    if values:
+                        execute_values(cur, update_query, values,
+                                       template="(%s, %s::bytea)",
+                                       page_size=len(values))
+                conn.commit()
+                converted += len(values)
+                last_id = rows[-1][0]
+                if progress is not None:
+                    progress(converted)
+        return converted
+    
+    def rekey(self, batch_size: int = REKEY_BATCH_SIZE,
+              checkpoint_file: str = REKEY_CHECKPOINT_FILE,
+              progress=None) -> Dict[str, int]:
+        """Перешифровывает все пароли основным ключом файла ключей.
+        
+        Новый ключ должен быть уже добавлен в начало файла (KeyManager.add_key),
+        старые — оставаться в нем для расшифровки. Таблица обходится пакетами
+        по возрастанию id (keyset), поэтому в памяти находится только один
+        пакет. Строки пакета блокируются SELECT ... FOR UPDATE лишь на время
+        его короткой транзакции, и параллельная запись не будет затерта.
+        Пакет записывается одним UPDATE ... FROM (VALUES ...), после фиксации
+        в контрольную точку заносится последний id, и прерванный обход
+        продолжается с него.
+        
+        Args:
+            batch_size (int): Количество строк в пакете
+            checkpoint_file (str): Файл контрольной точки
+            progress (Optional[Callable[[RekeyCheckpoint], None]]): Вызывается
+                после каждого пакета
+            
+        Returns:
+            Dict[str, int]: Счетчики 'rekeyed' и 'failed' (строки, которые
+            не расшифровываются ни одним ключом и оставлены как есть)
+        """
+        select_query = f"""
+        SELECT id, {TOKEN_COLUMN} FROM passwords
+        WHERE id > %s
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE
+        """
+        update_query = """
+        UPDATE passwords AS p
+        SET encrypted_token = v.token, encrypted_password = NULL
+        FROM (VALUES %s) AS v(id, token)
+        WHERE p.id = v.id
+        """
+        checkpoint = RekeyCheckpoint(checkpoint_file)
+        checkpoint.load(key_fingerprint(get_key_manager().get_keys()[0]))
+        with self._get_connection() as conn:
+            while True:
+                with conn.cursor() as cur:
+                    cur.execute(select_query, (checkpoint.last_id, batch_size))
+                    rows = cur.fetchall()
+                    if not rows:
+                        break
+                    tokens = self.crypto.rotate_many(encrypted for _, encrypted in rows)
+                    values = [
+                        (row_id, psycopg2.Binary(token))
+                        for (row_id, _), token in zip(rows, tokens)
+                        if token is not None
+                    ]
+                    if values:
+                        execute_values(cur, update_query, values,
+                                       template="(%s, %s::bytea)",
+                                       page_size=len(values))
+                conn.commit()
+                checkpoint.last_id = rows[-1][0]
+                checkpoint.rekeyed += len(values)
+                checkpoint.failed += len(rows) - len(values)
+                checkpoint.save()
+                if progress is not None:
+                    progress(checkpoint)
+        checkpoint.clear()
+        return {'rekeyed': checkpoint.rekeyed, 'failed': checkpoint.failed}
@@ -0,0 +1,106 @@
+"""Модуль потокового экспорта записей хранилища в CSV или JSON Lines.
+
+Записи пишутся по мере поступления из PasswordDatabase.iter_records,
+поэтому память не зависит от размера хранилища. Формат совпадает
+с форматом импорта (username,service,password), так что экспорт можно
+загрузить обратно через --import.
+
+Записи, пароль которых не удалось расшифровать, в экспорт не попадают:
+иначе повторный импорт заменил бы сохраненный шифротекст заглушкой
+"[Ошибка расшифровки]". Вызывающий узнает о них через on_skip.
+
+Файл экспорта содержит пароли в открытом виде и создается с правами 0600.
+"""
+
+import csv
+import json
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from .output import write_output
+from .records import PasswordRecord
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+EXPORT_FIELDS = ("username", "service", "password", "created_at")
+
+
+def _created_at(record: PasswordRecord):
+    created_at = record.created_at
+    return created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at
+
+
+def _exportable(records: Iterable[PasswordRecord],
+                on_skip: Optional[Callable[[PasswordRecord], None]]) -> Iterator[PasswordRecord]:
+    """Пропускает записи, пароль которых не удалось расшифровать."""
+    for record in records:
+        if record.decrypt_failed:
+            if on_skip is not None:
+                on_skip(record)
+            continue
+        yield record
+
+
+def write_csv(records: Iterable[PasswordRecord], stream: TextIO) -> int:
+    """Пишет записи в CSV с заголовком.
+
+    Returns:
+        int: Количество записей.
+    """
+    writer = csv.writer(stream)
+    writer.writerow(EXPORT_FIELDS)
+    written = 0
+    for record in records:
+        writer.writerow((record.username, record.service, record.password,
+                         _created_at(record)))
+        written += 1
+    return written
+
+
+def write_jsonl(records: Iterable[PasswordRecord], stream: TextIO) -> int:
+    """Пишет записи в JSON Lines, по объекту в строке.
+
+    Returns:
+        int: Количество записей.
+    """
+    written = 0
+    for record in records:
+        stream.write(json.dumps({
+            'username': record.username,
+            'service': record.service,
+            'password': record.password,
+            'created_at': _created_at(record),
+        }, ensure_ascii=False))
+        stream.write('\n')
+        written += 1
+    return written
+
+
+def export_records(
+    records: Iterable[PasswordRecord],
+    output: str,
+    fmt: str = "csv",
+    on_skip: Optional[Callable[[PasswordRecord], None]] = None
+) -> int:
+    """Экспортирует записи в файл или stdout (если output равен '-').
+
+    Args:
+        records (Iterable[PasswordRecord]): Записи (обычно iter_records()).
+        output (str): Путь к файлу или '-'.
+        fmt (str): 'csv' или 'jsonl'.
+        on_skip (Optional[Callable[[PasswordRecord], None]]): Вызывается
+            для каждой записи, пропущенной из-за ошибки расшифровки.
+
+    Returns:
+        int: Количество экспортированных записей.
+
+    Raises:
+        ValueError: Если формат неизвестен.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+    records = _exportable(records, on_skip)
+    if fmt == "csv":
+        return write_output(lambda stream: write_csv(records, stream), output,
+                            newline='', private=True)
+    return write_output(lambda stream: write_jsonl(records, stream), output,
+                        private=True)
@@ -1,10 +1,31 @@
 """Модуль генерации безопасных паролей с использованием криптографически стойкого источника.
 
 Использует модуль secrets для генерации случайных символов из выбранного алфавита.
+Для пакетной генерации случайные байты берутся из os.urandom крупными блоками
+и отображаются на алфавит методом отбраковки (rejection sampling) без смещения.
 """
 
+import os
 import secrets
 import string
+from functools import lru_cache
+from typing import Iterator, List
+
+from . import numpy_backend
+
+# Размер блока случайных байт, запрашиваемого у os.urandom за один вызов
+URANDOM_CHUNK_SIZE = 1 << 16
+
+# Количество паролей в одном пакете потоковой генерации
+STREAM_BATCH_SIZE = 8192
+
+# Бэкенды пакетной генерации
+BACKENDS = ("python", "numpy")
+
+
+def available_backends() -> List[str]:
+    """Возвращает список бэкендов, доступных в текущем окружении."""
+    return [b for b in BACKENDS if b != "numpy" or numpy_backend.is_available()]
 
 
 def generate_password(
@@ -27,6 +48,30 @@ def generate_password(
     Raises:
         ValueError: Если не выбран ни один тип символов (алфавит пуст).
     """
+    alphabet = build_alphabet(use_special, use_digits, use_uppercase)
+
+    password = ''.join(secrets.choice(alphabet) for _ in range(length))
+    return password
+
+
+def build_alphabet(
+    use_special: bool = True,
+    use_digits: bool = True,
+    use_uppercase: bool = True
+) -> str:
+    """Собирает алфавит из выбранных типов символов.
+
+    Args:
+        use_special (bool): Включать ли спецсимволы.
+        use_digits (bool): Включать ли цифры.
+        use_uppercase (bool): Включать ли заглавные буквы.
+
+    Returns:
+        str: Алфавит для генерации.
+
+    Raises:
+        ValueError: Если алфавит пуст.
+    """
     alphabet = string.ascii_lowercase
     if use_uppercase:
         alphabet += string.ascii_uppercase
@@ -37,6 +82,125 @@ def generate_password(
 
     if not alphabet:
         raise ValueError("Выберите хотя бы один тип символов для генерации")
+    return alphabet
 
-    password = ''.join(secrets.choice(alphabet) for _ in range(length))
-    return password
+
+@lru_cache(maxsize=32)
+def _build_translation(alphabet: str) -> tuple:
+    """Строит таблицу отображения байт на символы алфавита.
+
+    Байты из диапазона [0, limit), где limit кратен размеру алфавита,
+    отображаются на символ alphabet[b % n]. Остальные байты отбрасываются,
+    поэтому каждый символ алфавита выпадает с одинаковой вероятностью.
+
+    Args:
+        alphabet (str): Алфавит из ASCII-символов (не более 256).
+
+    Returns:
+        tuple: (таблица для bytes.translate, байты для удаления, доля принятых байт)
+    """
+    n = len(alphabet)
+    limit = 256 - 256 % n
+    encoded = alphabet.encode('ascii')
+    table = bytes(encoded[b % n] if b < limit else 0 for b in range(256))
+    rejected = bytes(range(limit, 256))
+    return table, rejected, limit / 256
+
+
+def random_chars(count: int, alphabet: str) -> str:
+    """Возвращает строку из count равновероятных символов алфавита.
+
+    Args:
+        count (int): Количество символов.
+        alphabet (str): Алфавит для выборки.
+
+    Returns:
+        str: Случайная строка длины count.
+    """
+    if not alphabet.isascii() or len(alphabet) > 256:
+        return ''.join(secrets.choice(alphabet) for _ in range(count))
+
+    table, rejected, accept_ratio = _build_translation(alphabet)
+    parts = []
+    remaining = count
+    while remaining > 0:
+        # Запрашиваем с запасом, чтобы обычно хватало одного вызова
+        request = min(int(remaining / accept_ratio * 1.05) + 16, URANDOM_CHUNK_SIZE)
+        chunk = os.urandom(request).translate(table, rejected)[:remaining]
+        parts.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(parts).decode('ascii')
+
+
+def generate_passwords(
+    count: int,
+    length: int = 12,
+    use_special: bool = True,
+    use_digits: bool = True,
+    use_uppercase: bool = True,
+    backend: str = "python"
+) -> List[str]:
+    """Генерирует пакет случайных паролей одинаковой длины.
+
+    В отличие от generate_password, не вызывает secrets.choice для каждого
+    символа: случайные байты читаются из os.urandom крупными блоками.
+    Бэкенд "numpy" выполняет отбраковку и отображение векторно.
+
+    Args:
+        count (int): Количество паролей.
+        length (int): Длина каждого пароля. По умолчанию 12.
+        use_special (bool): Включать ли спецсимволы. По умолчанию True.
+        use_digits (bool): Включать ли цифры. По умолчанию True.
+        use_uppercase (bool): Включать ли заглавные буквы. По умолчанию True.
+        backend (str): Бэкенд генерации: "python" или "numpy". По умолчанию "python".
+
+    Returns:
+        List[str]: Список сгенерированных паролей.
+
+    Raises:
+        ValueError: Если алфавит пуст или бэкенд неизвестен.
+        RuntimeError: Если выбран бэкенд "numpy", а NumPy не установлен.
+    """
+    alphabet = build_alphabet(use_special, use_digits, use_uppercase)
+    if backend == "numpy":
+        chars = numpy_backend.random_buffer(count * length, alphabet).decode('ascii')
+    elif backend == "python":
+        chars = random_chars(count * length, alphabet)
+    else:
+        raise ValueError(f"Неизвестный бэкенд генерации: {backend}")
+    return [chars[i:i + length] for i in range(0, count * length, length)]
+
+
+def iter_passwords(
+    count: int,
+    length: int = 12,
+    use_special: bool = True,
+    use_digits: bool = True,
+    use_uppercase: bool = True,
+    batch_size: int = STREAM_BATCH_SIZE,
+    backend: str = "python"
+) -> Iterator[List[str]]:
+    """Лениво генерирует пароли пакетами фиксированного размера.
+
+    В памяти одновременно находится не больше одного пакета, поэтому
+    потребление памяти не зависит от count.
+
+    Args:
+        count (int): Общее количество паролей.
+        length (int): Длина каждого пароля. По умолчанию 12.
+        use_special (bool): Включать ли спецсимволы. По умолчанию True.
+        use_digits (bool): Включать ли цифры. По умолчанию True.
+        use_uppercase (bool): Включать ли заглавные буквы. По умолчанию True.
+        batch_size (int): Размер пакета. По умолчанию STREAM_BATCH_SIZE.
+        backend (str): Бэкенд генерации. По умолчанию "python".
+
+    Yields:
+        List[str]: Очередной пакет паролей.
+    """
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        yield generate_passwords(
+            size, length, use_special, use_digits, use_uppercase, backend
+        )
+        remaining -= size
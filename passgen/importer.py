@@ -0,0 +1,115 @@
+"""Модуль чтения файлов для пакетного импорта паролей.
+
+Поддерживаются CSV с заголовком (username,service,password) и JSON Lines
+(по объекту с теми же ключами в строке). Файл читается потоково пакетами,
+так что размер файла не ограничен памятью. Строки без нужных полей или
+со значениями длиннее колонок таблицы пропускаются и подсчитываются:
+одна такая строка иначе сорвала бы COPY всего импорта.
+"""
+
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Количество строк, шифруемых и загружаемых за один COPY
+IMPORT_BATCH_SIZE = 10000
+
+# Максимальная длина username и service (VARCHAR(100) в схеме)
+MAX_NAME_LENGTH = 100
+
+ImportRow = Tuple[str, str, str]
+
+
+def detect_format(path: str) -> str:
+    """Определяет формат по расширению файла (по умолчанию CSV)."""
+    extension = os.path.splitext(path)[1].lower()
+    return "jsonl" if extension in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+class ImportReader:
+    """Потоковое чтение файла импорта пакетами.
+
+    Attributes:
+        skipped (int): Количество пропущенных некорректных строк.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None,
+                 batch_size: int = IMPORT_BATCH_SIZE):
+        """Инициализация.
+
+        Args:
+            path (str): Путь к файлу или '-' для stdin.
+            fmt (Optional[str]): 'csv' или 'jsonl'. По умолчанию — по расширению.
+            batch_size (int): Количество строк в пакете.
+
+        Raises:
+            ValueError: Если формат неизвестен.
+        """
+        fmt = fmt or detect_format(path)
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Неизвестный формат импорта: {fmt}")
+        self.path = path
+        self.format = fmt
+        self.batch_size = batch_size
+        self.skipped = 0
+
+    @contextmanager
+    def _open(self):
+        if self.path == '-':
+            yield sys.stdin
+        else:
+            with open(self.path, encoding='utf-8', newline='') as f:
+                yield f
+
+    def _iter_raw(self, f) -> Iterator[Optional[dict]]:
+        """Возвращает словари строк; None — строка не разбирается."""
+        if self.format == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+            yield item if isinstance(item, dict) else None
+
+    def _validate(self, item: Optional[dict]) -> Optional[ImportRow]:
+        if item is None:
+            return None
+        username = item.get('username')
+        service = item.get('service')
+        password = item.get('password')
+        if not all(isinstance(v, str) for v in (username, service, password)):
+            return None
+        username, service = username.strip(), service.strip()
+        if not (username and service and password):
+            return None
+        if len(username) > MAX_NAME_LENGTH or len(service) > MAX_NAME_LENGTH:
+            return None
+        if '\0' in username or '\0' in service:
+            return None
+        return username, service, password
+
+    def __iter__(self) -> Iterator[List[ImportRow]]:
+        """Возвращает пакеты корректных строк (username, service, password)."""
+        with self._open() as f:
+            batch = []
+            for item in self._iter_raw(f):
+                row = self._validate(item)
+                if row is None:
+                    self.skipped += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
@@ -0,0 +1,187 @@
+"""Модуль версионирования схемы БД.
+
+Схема меняется упорядоченными миграциями из MIGRATIONS; номер последней
+примененной хранится в таблице schema_version. Миграции применяются
+явно (python main.py --migrate) в одной транзакции под advisory-блокировкой,
+поэтому два одновременных запуска не применят одну миграцию дважды.
+
+Обычные команды только сверяют версию, причем результат кешируется
+локально в SCHEMA_CACHE_FILE для каждой базы: если там уже записана
+последняя версия, проверка не обращается к БД вовсе. Если базу удалили
+или пересоздали, запись кеша устаревает; первый же запрос к отсутствующей
+таблице сбрасывает её (forget_cached_version).
+
+SQL миграций выполняется с именованными параметрами (%(channel)s),
+поэтому символ % в тексте миграций экранируется как %%.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Локальный кеш версий схемы: {идентификатор базы: версия}
+SCHEMA_CACHE_FILE = "passgen_schema.json"
+
+# Подсказка, когда схемы нет или она устарела
+MIGRATE_HINT = "Схема БД не создана или устарела. Выполните: python main.py --migrate"
+
+# Ключ advisory-блокировки на время применения миграций
+MIGRATION_LOCK_ID = 7170501
+
+VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# (версия, описание, SQL) в порядке применения
+MIGRATIONS: Tuple[Tuple[int, str, str], ...] = (
+    (1, "таблица passwords", """
+    CREATE TABLE IF NOT EXISTS passwords (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR(100) NOT NULL,
+        service VARCHAR(100) NOT NULL,
+        encrypted_password TEXT,
+        encrypted_token BYTEA,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(username, service)
+    );
+    ALTER TABLE passwords ADD COLUMN IF NOT EXISTS encrypted_token BYTEA;
+    ALTER TABLE passwords ALTER COLUMN encrypted_password DROP NOT NULL;
+    """),
+    (2, "уведомления об изменениях для кеша чтения", """
+    CREATE OR REPLACE FUNCTION passgen_notify_change() RETURNS trigger AS $$
+    DECLARE
+        rec passwords%%ROWTYPE;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN rec := OLD; ELSE rec := NEW; END IF;
+        PERFORM pg_notify(TG_ARGV[0], json_build_object(
+            'username', rec.username, 'service', rec.service)::text);
+        IF TG_OP = 'UPDATE' AND (OLD.username, OLD.service)
+                IS DISTINCT FROM (NEW.username, NEW.service) THEN
+            PERFORM pg_notify(TG_ARGV[0], json_build_object(
+                'username', OLD.username, 'service', OLD.service)::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    -- Триггер мог создать create_table до версионирования схемы; DROP и
+    -- CREATE TRIGGER блокируют таблицу, поэтому выполняются только при его отсутствии
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgname = 'passgen_notify_change'
+              AND tgrelid = to_regclass('passwords')
+        ) THEN
+            CREATE TRIGGER passgen_notify_change
+                AFTER INSERT OR UPDATE OR DELETE ON passwords
+                FOR EACH ROW EXECUTE FUNCTION passgen_notify_change(%(channel)s);
+        END IF;
+    END;
+    $$;
+    """),
+    (3, "индекс (service, username) для поиска и страниц по сервису", """
+    CREATE INDEX IF NOT EXISTS passwords_service_username_idx
+        ON passwords (service, username);
+    """),
+    (4, "индексы поиска по префиксу и подстроке (text_pattern_ops, pg_trgm)", """
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS passwords_service_prefix_idx
+        ON passwords (lower(service) text_pattern_ops);
+    CREATE INDEX IF NOT EXISTS passwords_username_prefix_idx
+        ON passwords (lower(username) text_pattern_ops);
+    CREATE INDEX IF NOT EXISTS passwords_service_trgm_idx
+        ON passwords USING gin (service gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS passwords_username_trgm_idx
+        ON passwords USING gin (username gin_trgm_ops);
+    """),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def database_id(params: Dict) -> str:
+    """Возвращает идентификатор базы для локального кеша версий."""
+    return (f"{params.get('user', '')}@{params.get('host', '')}:"
+            f"{params.get('port', '')}/{params.get('dbname', '')}")
+
+
+def read_cached_version(db_id: str, path: str = SCHEMA_CACHE_FILE) -> Optional[int]:
+    """Возвращает версию схемы из локального кеша или None."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            version = json.load(f).get(db_id)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return version if isinstance(version, int) else None
+
+
+def _update_cache(update, path: str) -> None:
+    """Применяет update к словарю версий и атомарно записывает кеш."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            versions = json.load(f)
+        if not isinstance(versions, dict):
+            versions = {}
+    except (OSError, ValueError):
+        versions = {}
+    update(versions)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(versions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Кеш — лишь оптимизация; без него версия проверяется запросом
+        pass
+
+
+def write_cached_version(db_id: str, version: int, path: str = SCHEMA_CACHE_FILE) -> None:
+    """Записывает версию схемы в локальный кеш (атомарно)."""
+    _update_cache(lambda versions: versions.__setitem__(db_id, version), path)
+
+
+def forget_cached_version(db_id: str, path: str = SCHEMA_CACHE_FILE) -> None:
+    """Удаляет версию схемы базы из локального кеша (атомарно)."""
+    if read_cached_version(db_id, path) is not None:
+        _update_cache(lambda versions: versions.pop(db_id, None), path)
+
+
+def get_schema_version(cur) -> int:
+    """Возвращает номер последней примененной миграции (0 — схемы нет)."""
+    cur.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return 0
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cur.fetchone()[0]
+
+
+def apply_migrations(conn, params: Dict) -> List[int]:
+    """Применяет недостающие миграции в одной транзакции.
+
+    Args:
+        conn: Соединение psycopg2.
+        params (Dict): Параметры SQL миграций (например, 'channel').
+
+    Returns:
+        List[int]: Номера примененных миграций.
+    """
+    applied = []
+    with conn.cursor() as cur:
+        cur.execute(VERSION_TABLE_SQL)
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+        current = get_schema_version(cur)
+        for version, description, sql in MIGRATIONS:
+            if version <= current:
+                continue
+            cur.execute(sql, params)
+            cur.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            applied.append(version)
+    conn.commit()
+    return applied
@@ -0,0 +1,60 @@
+"""Векторизованный бэкенд генерации паролей на NumPy.
+
+Необязательная зависимость: если NumPy не установлен, модуль импортируется,
+но is_available() возвращает False. Сам NumPy импортируется только при
+первой генерации этим бэкендом, чтобы команды, не использующие его
+(--save, --find-* и т. п.), не тратили время на загрузку.
+"""
+
+import importlib
+import os
+from importlib.util import find_spec
+
+# Размер блока случайных байт, запрашиваемого у os.urandom за один вызов
+URANDOM_CHUNK_SIZE = 1 << 20
+
+
+def is_available() -> bool:
+    """Проверяет, установлен ли NumPy (без его импорта)."""
+    return find_spec("numpy") is not None
+
+
+def random_buffer(count: int, alphabet: str) -> bytes:
+    """Возвращает count равновероятных символов алфавита одним буфером.
+
+    Байты из os.urandom векторно фильтруются по порогу limit (наибольшее
+    кратное размера алфавита, не превышающее 256) и переводятся в символы
+    через 256-элементную таблицу поиска без операции деления.
+
+    Args:
+        count (int): Количество символов.
+        alphabet (str): Алфавит из ASCII-символов (не более 256).
+
+    Returns:
+        bytes: Непрерывный буфер ASCII-символов длины count.
+
+    Raises:
+        RuntimeError: Если NumPy не установлен.
+        ValueError: Если алфавит не ASCII или длиннее 256 символов.
+    """
+    if not is_available():
+        raise RuntimeError("Бэкенд numpy недоступен: установите пакет numpy")
+    if not alphabet.isascii() or not 0 < len(alphabet) <= 256:
+        raise ValueError("Бэкенд numpy поддерживает только ASCII-алфавит до 256 символов")
+
+    np = importlib.import_module("numpy")
+    n = len(alphabet)
+    limit = 256 - 256 % n
+    symbols = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)
+    lookup = symbols[np.arange(256) % n]
+
+    out = np.empty(count, dtype=np.uint8)
+    filled = 0
+    while filled < count:
+        remaining = count - filled
+        request = min(int(remaining * 256 / limit * 1.05) + 16, URANDOM_CHUNK_SIZE)
+        raw = np.frombuffer(os.urandom(request), dtype=np.uint8)
+        accepted = raw[raw < limit][:remaining]
+        out[filled:filled + accepted.size] = lookup[accepted]
+        filled += accepted.size
+    return out.tobytes()
@@ -0,0 +1,104 @@
+"""Модуль потоковой записи сгенерированных паролей в файл или stdout."""
+
+import os
+import sys
+from typing import Callable, Iterable, List, Optional, TextIO
+
+# Размер буфера файла при потоковой записи
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def write_batches(batches: Iterable[List[str]], stream) -> int:
+    """Записывает пакеты паролей в поток, по одному паролю на строку.
+
+    Args:
+        batches (Iterable[List[str]]): Источник пакетов паролей.
+        stream: Текстовый поток с методом write.
+
+    Returns:
+        int: Количество записанных паролей.
+    """
+    written = 0
+    for batch in batches:
+        if not batch:
+            continue
+        stream.write('\n'.join(batch))
+        stream.write('\n')
+        written += len(batch)
+    return written
+
+
+def write_passwords(batches: Iterable[List[str]], output: str) -> int:
+    """Записывает пароли в файл или в stdout (если output равен '-').
+
+    Args:
+        batches (Iterable[List[str]]): Источник пакетов паролей.
+        output (str): Путь к файлу или '-' для стандартного вывода.
+
+    Returns:
+        int: Количество записанных паролей.
+    """
+    return write_output(lambda stream: write_batches(batches, stream), output)
+
+
+def write_output(write: Callable[[TextIO], int], output: str,
+                 newline: Optional[str] = None, private: bool = False) -> int:
+    """Вызывает write с потоком файла или stdout (если output равен '-').
+
+    Файл создается целиком: при ошибке в write он не появляется, а прежнее
+    содержимое остается нетронутым.
+
+    Args:
+        write (Callable[[TextIO], int]): Функция записи, возвращающая
+            количество записанных элементов.
+        output (str): Путь к файлу или '-' для стандартного вывода.
+        newline (Optional[str]): Параметр newline для open (для CSV — '').
+        private (bool): Создать файл с правами 0600 (только владелец),
+            независимо от umask.
+
+    Returns:
+        int: Результат write; 0, если получатель stdout закрыл канал.
+    """
+    if output == '-':
+        try:
+            written = write(sys.stdout)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Получатель закрыл канал (например, `| head`) — это не ошибка.
+            # Перенаправляем stdout в /dev/null, чтобы интерпретатор
+            # не упал при финальном сбросе буфера.
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 0
+        return written
+
+    if os.path.lexists(output) and (os.path.islink(output) or not os.path.isfile(output)):
+        # Ссылку (/dev/stdout), устройство или канал нельзя заменять
+        # переименованием — пишем в них напрямую
+        with _open_output(output, newline, private) as f:
+            return write(f)
+
+    # Пишем во временный файл и переименовываем его только после успешной
+    # записи, чтобы ошибка посреди генерации не оставила неполный файл
+    tmp_path = output + ".tmp"
+    try:
+        with _open_output(tmp_path, newline, private) as f:
+            written = write(f)
+        os.replace(tmp_path, output)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def _open_output(path: str, newline: Optional[str], private: bool) -> TextIO:
+    """Открывает файл для записи; при private — с правами 0600."""
+    if private:
+        fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        # Права в os.open действуют только при создании файла
+        os.fchmod(fd, 0o600)
+        return open(fd, 'w', encoding='utf-8', newline=newline, buffering=WRITE_BUFFER_SIZE)
+    return open(path, 'w', encoding='utf-8', newline=newline, buffering=WRITE_BUFFER_SIZE)
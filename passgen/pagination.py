@@ -0,0 +1,65 @@
+"""Модуль постраничной выборки по ключу (keyset pagination).
+
+Страница выбирается условием "ключ сортировки больше последнего ключа
+предыдущей страницы", а не OFFSET: запрос обслуживается сканированием
+диапазона индекса и стоит одинаково для первой и для тысячной страницы.
+Последний ключ передается вызывающему как непрозрачный курсор — base64url
+от JSON-списка значений ключа.
+"""
+
+import base64
+import binascii
+import json
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+
+class Page(NamedTuple):
+    """Страница результатов.
+
+    Attributes:
+        items (list): Записи страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None,
+            если страница последняя.
+    """
+    items: list
+    next_cursor: Optional[str]
+
+
+def encode_cursor(key: Sequence[str]) -> str:
+    """Кодирует ключ последней записи страницы в курсор."""
+    data = json.dumps(list(key), ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[str, ...]:
+    """Декодирует курсор в ключ из size значений.
+
+    Raises:
+        ValueError: Если курсор поврежден или не подходит к выборке.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError("Неверный курсор страницы")
+    if (not isinstance(key, list) or len(key) != size
+            or not all(isinstance(value, str) for value in key)):
+        raise ValueError("Неверный курсор страницы")
+    return tuple(key)
+
+
+def make_page(rows: List, limit: int, key_of) -> Tuple[List, Optional[str]]:
+    """Отрезает от limit + 1 строк лишнюю и строит курсор следующей страницы.
+
+    Args:
+        rows (List): Строки, выбранные с LIMIT limit + 1.
+        limit (int): Размер страницы.
+        key_of (Callable): Функция: строка -> ключ сортировки.
+
+    Returns:
+        Tuple[List, Optional[str]]: (строки страницы, курсор или None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key_of(rows[-1]))
@@ -0,0 +1,98 @@
+"""Модуль многопроцессной генерации больших пакетов паролей.
+
+Общее количество паролей делится на пакеты, которые генерируются в пуле
+процессов и по мере готовности передаются потребителю (например, в
+passgen.output.write_passwords). Одновременно в работе находится не больше
+2 * workers пакетов, поэтому память не растёт с ростом count.
+
+Каждый процесс получает случайные байты напрямую из os.urandom, то есть из
+CSPRNG ядра. В пользовательском пространстве нет состояния генератора,
+которое могло бы скопироваться при fork, поэтому потоки разных процессов
+независимы.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional
+
+from .generator import STREAM_BATCH_SIZE, generate_passwords
+
+
+def _batch_sizes(count: int, batch_size: int) -> Iterator[int]:
+    """Разбивает count на пакеты размером не больше batch_size."""
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        yield size
+        remaining -= size
+
+
+def iter_passwords_parallel(
+    count: int,
+    length: int = 12,
+    use_special: bool = True,
+    use_digits: bool = True,
+    use_uppercase: bool = True,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    batch_size: int = STREAM_BATCH_SIZE,
+    backend: str = "python",
+    source: Optional[object] = None
+) -> Iterator[List[str]]:
+    """Генерирует пароли пакетами в нескольких процессах.
+
+    Args:
+        count (int): Общее количество паролей.
+        length (int): Длина каждого пароля. По умолчанию 12.
+        use_special (bool): Включать ли спецсимволы. По умолчанию True.
+        use_digits (bool): Включать ли цифры. По умолчанию True.
+        use_uppercase (bool): Включать ли заглавные буквы. По умолчанию True.
+        workers (Optional[int]): Количество процессов. По умолчанию — число CPU.
+        ordered (bool): Отдавать пакеты в порядке постановки в очередь.
+            Если False, пакеты отдаются по мере готовности. По умолчанию True.
+        batch_size (int): Размер пакета. По умолчанию STREAM_BATCH_SIZE.
+        backend (str): Бэкенд генерации. По умолчанию "python".
+        source (Optional[object]): Скомпилированный источник паролей с методом
+            generate_many(count) — PasswordPolicy или CompiledPattern. Если
+            задан, параметры алфавита и бэкенд не используются.
+
+    Yields:
+        List[str]: Очередной пакет паролей.
+    """
+    if source is not None:
+        task, params = source.generate_many, ()
+    else:
+        task = generate_passwords
+        params = (length, use_special, use_digits, use_uppercase, backend)
+    sizes = _batch_sizes(count, batch_size)
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or count <= batch_size:
+        for size in sizes:
+            yield task(size, *params)
+        return
+
+    max_in_flight = workers * 2
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        if ordered:
+            pending = deque()
+            for size in sizes:
+                pending.append(pool.submit(task, size, *params))
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        else:
+            pending = set()
+            for size in sizes:
+                pending.add(pool.submit(task, size, *params))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in pending:
+                yield future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,206 @@
+"""Модуль генерации парольных фраз (Diceware) из файла со списком слов.
+
+Список слов не разбирается в Python-объекты: файл отображается в память
+через mmap, а смещения строк хранятся в индексе рядом со списком
+(файл <список>.idx). Индекс строится один раз и перестраивается только
+при изменении размера или времени модификации списка, поэтому открытие
+даже списка из миллиона слов сводится к двум mmap, а выбор слова — к O(1)
+обращению по смещениям.
+
+Поддерживается как простой формат (одно слово в строке), так и формат
+EFF/Diceware ("11111<TAB>слово"): берется последнее поле строки.
+"""
+
+import mmap
+import os
+import secrets
+import struct
+from array import array
+from typing import Iterator, List
+
+# Список слов по умолчанию, поставляемый с пакетом (2340 слов, ~11,2 бит на слово)
+WORDLIST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "wordlist.txt")
+
+# Количество слов по умолчанию: 7 слов из WORDLIST_FILE дают ~78 бит —
+# не меньше 6 слов классического Diceware-списка из 7776 слов (~77,5 бит)
+DEFAULT_WORDS = 7
+
+# Количество фраз в одном пакете потоковой генерации
+PASSPHRASE_BATCH_SIZE = 4096
+
+_INDEX_MAGIC = b"PGWIDX1\0"
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+
+
+class Wordlist:
+    """Список слов, отображенный в память, с индексом смещений строк."""
+
+    def __init__(self, path: str = WORDLIST_FILE):
+        """Открывает список слов и загружает (или строит) индекс.
+
+        Args:
+            path (str): Путь к файлу списка слов.
+
+        Raises:
+            ValueError: Если список пуст.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        if stat.st_size == 0:
+            self._file.close()
+            raise ValueError(f"Список слов пуст: {path}")
+
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_file = None
+        self._index_map = None
+        self._offsets = self._load_index(stat) or self._build_index(stat)
+        if len(self._offsets) == 0:
+            self.close()
+            raise ValueError(f"Список слов пуст: {path}")
+
+    def _index_path(self) -> str:
+        return self.path + ".idx"
+
+    def _load_index(self, stat):
+        """Отображает в память готовый индекс, если он актуален."""
+        try:
+            index_file = open(self._index_path(), 'rb')
+        except OSError:
+            return None
+
+        header = index_file.read(_INDEX_HEADER.size)
+        if len(header) == _INDEX_HEADER.size:
+            magic, size, mtime_ns, count = _INDEX_HEADER.unpack(header)
+            expected = _INDEX_HEADER.size + count * 2 * array('Q').itemsize
+            if (magic == _INDEX_MAGIC and size == stat.st_size
+                    and mtime_ns == stat.st_mtime_ns
+                    and os.fstat(index_file.fileno()).st_size == expected):
+                self._index_file = index_file
+                if count == 0:
+                    return memoryview(b"").cast('Q')
+                self._index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                return memoryview(self._index_map)[_INDEX_HEADER.size:].cast('Q')
+        index_file.close()
+        return None
+
+    def _build_index(self, stat):
+        """Строит индекс (начало, конец) непустых строк и сохраняет его."""
+        data = self._data
+        offsets = array('Q')
+        start = 0
+        end_of_data = len(data)
+        while start < end_of_data:
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = end_of_data
+            if data[start:end].strip():
+                offsets.append(start)
+                offsets.append(end)
+            start = end + 1
+
+        header = _INDEX_HEADER.pack(
+            _INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets) // 2
+        )
+        try:
+            with open(self._index_path(), 'wb') as f:
+                f.write(header)
+                offsets.tofile(f)
+        except OSError:
+            # Каталог только для чтения — работаем с индексом в памяти
+            pass
+        return memoryview(offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError("Индекс слова вне диапазона")
+        line = self._data[self._offsets[2 * i]:self._offsets[2 * i + 1]]
+        return line.split()[-1].decode('utf-8')
+
+    def random_word(self) -> str:
+        """Возвращает равновероятно выбранное слово."""
+        return self[secrets.randbelow(len(self))]
+
+    def close(self) -> None:
+        """Освобождает отображения и файлы."""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index_map is not None:
+            self._index_map.close()
+        if self._index_file is not None:
+            self._index_file.close()
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def generate_passphrase(
+    wordlist: Wordlist,
+    words: int = DEFAULT_WORDS,
+    separator: str = "-"
+) -> str:
+    """Генерирует парольную фразу из случайных слов.
+
+    Args:
+        wordlist (Wordlist): Открытый список слов.
+        words (int): Количество слов. По умолчанию DEFAULT_WORDS.
+        separator (str): Разделитель слов. По умолчанию "-".
+
+    Returns:
+        str: Парольная фраза.
+    """
+    return separator.join(wordlist.random_word() for _ in range(words))
+
+
+def generate_passphrases(
+    count: int,
+    wordlist: Wordlist,
+    words: int = DEFAULT_WORDS,
+    separator: str = "-"
+) -> List[str]:
+    """Генерирует пакет парольных фраз по одному открытому списку слов.
+
+    Args:
+        count (int): Количество фраз.
+        wordlist (Wordlist): Открытый список слов.
+        words (int): Количество слов в фразе. По умолчанию DEFAULT_WORDS.
+        separator (str): Разделитель слов. По умолчанию "-".
+
+    Returns:
+        List[str]: Список парольных фраз.
+    """
+    return [generate_passphrase(wordlist, words, separator) for _ in range(count)]
+
+
+def iter_passphrases(
+    count: int,
+    wordlist: Wordlist,
+    words: int = DEFAULT_WORDS,
+    separator: str = "-",
+    batch_size: int = PASSPHRASE_BATCH_SIZE
+) -> Iterator[List[str]]:
+    """Лениво генерирует парольные фразы пакетами.
+
+    Args:
+        count (int): Общее количество фраз.
+        wordlist (Wordlist): Открытый список слов.
+        words (int): Количество слов в фразе. По умолчанию DEFAULT_WORDS.
+        separator (str): Разделитель слов. По умолчанию "-".
+        batch_size (int): Размер пакета. По умолчанию PASSPHRASE_BATCH_SIZE.
+
+    Yields:
+        List[str]: Очередной пакет фраз.
+    """
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        yield generate_passphrases(size, wordlist, words, separator)
+        remaining -= size
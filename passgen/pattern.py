@@ -0,0 +1,136 @@
+"""Модуль генерации паролей по шаблону (например, "Cvcc-9999-ssss").
+
+Шаблон компилируется один раз в таблицу алфавитов по позициям и кешируется.
+Пакетная генерация не разбирает шаблон и не ветвится по символам: позиции
+с одинаковым алфавитом обслуживаются одним случайным буфером, который
+нарезается на столбцы срезами с шагом, а пароли собираются из столбцов.
+
+Символы шаблона:
+    c / C — строчная / заглавная согласная
+    v / V — строчная / заглавная гласная
+    a / A — строчная / заглавная латинская буква
+    9     — цифра
+    s     — спецсимвол
+    x     — буква или цифра
+    *     — любой символ (буквы, цифры, спецсимволы)
+    \\     — следующий символ используется буквально
+Остальные символы шаблона (например, "-") попадают в пароль как есть.
+"""
+
+import string
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .generator import random_chars
+
+_VOWELS = "aeiouy"
+_CONSONANTS = ''.join(c for c in string.ascii_lowercase if c not in _VOWELS)
+
+PATTERN_CLASSES: Dict[str, str] = {
+    'c': _CONSONANTS,
+    'C': _CONSONANTS.upper(),
+    'v': _VOWELS,
+    'V': _VOWELS.upper(),
+    'a': string.ascii_lowercase,
+    'A': string.ascii_uppercase,
+    '9': string.digits,
+    's': string.punctuation,
+    'x': string.ascii_letters + string.digits,
+    '*': string.ascii_letters + string.digits + string.punctuation,
+}
+
+
+class CompiledPattern:
+    """Скомпилированный шаблон: алфавит для каждой позиции пароля.
+
+    Attributes:
+        pattern (str): Исходный шаблон.
+        positions (Tuple[str, ...]): Алфавит каждой позиции; у литерала
+            алфавит из одного символа.
+    """
+
+    def __init__(self, pattern: str, positions: Tuple[str, ...]):
+        """Инициализация и группировка позиций по алфавитам."""
+        self.pattern = pattern
+        self.positions = positions
+
+        groups: Dict[str, List[int]] = {}
+        for index, alphabet in enumerate(positions):
+            groups.setdefault(alphabet, []).append(index)
+        self._groups = tuple((alphabet, tuple(indexes)) for alphabet, indexes in groups.items())
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r})"
+
+    def generate_many(self, count: int) -> List[str]:
+        """Генерирует пакет паролей по шаблону.
+
+        Args:
+            count (int): Количество паролей.
+
+        Returns:
+            List[str]: Список сгенерированных паролей.
+        """
+        columns = [None] * len(self.positions)
+        for alphabet, indexes in self._groups:
+            width = len(indexes)
+            if len(alphabet) == 1:
+                column = alphabet * count
+                for index in indexes:
+                    columns[index] = column
+                continue
+            buffer = random_chars(count * width, alphabet)
+            for offset, index in enumerate(indexes):
+                columns[index] = buffer[offset::width]
+        return list(map(''.join, zip(*columns)))
+
+    def generate(self) -> str:
+        """Генерирует один пароль по шаблону."""
+        return self.generate_many(1)[0]
+
+
+@lru_cache(maxsize=64)
+def compile_pattern(pattern: str) -> CompiledPattern:
+    """Компилирует шаблон в таблицу алфавитов и кеширует результат.
+
+    Args:
+        pattern (str): Шаблон пароля.
+
+    Returns:
+        CompiledPattern: Скомпилированный шаблон.
+
+    Raises:
+        ValueError: Если шаблон пуст или заканчивается одиночным "\\".
+    """
+    if not pattern:
+        raise ValueError("Шаблон пароля не может быть пустым")
+
+    positions = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            positions.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            positions.append(PATTERN_CLASSES.get(char, char))
+    if escaped:
+        raise ValueError("Шаблон не может заканчиваться символом '\\'")
+    return CompiledPattern(pattern, tuple(positions))
+
+
+def generate_from_pattern(pattern: str, count: int = 1) -> List[str]:
+    """Генерирует пароли по шаблону.
+
+    Args:
+        pattern (str): Шаблон пароля.
+        count (int): Количество паролей. По умолчанию 1.
+
+    Returns:
+        List[str]: Список сгенерированных паролей.
+    """
+    return compile_pattern(pattern).generate_many(count)
@@ -0,0 +1,218 @@
+"""Модуль скомпилированных политик генерации паролей.
+
+Политика описывает длину пароля, допустимый алфавит и минимальное количество
+символов каждого класса (строчные, заглавные, цифры, спецсимволы). Политика
+компилируется один раз: алфавиты классов и таблицы отображения байт строятся
+заранее и кешируются по параметрам, поэтому генерация выполняется за один
+проход без повторных попыток.
+"""
+
+import os
+import secrets
+import string
+import struct
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .generator import _build_translation, random_chars
+
+# Символы, которые легко спутать друг с другом при чтении
+AMBIGUOUS_CHARS = "Il1|O0o`'\""
+
+# Классы символов в порядке, в котором они перечисляются в политике
+CHAR_CLASSES = (
+    ("lowercase", string.ascii_lowercase),
+    ("uppercase", string.ascii_uppercase),
+    ("digits", string.digits),
+    ("special", string.punctuation),
+)
+
+
+class PasswordPolicy:
+    """Скомпилированная политика генерации паролей.
+
+    Экземпляры следует получать через compile_policy, чтобы одинаковые
+    параметры не компилировались повторно.
+
+    Attributes:
+        length (int): Длина пароля.
+        alphabet (str): Итоговый алфавит для свободных позиций.
+        requirements (Tuple[Tuple[str, str, int], ...]): Кортежи
+            (имя класса, алфавит класса, минимальное количество).
+    """
+
+    def __init__(
+        self,
+        length: int,
+        alphabet: str,
+        requirements: Tuple[Tuple[str, str, int], ...]
+    ):
+        """Инициализация политики и предвычисление таблиц отображения."""
+        self.length = length
+        self.alphabet = alphabet
+        self.requirements = requirements
+        self.min_length = sum(count for _, _, count in requirements)
+        self._ascii = all(chars.isascii() and len(chars) <= 256
+                          for chars in [alphabet] + [chars for _, chars, _ in requirements])
+
+        # Таблицы отображения байт кешируются в generator._build_translation
+        for chars in [alphabet] + [chars for _, chars, _ in requirements]:
+            if chars.isascii() and len(chars) <= 256:
+                _build_translation(chars)
+
+    def __repr__(self) -> str:
+        required = ", ".join(f"{name}>={count}" for name, _, count in self.requirements)
+        return f"PasswordPolicy(length={self.length}, alphabet={len(self.alphabet)}, {required})"
+
+    def generate(self) -> str:
+        """Генерирует один пароль, удовлетворяющий политике.
+
+        Returns:
+            str: Сгенерированный пароль.
+
+        Raises:
+            ValueError: Если длина меньше суммы минимумов по классам.
+        """
+        self._check_length()
+        chars = [c for _, class_chars, count in self.requirements
+                 for c in random_chars(count, class_chars)]
+        chars.extend(random_chars(self.length - self.min_length, self.alphabet))
+
+        # Перемешивание Фишера–Йетса, чтобы обязательные символы
+        # не занимали фиксированные позиции
+        for i in range(len(chars) - 1, 0, -1):
+            j = secrets.randbelow(i + 1)
+            chars[i], chars[j] = chars[j], chars[i]
+        return ''.join(chars)
+
+    def _check_length(self) -> None:
+        """Проверяет, что обязательные символы помещаются в пароль."""
+        if self.length < self.min_length:
+            raise ValueError(
+                f"Длина пароля {self.length} меньше суммы минимумов "
+                f"по классам ({self.min_length})"
+            )
+
+    def generate_many(self, count: int) -> List[str]:
+        """Генерирует пакет паролей, удовлетворяющих политике.
+
+        Символы каждого класса и свободных позиций берутся из random_chars
+        одним буфером на весь пакет и нарезаются на столбцы, как в
+        pattern.CompiledPattern. Перемешивание выполняется сортировкой по
+        случайным ключам: каждый символ пароля становится младшим байтом
+        64-битного числа, старшие 7 байт которого случайны. После sorted
+        символы стоят в равномерно случайном порядке (совпадение 56-битных
+        ключей практически исключено), и пароль извлекается из упакованных
+        чисел срезом, без цикла по символам в Python.
+
+        Args:
+            count (int): Количество паролей.
+
+        Returns:
+            List[str]: Список сгенерированных паролей.
+
+        Raises:
+            ValueError: Если длина меньше суммы минимумов по классам.
+        """
+        self._check_length()
+        if count <= 0 or self.length == 0:
+            return [''] * max(count, 0)
+        if not self._ascii:
+            return [self.generate() for _ in range(count)]
+
+        groups = [(chars, n) for _, chars, n in self.requirements]
+        groups.append((self.alphabet, self.length - self.min_length))
+        columns = []
+        for chars, width in groups:
+            if width:
+                buffer = random_chars(count * width, chars)
+                columns.extend(buffer[offset::width] for offset in range(width))
+        text = ''.join(map(''.join, zip(*columns))).encode('ascii')
+
+        size = 8 * self.length
+        keys = bytearray(os.urandom(size * count))
+        keys[7::8] = text
+        packer = struct.Struct(f">{self.length}Q")
+        unpack, pack = packer.unpack_from, packer.pack
+        return [pack(*sorted(unpack(keys, offset)))[7::8].decode('ascii')
+                for offset in range(0, size * count, size)]
+
+
+@lru_cache(maxsize=64)
+def compile_policy(
+    length: int = 12,
+    use_special: bool = True,
+    use_digits: bool = True,
+    use_uppercase: bool = True,
+    require_all: bool = False,
+    min_uppercase: int = 0,
+    min_digits: int = 0,
+    min_special: int = 0,
+    exclude_ambiguous: bool = False,
+    alphabet: Optional[str] = None
+) -> PasswordPolicy:
+    """Компилирует политику генерации и кеширует результат по параметрам.
+
+    Класс символов включается флагом use_* или ненулевым минимумом. Если
+    передан собственный алфавит, флаги use_* не учитываются: классы
+    определяются по символам алфавита.
+
+    Длина пароля здесь не проверяется — это делает utils.validate_args.
+
+    Args:
+        length (int): Длина пароля. По умолчанию 12.
+        use_special (bool): Включать ли спецсимволы. По умолчанию True.
+        use_digits (bool): Включать ли цифры. По умолчанию True.
+        use_uppercase (bool): Включать ли заглавные буквы. По умолчанию True.
+        require_all (bool): Требовать хотя бы один символ каждого включенного класса.
+        min_uppercase (int): Минимальное количество заглавных букв.
+        min_digits (int): Минимальное количество цифр.
+        min_special (int): Минимальное количество спецсимволов.
+        exclude_ambiguous (bool): Исключить похожие символы (AMBIGUOUS_CHARS).
+        alphabet (Optional[str]): Собственный алфавит вместо стандартных классов.
+
+    Returns:
+        PasswordPolicy: Скомпилированная политика.
+
+    Raises:
+        ValueError: Если минимум отрицателен, алфавит пуст или в нём нет
+            символов обязательного класса.
+    """
+    minimums = {
+        "lowercase": 0,
+        "uppercase": min_uppercase,
+        "digits": min_digits,
+        "special": min_special,
+    }
+    if any(count < 0 for count in minimums.values()):
+        raise ValueError("Минимальное количество символов не может быть отрицательным")
+
+    if alphabet is not None:
+        pool = ''.join(dict.fromkeys(alphabet))
+    else:
+        enabled = {
+            "lowercase": True,
+            "uppercase": use_uppercase or min_uppercase > 0,
+            "digits": use_digits or min_digits > 0,
+            "special": use_special or min_special > 0,
+        }
+        pool = ''.join(chars for name, chars in CHAR_CLASSES if enabled[name])
+
+    if exclude_ambiguous:
+        pool = ''.join(c for c in pool if c not in AMBIGUOUS_CHARS)
+    if not pool:
+        raise ValueError("Выберите хотя бы один тип символов для генерации")
+
+    requirements = []
+    for name, class_chars in CHAR_CLASSES:
+        chars = ''.join(c for c in class_chars if c in pool)
+        count = minimums[name]
+        if require_all and chars:
+            count = max(count, 1)
+        if count == 0:
+            continue
+        if not chars:
+            raise ValueError(f"В алфавите нет символов класса '{name}'")
+        requirements.append((name, chars, count))
+
+    return PasswordPolicy(length, pool, tuple(requirements))
@@ -0,0 +1,114 @@
+"""Модуль пула соединений с PostgreSQL.
+
+ConnectionPool оборачивает psycopg2.pool.ThreadedConnectionPool:
+
+* семафор на maxconn ожидает освобождения соединения, а не бросает
+  PoolError при исчерпании пула, поэтому пул можно использовать из
+  любого числа потоков;
+* соединение, простоявшее без дела дольше health_check_interval, перед
+  выдачей проверяется запросом SELECT 1 и при ошибке заменяется новым;
+* соединение, на котором произошла ошибка связи, закрывается, а не
+  возвращается в пул.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+# Ошибки, после которых соединение считается непригодным
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class ConnectionPool:
+    """Потокобезопасный пул соединений с проверкой здоровья."""
+
+    def __init__(self, minconn: int = 1, maxconn: int = 10,
+                 health_check_interval: float = 30.0, **connect_params):
+        """Создает пул и открывает minconn соединений.
+
+        Args:
+            minconn (int): Количество соединений, которые держатся открытыми.
+            maxconn (int): Максимальное количество одновременных соединений.
+            health_check_interval (float): Простой в секундах, после
+                которого соединение проверяется перед выдачей.
+            **connect_params: Параметры psycopg2.connect.
+
+        Raises:
+            ValueError: Если размеры пула некорректны.
+        """
+        if minconn < 0 or maxconn < max(minconn, 1):
+            raise ValueError("Некорректные размеры пула соединений")
+        self.health_check_interval = health_check_interval
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **connect_params)
+        self._maxconn = maxconn
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used: Dict[int, float] = {}
+
+    def _is_healthy(self, conn) -> bool:
+        """Проверяет соединение, если оно долго простаивало."""
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _acquire(self):
+        """Берет из пула исправное соединение."""
+        while True:
+            conn = self._pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def _discard(self, conn) -> None:
+        """Закрывает соединение и убирает его из пула."""
+        self._last_used.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+    @contextmanager
+    def connection(self):
+        """Выдает соединение на время блока with.
+
+        Блок выполняется в транзакции соединения (with conn): при
+        исключении она откатывается. Затем соединение возвращается в пул.
+
+        Yields:
+            Соединение psycopg2.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._acquire()
+            try:
+                with conn as transaction:
+                    yield transaction
+            except CONNECTION_ERRORS:
+                self._discard(conn)
+                raise
+            except BaseException:
+                self._release(conn)
+                raise
+            self._release(conn)
+        finally:
+            self._slots.release()
+
+    def _release(self, conn) -> None:
+        """Возвращает соединение в пул."""
+        if len(self._last_used) > 4 * self._maxconn:
+            # Записи закрытых пулом соединений; сброс лишь пропустит одну проверку
+            self._last_used.clear()
+        self._last_used[id(conn)] = time.monotonic()
+        self._pool.putconn(conn)
+
+    def close(self) -> None:
+        """Закрывает все соединения пула."""
+        self._pool.closeall()
+        self._last_used.clear()
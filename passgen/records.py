@@ -0,0 +1,112 @@
+"""Модуль компактных записей хранилища с ленивой расшифровкой.
+
+PasswordRecord хранит зашифрованное значение из БД и расшифровывает его
+только при первом обращении к атрибуту password. Поэтому выборка всех
+записей ради списка сервисов не требует ни одной операции шифрования,
+а __slots__ убирает словарь атрибутов у каждой из сотен тысяч записей.
+"""
+
+from typing import Iterable, List, Optional
+
+from .crypto_engine import DECRYPT_ERROR, CryptoEngine, decrypt_or_error
+from .storage import Token
+
+# Значение пароля в режиме вывода без расшифровки
+MASKED_PASSWORD = "********"
+
+
+class PasswordRecord:
+    """Запись хранилища: пользователь, сервис, дата и зашифрованный пароль.
+
+    Поддерживает доступ по ключу (record['service']), как словари,
+    которые get_all_records возвращал раньше.
+    """
+
+    __slots__ = ('username', 'service', 'created_at', '_token', '_password')
+
+    FIELDS = ('username', 'service', 'password', 'created_at')
+
+    def __init__(
+        self,
+        username: str,
+        service: str,
+        token: Optional[Token] = None,
+        created_at=None
+    ):
+        """Инициализация записи.
+
+        Args:
+            username (str): Имя пользователя
+            service (str): Название сервиса
+            token (Optional[Token]): Зашифрованный пароль. None — запись
+                выбрана без пароля (режим --masked).
+            created_at: Время создания записи
+        """
+        self.username = username
+        self.service = service
+        self.created_at = created_at
+        self._token = token
+        self._password = None
+
+    @property
+    def has_password(self) -> bool:
+        """Была ли запись выбрана вместе с зашифрованным паролем."""
+        return self._token is not None or self._password is not None
+
+    @property
+    def is_decrypted(self) -> bool:
+        """Был ли пароль уже расшифрован."""
+        return self._password is not None
+
+    @property
+    def decrypt_failed(self) -> bool:
+        """Не удалось ли расшифровать пароль (расшифровывает при необходимости)."""
+        return self.has_password and self.password == DECRYPT_ERROR
+
+    @property
+    def password(self) -> str:
+        """Пароль в открытом виде; расшифровывается при первом обращении.
+
+        Для записи без пароля возвращает MASKED_PASSWORD, для
+        поврежденной — "[Ошибка расшифровки]".
+        """
+        if self._password is None:
+            if self._token is None:
+                return MASKED_PASSWORD
+            self._password = decrypt_or_error(self._token)
+            self._token = None
+        return self._password
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self) -> tuple:
+        """Имена полей для совместимости со словарем."""
+        return self.FIELDS
+
+    def to_dict(self) -> dict:
+        """Возвращает запись в виде словаря (с расшифровкой пароля)."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"PasswordRecord({self.username!r}, {self.service!r})"
+
+
+def decrypt_records(records: Iterable[PasswordRecord], engine: CryptoEngine) -> None:
+    """Расшифровывает пароли записей одним пакетом.
+
+    Используется, когда пароли понадобятся у всех записей (например, при
+    аудите): пакет обрабатывается CryptoEngine, в том числе параллельно.
+
+    Args:
+        records (Iterable[PasswordRecord]): Записи
+        engine (CryptoEngine): Движок пакетной расшифровки
+    """
+    pending: List[PasswordRecord] = [r for r in records if r._token is not None]
+    passwords = engine.decrypt_many(r._token for r in pending)
+    for record, password in zip(pending, passwords):
+        record._password = password
+        record._token = None
+
@@ -0,0 +1,76 @@
+"""Модуль контрольной точки для перешифрования хранилища новым ключом.
+
+PasswordDatabase.rekey обходит таблицу пакетами по возрастанию id и после
+каждого зафиксированного пакета записывает сюда последний обработанный id.
+Если процесс прервать, следующий запуск продолжит с этого места. Отпечаток
+основного ключа в файле защищает от продолжения чужой ротации: если ключ
+с тех пор сменился, обход начинается заново.
+"""
+
+import json
+import os
+
+# Файл контрольной точки по умолчанию
+REKEY_CHECKPOINT_FILE = "passgen_rekey.checkpoint"
+
+
+class RekeyCheckpoint:
+    """Состояние перешифрования: ключ, последний id и счетчики."""
+
+    def __init__(self, path: str = REKEY_CHECKPOINT_FILE):
+        """Инициализация.
+
+        Args:
+            path (str): Путь к файлу контрольной точки.
+        """
+        self.path = path
+        self.key = None
+        self.last_id = 0
+        self.rekeyed = 0
+        self.failed = 0
+
+    def exists(self) -> bool:
+        """Есть ли незавершенное перешифрование."""
+        return os.path.exists(self.path)
+
+    def load(self, key: str) -> bool:
+        """Загружает состояние, если оно относится к ключу key.
+
+        Args:
+            key (str): Отпечаток текущего основного ключа.
+
+        Returns:
+            bool: True, если обход продолжается с сохраненного места.
+        """
+        self.key = key
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get('key') != key:
+            return False
+        self.last_id = int(state.get('last_id', 0))
+        self.rekeyed = int(state.get('rekeyed', 0))
+        self.failed = int(state.get('failed', 0))
+        return True
+
+    def save(self) -> None:
+        """Атомарно записывает состояние (через временный файл)."""
+        state = {
+            'key': self.key,
+            'last_id': self.last_id,
+            'rekeyed': self.rekeyed,
+            'failed': self.failed,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Удаляет файл после завершения обхода."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,604 @@
+"""Модуль встроенного хранилища паролей на SQLite.
+
+Хранилище в одном локальном файле для случаев, когда сервер PostgreSQL
+не нужен: та же таблица passwords (двоичный токен в колонке BLOB), те же
+upsert по паре (username, service), индексы и курсоры страниц, что
+у PasswordDatabase. Выбирается в config.BACKEND = "sqlite".
+
+Файл открывается в режиме WAL: читатели не блокируют писателя и друг
+друга, а фиксация транзакции — дозапись в журнал без fsync основного
+файла (synchronous=NORMAL). Каждый поток получает собственное
+соединение, поэтому пул не нужен. Версия схемы хранится в PRAGMA
+user_version самого файла.
+
+Отличия от PostgreSQL:
+    - lower() и сравнение без учета регистра в SQLite работают только
+      для ASCII, поэтому поиск по префиксу не различает регистр только
+      у латиницы;
+    - аналога pg_trgm нет: поиск по подстроке просматривает таблицу,
+      а не индекс, и похожие написания не находятся;
+    - кеша чтения нет: чтение из локального файла дешевле проверки
+      его свежести.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .backend import (
+    EXPORT_BATCH_SIZE, MIGRATION_BATCH_SIZE, REKEY_BATCH_SIZE, SEARCH_LIMIT,
+    StorageBackend
+)
+from .config import get_crypto_params
+from .crypto_engine import CryptoEngine
+from .pagination import Page, decode_cursor, make_page
+from .records import PasswordRecord, decrypt_records
+from .rekey import REKEY_CHECKPOINT_FILE, RekeyCheckpoint
+from .storage import (
+    encrypt_token, decrypt_password, convert_v1_to_v2, get_key_manager, key_fingerprint
+)
+
+# Зашифрованный пароль в любом формате: v2 (BLOB) или байты текста v1
+TOKEN_COLUMN = "COALESCE(encrypted_token, CAST(encrypted_password AS BLOB))"
+
+# Минимальная длина строки для поиска по подстроке (как у pg_trgm)
+MIN_SUBSTRING_LENGTH = 3
+
+# Сколько миллисекунд ждать снятия блокировки записи другим процессом
+BUSY_TIMEOUT_MS = 5000
+
+# Символ, больший любого другого: верхняя граница диапазона префикса
+_MAX_CHAR = "\U0010ffff"
+
+# Перевод в нижний регистр, совпадающий с lower() SQLite (только ASCII)
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# (версия, описание, запросы) в порядке применения
+MIGRATIONS: Tuple[Tuple[int, str, Tuple[str, ...]], ...] = (
+    (1, "таблица passwords", ("""
+    CREATE TABLE IF NOT EXISTS passwords (
+        id INTEGER PRIMARY KEY,
+        username VARCHAR(100) NOT NULL,
+        service VARCHAR(100) NOT NULL,
+        encrypted_password TEXT,
+        encrypted_token BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(username, service)
+    )
+    """,)),
+    (2, "индекс поиска по сервису", ("""
+    CREATE INDEX IF NOT EXISTS passwords_service_username_idx
+        ON passwords (service, username)
+    """,)),
+    (3, "индексы поиска по префиксу", ("""
+    CREATE INDEX IF NOT EXISTS passwords_service_lower_idx
+        ON passwords (lower(service))
+    """, """
+    CREATE INDEX IF NOT EXISTS passwords_username_lower_idx
+        ON passwords (lower(username))
+    """)),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+UPSERT_QUERY = """
+INSERT INTO passwords (username, service, encrypted_token)
+VALUES (?, ?, ?)
+ON CONFLICT (username, service)
+DO UPDATE SET
+    encrypted_token = excluded.encrypted_token,
+    encrypted_password = NULL,
+    created_at = CURRENT_TIMESTAMP
+"""
+
+
+def _record(row: tuple) -> PasswordRecord:
+    """Строит запись из строки (username, service, токен, created_at)."""
+    username, service, token, created_at = row
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return PasswordRecord(username, service, token, created_at)
+
+
+class SQLitePasswordDatabase(StorageBackend):
+    """Класс для управления паролями во встроенной базе данных SQLite."""
+
+    def __init__(self, path: str = "passgen.db"):
+        """Инициализация хранилища.
+
+        Args:
+            path (str): Путь к файлу базы данных (":memory:" не подходит:
+                у каждого потока была бы своя пустая база).
+        """
+        self.path = path
+        self.crypto = CryptoEngine(**get_crypto_params())
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока, открывая его при первом обращении.
+
+        Соединение работает в режиме autocommit: транзакции открываются
+        явно в _transaction.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Выполняет блок with в транзакции записи и возвращает курсор.
+
+        BEGIN IMMEDIATE сразу берет блокировку записи, поэтому прочитанные
+        в транзакции строки не изменятся другим процессом до ее фиксации.
+        """
+        conn = self._connect()
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        else:
+            cur.execute("COMMIT")
+        finally:
+            cur.close()
+
+    def _query(self, query: str, params=()) -> List[tuple]:
+        """Выполняет запрос на чтение и возвращает все строки."""
+        return self._connect().execute(query, params).fetchall()
+
+    def close(self) -> None:
+        """Закрывает соединения всех потоков и пул движка шифрования."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+        super().close()
+
+    def schema_version(self) -> int:
+        """Возвращает версию схемы файла (0 — схема не создана)."""
+        return self._query("PRAGMA user_version")[0][0]
+
+    def schema_is_current(self) -> bool:
+        """Проверяет, что к файлу применены все миграции."""
+        return self.schema_version() >= LATEST_VERSION
+
+    def migrate(self) -> List[int]:
+        """Применяет недостающие миграции схемы в одной транзакции.
+
+        Returns:
+            List[int]: Номера примененных миграций
+        """
+        applied = []
+        with self._transaction() as cur:
+            current = cur.execute("PRAGMA user_version").fetchone()[0]
+            for version, _, statements in MIGRATIONS:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    cur.execute(statement)
+                applied.append(version)
+            if applied:
+                cur.execute(f"PRAGMA user_version = {applied[-1]}")
+        return applied
+
+    def save_password(self, username: str, service: str, password: str) -> None:
+        """Сохраняет пароль в базу данных.
+
+        Args:
+            username (str): Имя пользователя
+            service (str): Название сервиса
+            password (str): Пароль в открытом виде
+        """
+        encrypted = encrypt_token(password)
+        with self._transaction() as cur:
+            cur.execute(UPSERT_QUERY, (username, service, encrypted))
+
+    def save_passwords(self, records: Iterable[Tuple[str, str, str]]) -> int:
+        """Сохраняет пакет паролей в одной транзакции.
+
+        При повторе пары (username, service) внутри пакета сохраняется
+        последнее значение.
+
+        Args:
+            records (Iterable[Tuple[str, str, str]]): Кортежи
+                (имя пользователя, сервис, пароль в открытом виде)
+
+        Returns:
+            int: Количество сохраненных записей
+        """
+        unique = {(username, service): password for username, service, password in records}
+        if not unique:
+            return 0
+        tokens = self.crypto.encrypt_many(unique.values())
+        with self._transaction() as cur:
+            cur.executemany(UPSERT_QUERY, (
+                (username, service, token)
+                for (username, service), token in zip(unique, tokens)
+            ))
+        return len(unique)
+
+    def import_records(self, batches: Iterable[List[Tuple[str, str, str]]],
+                       progress=None) -> int:
+        """Загружает пароли пакетами во временную таблицу и сливает их одним запросом.
+
+        Как и у PasswordDatabase: при повторе пары (username, service)
+        побеждает последняя строка файла, весь импорт — одна транзакция.
+
+        Args:
+            batches (Iterable[List[Tuple[str, str, str]]]): Пакеты кортежей
+                (имя пользователя, сервис, пароль в открытом виде)
+            progress (Optional[Callable[[int], None]]): Вызывается с общим
+                числом загруженных строк после каждого пакета
+
+        Returns:
+            int: Количество вставленных или обновленных записей
+        """
+        staging_query = """
+        CREATE TEMP TABLE IF NOT EXISTS passgen_import (
+            line INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            service TEXT NOT NULL,
+            encrypted_token BLOB NOT NULL
+        )
+        """
+        insert_query = """
+        INSERT INTO passgen_import (line, username, service, encrypted_token)
+        VALUES (?, ?, ?, ?)
+        """
+        merge_query = """
+        INSERT INTO passwords (username, service, encrypted_token)
+        SELECT username, service, encrypted_token
+        FROM passgen_import
+        WHERE line IN (
+            SELECT max(line) FROM passgen_import GROUP BY username, service
+        )
+        ON CONFLICT (username, service)
+        DO UPDATE SET
+            encrypted_token = excluded.encrypted_token,
+            encrypted_password = NULL,
+            created_at = CURRENT_TIMESTAMP
+        """
+        loaded = 0
+        with self._transaction() as cur:
+            cur.execute(staging_query)
+            cur.execute("DELETE FROM temp.passgen_import")
+            for batch in batches:
+                tokens = self.crypto.encrypt_many(password for _, _, password in batch)
+                cur.executemany(insert_query, (
+                    (line, username, service, token)
+                    for line, ((username, service, _), token) in enumerate(
+                        zip(batch, tokens), loaded)
+                ))
+                loaded += len(batch)
+                if progress is not None:
+                    progress(loaded)
+            cur.execute(merge_query)
+            merged = cur.rowcount
+            cur.execute("DROP TABLE temp.passgen_import")
+        return merged
+
+    def get_password(self, username: str, service: str) -> Optional[str]:
+        """Получает и расшифровывает пароль.
+
+        Args:
+            username (str): Имя пользователя
+            service (str): Название сервиса
+
+        Returns:
+            Optional[str]: Пароль в открытом виде или None
+        """
+        query = f"""
+        SELECT {TOKEN_COLUMN} FROM passwords
+        WHERE username = ? AND service = ?
+        """
+        rows = self._query(query, (username, service))
+        return decrypt_password(rows[0][0]) if rows else None
+
+    def search_by_username(self, username: str) -> List[Tuple[str, str]]:
+        """Ищет все записи по имени пользователя.
+
+        Args:
+            username (str): Имя пользователя
+
+        Returns:
+            List[Tuple[str, str]]: Список (сервис, пароль в открытом виде)
+        """
+        query = f"""
+        SELECT service, {TOKEN_COLUMN} FROM passwords
+        WHERE username = ?
+        ORDER BY service
+        """
+        rows = self._query(query, (username,))
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return [(service, password) for (service, _), password in zip(rows, passwords)]
+
+    def search_by_service(self, service: str) -> List[Tuple[str, str]]:
+        """Ищет все записи по названию сервиса.
+
+        Args:
+            service (str): Название сервиса
+
+        Returns:
+            List[Tuple[str, str]]: Список (имя пользователя, пароль в открытом виде)
+        """
+        query = f"""
+        SELECT username, {TOKEN_COLUMN} FROM passwords
+        WHERE service = ?
+        ORDER BY username
+        """
+        rows = self._query(query, (service,))
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return [(username, password) for (username, _), password in zip(rows, passwords)]
+
+    def get_all_records(self, with_passwords: bool = True) -> List[PasswordRecord]:
+        """Возвращает все записи с ленивой расшифровкой.
+
+        Args:
+            with_passwords (bool): Выбирать ли зашифрованные пароли
+
+        Returns:
+            List[PasswordRecord]: Список записей
+        """
+        token_column = TOKEN_COLUMN if with_passwords else "NULL"
+        query = f"""
+        SELECT username, service, {token_column}, created_at
+        FROM passwords
+        ORDER BY username, service
+        """
+        return [_record(row) for row in self._query(query)]
+
+    def search_like(self, column: str, term: str,
+                    limit: int = SEARCH_LIMIT) -> List[PasswordRecord]:
+        """Ищет записи по префиксу или подстроке.
+
+        Префикс ищется диапазоном по индексу lower(column). Подстрока
+        (для строк от MIN_SUBSTRING_LENGTH символов) проверяется через
+        instr() просмотром таблицы. Сначала идут совпадения по префиксу.
+
+        Args:
+            column (str): "service" или "username"
+            term (str): Строка поиска (например, "goog")
+            limit (int): Максимальное количество результатов
+
+        Returns:
+            List[PasswordRecord]: Найденные записи с ленивой расшифровкой
+        """
+        term = self._check_search(column, term).translate(_ASCII_LOWER)
+        other = "service" if column == "username" else "username"
+        prefix = f"(lower({column}) >= :low AND lower({column}) < :high)"
+        conditions = prefix
+        if len(term) >= MIN_SUBSTRING_LENGTH:
+            conditions += f" OR instr(lower({column}), :term) > 0"
+        query = f"""
+        SELECT username, service, {TOKEN_COLUMN}, created_at
+        FROM passwords
+        WHERE {conditions}
+        ORDER BY {prefix} DESC, {column}, {other}
+        LIMIT :limit
+        """
+        params = {'low': term, 'high': term + _MAX_CHAR, 'term': term, 'limit': limit}
+        return [_record(row) for row in self._query(query, params)]
+
+    def _fetch_page(self, query: str, params: tuple, keyset: str, after: Optional[str],
+                    key_size: int, limit: int) -> List[tuple]:
+        """Выбирает limit + 1 строк страницы по ключу (см. PasswordDatabase._fetch_page)."""
+        if limit <= 0:
+            raise ValueError("Размер страницы должен быть положительным")
+        if after is not None:
+            query = query.format(where=f"AND {keyset}")
+            params = params + decode_cursor(after, key_size)
+        else:
+            query = query.format(where="")
+        return self._query(query + " LIMIT ?", params + (limit + 1,))
+
+    def get_records_page(self, limit: int, after: Optional[str] = None,
+                         with_passwords: bool = True) -> Page:
+        """Возвращает страницу записей в порядке (username, service).
+
+        Args:
+            limit (int): Размер страницы
+            after (Optional[str]): Курсор из next_cursor предыдущей страницы
+            with_passwords (bool): Выбирать ли зашифрованные пароли
+
+        Returns:
+            Page: Записи PasswordRecord и курсор следующей страницы
+
+        Raises:
+            ValueError: Если курсор поврежден
+        """
+        token_column = TOKEN_COLUMN if with_passwords else "NULL"
+        query = f"""
+        SELECT username, service, {token_column}, created_at
+        FROM passwords
+        WHERE 1 {{where}}
+        ORDER BY username, service
+        """
+        rows = self._fetch_page(query, (), "(username, service) > (?, ?)",
+                                after, 2, limit)
+        rows, next_cursor = make_page(rows, limit, lambda row: row[:2])
+        return Page([_record(row) for row in rows], next_cursor)
+
+    def search_by_username_page(self, username: str, limit: int,
+                                after: Optional[str] = None) -> Page:
+        """Возвращает страницу результатов search_by_username.
+
+        Args:
+            username (str): Имя пользователя
+            limit (int): Размер страницы
+            after (Optional[str]): Курсор предыдущей страницы
+
+        Returns:
+            Page: Список (сервис, пароль) и курсор следующей страницы
+        """
+        query = f"""
+        SELECT service, {TOKEN_COLUMN} FROM passwords
+        WHERE username = ? {{where}}
+        ORDER BY service
+        """
+        rows = self._fetch_page(query, (username,), "service > ?", after, 1, limit)
+        rows, next_cursor = make_page(rows, limit, lambda row: row[:1])
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return Page([(service, password) for (service, _), password in zip(rows, passwords)],
+                    next_cursor)
+
+    def search_by_service_page(self, service: str, limit: int,
+                               after: Optional[str] = None) -> Page:
+        """Возвращает страницу результатов search_by_service.
+
+        Args:
+            service (str): Название сервиса
+            limit (int): Размер страницы
+            after (Optional[str]): Курсор предыдущей страницы
+
+        Returns:
+            Page: Список (имя пользователя, пароль) и курсор следующей страницы
+        """
+        query = f"""
+        SELECT username, {TOKEN_COLUMN} FROM passwords
+        WHERE service = ? {{where}}
+        ORDER BY username
+        """
+        rows = self._fetch_page(query, (service,), "username > ?", after, 1, limit)
+        rows, next_cursor = make_page(rows, limit, lambda row: row[:1])
+        passwords = self.crypto.decrypt_many(encrypted for _, encrypted in rows)
+        return Page([(username, password) for (username, _), password in zip(rows, passwords)],
+                    next_cursor)
+
+    def iter_records(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[PasswordRecord]:
+        """Потоково возвращает все записи с расшифрованными паролями.
+
+        Курсор SQLite выдает строки по мере чтения файла; пока он открыт,
+        запрос видит один снимок базы (WAL), даже если другие процессы пишут.
+
+        Args:
+            batch_size (int): Количество строк в пакете
+
+        Yields:
+            PasswordRecord: Записи в порядке (username, service)
+        """
+        query = f"""
+        SELECT username, service, {TOKEN_COLUMN}, created_at
+        FROM passwords
+        ORDER BY username, service
+        """
+        cur = self._connect().execute(query)
+        try:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                records = [_record(row) for row in rows]
+                decrypt_records(records, self.crypto)
+                yield from records
+        finally:
+            cur.close()
+
+    def migrate_storage(self, batch_size: int = MIGRATION_BATCH_SIZE,
+                        progress=None) -> int:
+        """Переводит строки формата v1 в формат v2 пакетами.
+
+        Args:
+            batch_size (int): Количество строк в пакете
+            progress (Optional[Callable[[int], None]]): Вызывается с общим
+                числом переведенных строк после каждого пакета
+
+        Returns:
+            int: Количество переведенных строк
+        """
+        select_query = """
+        SELECT id, encrypted_password FROM passwords
+        WHERE encrypted_token IS NULL AND id > ?
+        ORDER BY id
+        LIMIT ?
+        """
+        update_query = """
+        UPDATE passwords SET encrypted_token = ?, encrypted_password = NULL
+        WHERE id = ?
+        """
+        converted = 0
+        last_id = 0
+        while True:
+            with self._transaction() as cur:
+                rows = cur.execute(select_query, (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                values = []
+                for row_id, encrypted in rows:
+                    try:
+                        token = convert_v1_to_v2(encrypted)
+                    except ValueError:
+                        # Поврежденная строка остается в формате v1
+                        continue
+                    values.append((token, row_id))
+                cur.executemany(update_query, values)
+            converted += len(values)
+            last_id = rows[-1][0]
+            if progress is not None:
+                progress(converted)
+        return converted
+
+    def rekey(self, batch_size: int = REKEY_BATCH_SIZE,
+              checkpoint_file: str = REKEY_CHECKPOINT_FILE,
+              progress=None) -> Dict[str, int]:
+        """Перешифровывает все пароли основным ключом файла ключей.
+
+        Обход пакетами по id с контрольной точкой, как у
+        PasswordDatabase.rekey; вместо FOR UPDATE пакет читается
+        и записывается в одной транзакции BEGIN IMMEDIATE.
+
+        Args:
+            batch_size (int): Количество строк в пакете
+            checkpoint_file (str): Файл контрольной точки
+            progress (Optional[Callable[[RekeyCheckpoint], None]]): Вызывается
+                после каждого пакета
+
+        Returns:
+            Dict[str, int]: Счетчики 'rekeyed' и 'failed'
+        """
+        select_query = f"""
+        SELECT id, {TOKEN_COLUMN} FROM passwords
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+        """
+        update_query = """
+        UPDATE passwords SET encrypted_token = ?, encrypted_password = NULL
+        WHERE id = ?
+        """
+        checkpoint = RekeyCheckpoint(checkpoint_file)
+        checkpoint.load(key_fingerprint(get_key_manager().get_keys()[0]))
+        while True:
+            with self._transaction() as cur:
+                rows = cur.execute(select_query, (checkpoint.last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                tokens = self.crypto.rotate_many(encrypted for _, encrypted in rows)
+                values = [
+                    (token, row_id)
+                    for (row_id, _), token in zip(rows, tokens)
+                    if token is not None
+                ]
+                cur.executemany(update_query, values)
+            checkpoint.last_id = rows[-1][0]
+            checkpoint.rekeyed += len(values)
+            checkpoint.failed += len(rows) - len(values)
+            checkpoint.save()
+            if progress is not None:
+                progress(checkpoint)
+        checkpoint.clear()
+        return {'rekeyed': checkpoint.rekeyed, 'failed': checkpoint.failed}
@@ -1,18 +1,37 @@
 """Модуль для безопасного шифрования паролей."""
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
+from typing import Callable, List, Optional, Union
 import base64
+import hashlib
 import os
+import threading
+
+from .ciphers import AEAD_VERSIONS, FERNET, AeadCipher
+from .config import get_cipher_name
 
 # Генерируем или загружаем ключ шифрования
 KEY_FILE = "passgen_key.key"
 
+# Формат хранения v2: двоичный токен (без base64) в колонке BYTEA.
+# Первый байт двоичного токена — байт версии: 0x80 у Fernet, 0x01/0x02
+# у AEAD-шифров (см. passgen.ciphers); токен v1 (base64-текст) начинается
+# с ASCII-символа, поэтому форматы различимы.
+FERNET_VERSION_BYTE = 0x80
+
+# Тип зашифрованного значения из БД: str (v1) или bytes/memoryview (v2)
+Token = Union[str, bytes, bytearray, memoryview]
+
 
 def get_encryption_key() -> bytes:
-    """Получает ключ шифрования из файла или генерирует новый."""
+    """Получает основной ключ шифрования из файла или генерирует новый.
+
+    Файл может содержать несколько ключей, по одному в строке; основным
+    (используемым для шифрования) считается первый.
+    """
     if os.path.exists(KEY_FILE):
         with open(KEY_FILE, 'rb') as f:
-            return f.read()
+            return f.read().split()[0]
     else:
         # Генерируем новый ключ
         key = Fernet.generate_key()
@@ -22,6 +41,129 @@ def get_encryption_key() -> bytes:
         return key
 
 
+class KeyManager:
+    """Кеширует ключи шифрования и построенный по ним Fernet/MultiFernet.
+
+    Файл ключей читается один раз и перечитывается только при изменении
+    его mtime или размера. Если в файле несколько ключей, возвращается
+    MultiFernet: шифрование выполняется первым (самым новым) ключом,
+    расшифровка — любым из них, поэтому ключ можно сменить без простоя.
+    """
+
+    def __init__(self, key_file: Optional[str] = None):
+        """Инициализация менеджера.
+
+        Args:
+            key_file (Optional[str]): Путь к файлу ключей. По умолчанию KEY_FILE.
+        """
+        self.key_file = key_file
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._keys: List[bytes] = []
+        self._fernet = None
+        self._ciphers = {}
+
+    @property
+    def path(self) -> str:
+        """Путь к файлу ключей."""
+        return self.key_file or KEY_FILE
+
+    def _load(self) -> None:
+        """Перечитывает файл ключей, если он изменился."""
+        path = self.path
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if path == KEY_FILE:
+                get_encryption_key()
+            else:
+                with open(path, 'wb') as f:
+                    f.write(Fernet.generate_key())
+            stat = os.stat(path)
+
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        with open(path, 'rb') as f:
+            keys = f.read().split()
+        if not keys:
+            raise ValueError(f"Файл ключей пуст: {path}")
+
+        fernets = [Fernet(key) for key in keys]
+        self._keys = keys
+        self._fernet = fernets[0] if len(fernets) == 1 else MultiFernet(fernets)
+        self._ciphers = {}
+        self._stamp = stamp
+
+    def get_fernet(self):
+        """Возвращает закешированный Fernet (или MultiFernet при нескольких ключах)."""
+        with self._lock:
+            self._load()
+            return self._fernet
+
+    def get_cipher(self, name: str) -> AeadCipher:
+        """Возвращает закешированный AEAD-шифр name с ключами из файла."""
+        with self._lock:
+            self._load()
+            cipher = self._ciphers.get(name)
+            if cipher is None:
+                cipher = self._ciphers[name] = AeadCipher(name, self._keys)
+            return cipher
+
+    def get_keys(self) -> List[bytes]:
+        """Возвращает ключи из файла; первый — основной."""
+        with self._lock:
+            self._load()
+            return list(self._keys)
+
+    def add_key(self, key: Optional[bytes] = None) -> bytes:
+        """Добавляет новый основной ключ, сохраняя старые для расшифровки.
+
+        Файл перезаписывается атомарно (через временный файл и os.replace).
+
+        Args:
+            key (Optional[bytes]): Новый ключ. По умолчанию генерируется.
+
+        Returns:
+            bytes: Добавленный ключ.
+        """
+        key = key or Fernet.generate_key()
+        keys = [key] + self.get_keys()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"\n".join(keys) + b"\n")
+        os.replace(tmp_path, self.path)
+        self.invalidate()
+        return key
+
+    def invalidate(self) -> None:
+        """Сбрасывает кеш; следующий вызов перечитает файл."""
+        with self._lock:
+            self._stamp = None
+            self._fernet = None
+            self._ciphers = {}
+
+
+# Менеджер ключей по умолчанию для функций модуля
+_key_manager = KeyManager()
+
+
+def get_key_manager() -> KeyManager:
+    """Возвращает менеджер ключей по умолчанию."""
+    return _key_manager
+
+
+def get_fernet():
+    """Возвращает закешированный Fernet менеджера ключей по умолчанию."""
+    return _key_manager.get_fernet()
+
+
+def get_cipher(name: str) -> AeadCipher:
+    """Возвращает закешированный AEAD-шифр менеджера ключей по умолчанию."""
+    return _key_manager.get_cipher(name)
+
+
 def encrypt_password(password: str) -> str:
     """Шифрует пароль для хранения в БД.
     
@@ -31,19 +173,96 @@ def encrypt_password(password: str) -> str:
     Returns:
         str: Зашифрованный пароль в base64
     """
-    key = get_encryption_key()
-    fernet = Fernet(key)
+    fernet = get_fernet()
     
     # Шифруем пароль и кодируем в base64 для хранения в текстовом поле БД
     encrypted = fernet.encrypt(password.encode())
     return base64.b64encode(encrypted).decode('utf-8')
 
 
-def decrypt_password(encrypted_password: str) -> str:
-    """Расшифровывает пароль из БД.
+def _encrypt_bytes(data: bytes) -> bytes:
+    """Шифрует данные шифром из config.CIPHER в двоичный токен."""
+    name = get_cipher_name()
+    if name == FERNET:
+        return base64.urlsafe_b64decode(get_fernet().encrypt(data))
+    return get_cipher(name).encrypt(data)
+
+
+def encrypt_token(password: str) -> bytes:
+    """Шифрует пароль в формате хранения v2.
+    
+    Шифр выбирается в config.CIPHER: Fernet (по умолчанию), AES-GCM или
+    ChaCha20-Poly1305.
     
     Args:
-        encrypted_password (str): Зашифрованный пароль в base64
+        password (str): Пароль в открытом виде
+        
+    Returns:
+        bytes: Двоичный токен для колонки BYTEA
+    """
+    return _encrypt_bytes(password.encode())
+
+
+def get_encryptor() -> Callable[[str], bytes]:
+    """Возвращает функцию шифрования в формат v2 с зафиксированными шифром и ключом.
+    
+    Для пакетов: файл ключей и config.CIPHER проверяются один раз, а не
+    для каждого пароля, как в encrypt_token.
+    
+    Returns:
+        Callable[[str], bytes]: Функция: пароль -> двоичный токен
+    """
+    name = get_cipher_name()
+    if name == FERNET:
+        fernet = get_fernet()
+        return lambda password: base64.urlsafe_b64decode(fernet.encrypt(password.encode()))
+    cipher = get_cipher(name)
+    return lambda password: cipher.encrypt(password.encode())
+
+
+def convert_v1_to_v2(encrypted_password: str) -> bytes:
+    """Переводит зашифрованное значение v1 в формат v2 без расшифровки.
+    
+    Args:
+        encrypted_password (str): Зашифрованный пароль v1 (base64 от токена Fernet)
+        
+    Returns:
+        bytes: Двоичный токен Fernet
+    """
+    return base64.urlsafe_b64decode(base64.b64decode(encrypted_password))
+
+
+def _fernet_token(encrypted_password: Token) -> bytes:
+    """Приводит зашифрованное значение любого формата к токену Fernet."""
+    if isinstance(encrypted_password, str):
+        # v1: base64 от токена Fernet
+        return base64.b64decode(encrypted_password)
+    view = memoryview(encrypted_password)
+    if view[0] == FERNET_VERSION_BYTE:
+        return base64.urlsafe_b64encode(view)
+    return base64.b64decode(view)
+
+
+def _decrypt_bytes(encrypted_password: Token) -> bytes:
+    """Расшифровывает значение любого формата и шифра в байты."""
+    if not isinstance(encrypted_password, str):
+        view = memoryview(encrypted_password)
+        name = AEAD_VERSIONS.get(view[0]) if len(view) else None
+        if name is not None:
+            return get_cipher(name).decrypt(view)
+    return get_fernet().decrypt(_fernet_token(encrypted_password))
+
+
+def decrypt_password(encrypted_password: Token) -> str:
+    """Расшифровывает пароль из БД в любом из форматов хранения.
+    
+    Строка считается форматом v1 (base64 от токена Fernet). Байты или
+    memoryview (значение BYTEA) — форматом v2, если начинаются с байта
+    версии Fernet или AEAD-шифра, иначе — байтами текста v1. memoryview
+    декодируется напрямую, без промежуточного копирования в bytes.
+    
+    Args:
+        encrypted_password (Token): Зашифрованный пароль
         
     Returns:
         str: Пароль в открытом виде
@@ -52,13 +271,36 @@ def decrypt_password(encrypted_password: str) -> str:
         ValueError: Если не удалось расшифровать
     """
     try:
-        key = get_encryption_key()
-        fernet = Fernet(key)
-        
-        # Декодируем из base64 и расшифровываем
-        encrypted_bytes = base64.b64decode(encrypted_password)
-        decrypted = fernet.decrypt(encrypted_bytes)
+        decrypted = _decrypt_bytes(encrypted_password)
         
         return decrypted.decode('utf-8')
     except Exception as e:
-        raise ValueError(f"Ошибка расшифровки: {e}")
\ No newline at end of file
+        raise ValueError(f"Ошибка расшифровки: {e}")
+
+
+def rotate_token(encrypted_password: Token) -> bytes:
+    """Перешифровывает значение основным (первым) ключом.
+    
+    Значение расшифровывается любым из ключей файла и шифруется заново
+    основным ключом шифром из config.CIPHER, не покидая этой функции
+    в открытом виде. Результат всегда в формате v2, поэтому ротация
+    заодно переводит строки на выбранный шифр.
+    
+    Args:
+        encrypted_password (Token): Зашифрованный пароль в любом формате
+        
+    Returns:
+        bytes: Двоичный токен, зашифрованный основным ключом
+        
+    Raises:
+        ValueError: Если значение не расшифровывается ни одним ключом
+    """
+    try:
+        return _encrypt_bytes(_decrypt_bytes(encrypted_password))
+    except Exception as e:
+        raise ValueError(f"Ошибка перешифрования: {e}")
+
+
+def key_fingerprint(key: bytes) -> str:
+    """Возвращает короткий отпечаток ключа (не раскрывающий сам ключ)."""
+    return hashlib.sha256(key).hexdigest()[:16]
@@ -0,0 +1,324 @@
+"""Модуль оценки стойкости паролей.
+
+Оценка строится на заранее вычисленных таблицах: класс каждого
+ASCII-символа, размер алфавита для каждой комбинации классов, множество
+соседних клавиш раскладки и словарный индекс. Поэтому оценка одного пароля
+не требует ничего, кроме нескольких проходов по его символам, и пакет из
+тысяч паролей обрабатывается за доли секунды.
+
+Словарь из файла не разбирается при каждом запуске: рядом с ним один раз
+строится индекс (файл <словарь>.dictidx) — отсортированные уникальные слова
+и их смещения. Индекс отображается в память через mmap, поиск слова —
+бинарный поиск по смещениям, а перестраивается индекс только при изменении
+размера или времени модификации словаря.
+
+Эффективная энтропия считается как длина * log2(размер алфавита), где
+символы, входящие в клавиатурные последовательности, повторы или словарные
+слова, учитываются по сниженной стоимости.
+"""
+
+import math
+import mmap
+import os
+import string
+import struct
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Битовые маски классов символов
+LOWER, UPPER, DIGIT, SPECIAL, OTHER = 1, 2, 4, 8, 16
+
+# Размеры классов; для не-ASCII символов берется условная оценка
+_CLASS_SIZES = {LOWER: 26, UPPER: 26, DIGIT: 10, SPECIAL: len(string.punctuation), OTHER: 100}
+
+# Класс каждого ASCII-символа по его коду
+_CHAR_CLASS = [OTHER] * 128
+for _c in string.ascii_lowercase:
+    _CHAR_CLASS[ord(_c)] = LOWER
+for _c in string.ascii_uppercase:
+    _CHAR_CLASS[ord(_c)] = UPPER
+for _c in string.digits:
+    _CHAR_CLASS[ord(_c)] = DIGIT
+for _c in string.punctuation + " ":
+    _CHAR_CLASS[ord(_c)] = SPECIAL
+
+# Размер алфавита для каждой комбинации классов
+_CHARSET_SIZE = [
+    sum(size for bit, size in _CLASS_SIZES.items() if mask & bit)
+    for mask in range(32)
+]
+
+# Пары соседних клавиш (в обе стороны) для раскладки QWERTY
+_KEYBOARD_ROWS = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+_KEYBOARD_ADJACENT = frozenset(
+    pair
+    for row in _KEYBOARD_ROWS
+    for a, b in zip(row, row[1:])
+    for pair in ((a, b), (b, a))
+)
+
+# Замены "leet", которые снимаются перед поиском по словарю
+_LEET_TABLE = str.maketrans("0134579@$!|+", "oleastgasilt")
+
+# Минимальная длина последовательности или словарного слова, которая штрафуется
+MIN_PATTERN_LENGTH = 3
+MIN_WORD_LENGTH = 4
+
+# Распространенные пароли и слова, проверяемые всегда
+COMMON_WORDS = (
+    "password", "passw0rd", "qwerty", "admin", "welcome", "letmein", "monkey",
+    "dragon", "master", "login", "secret", "shadow", "sunshine", "princess",
+    "football", "baseball", "iloveyou", "trustno1", "superman", "batman",
+    "hello", "freedom", "whatever", "parol", "privet", "test",
+)
+
+# Пороги энтропии (в битах) для оценок 1..4
+SCORE_THRESHOLDS = (28, 36, 60, 80)
+SCORE_LABELS = ("очень слабый", "слабый", "средний", "хороший", "надежный")
+
+
+_INDEX_MAGIC = b"PGDIDX1\0"
+# magic, размер словаря, время модификации, число слов, макс. длина слова, размер слов
+_INDEX_HEADER = struct.Struct("<8sQQQQQ")
+
+
+class DictionaryIndex:
+    """Словарный индекс: COMMON_WORDS и слова из файла в отсортированном индексе."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Открывает (или строит) индекс словаря.
+
+        Args:
+            path (Optional[str]): Файл со словами (одно слово в строке, допускается
+                формат "11111<TAB>слово"). Если не задан — только COMMON_WORDS.
+        """
+        self.path = path
+        self._common = frozenset(w for w in COMMON_WORDS if len(w) >= MIN_WORD_LENGTH)
+        self._index_file = None
+        self._data = _INDEX_HEADER.pack(_INDEX_MAGIC, 0, 0, 0, 0, 0) + bytes(8)
+        if path is not None:
+            stat = os.stat(path)
+            self._data = self._load_index(stat) or self._build_index(stat)
+
+        _, _, _, self._count, max_length, _ = _INDEX_HEADER.unpack_from(self._data)
+        self._offsets = memoryview(self._data)[
+            _INDEX_HEADER.size:_INDEX_HEADER.size + (self._count + 1) * 8
+        ].cast('Q')
+        self.max_length = max([max_length] + [len(w) for w in self._common])
+        self._size = self._count + sum(1 for w in self._common if not self._lookup(w))
+
+    def _index_path(self) -> str:
+        return self.path + ".dictidx"
+
+    def _load_index(self, stat):
+        """Отображает в память готовый индекс, если он актуален."""
+        try:
+            index_file = open(self._index_path(), 'rb')
+        except OSError:
+            return None
+
+        header = index_file.read(_INDEX_HEADER.size)
+        if len(header) == _INDEX_HEADER.size:
+            magic, size, mtime_ns, count, _, words_size = _INDEX_HEADER.unpack(header)
+            expected = _INDEX_HEADER.size + (count + 1) * 8 + words_size
+            if (magic == _INDEX_MAGIC and size == stat.st_size
+                    and mtime_ns == stat.st_mtime_ns
+                    and os.fstat(index_file.fileno()).st_size == expected):
+                self._index_file = index_file
+                return mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        index_file.close()
+        return None
+
+    def _build_index(self, stat) -> bytes:
+        """Разбирает словарь, сортирует уникальные слова и сохраняет индекс."""
+        words = set()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if parts and len(parts[-1]) >= MIN_WORD_LENGTH:
+                    words.add(parts[-1].lower())
+
+        # Байтовый порядок UTF-8 совпадает с порядком кодовых точек
+        encoded = sorted(w.encode('utf-8') for w in words)
+        base = _INDEX_HEADER.size + (len(encoded) + 1) * 8
+        offsets = array('Q', [base])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        words_data = b"".join(encoded)
+
+        header = _INDEX_HEADER.pack(
+            _INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(encoded),
+            max(map(len, words), default=0), len(words_data)
+        )
+        data = header + offsets.tobytes() + words_data
+        try:
+            with open(self._index_path(), 'wb') as f:
+                f.write(data)
+        except OSError:
+            # Каталог только для чтения — работаем с индексом в памяти
+            pass
+        return data
+
+    def _lookup(self, word: str) -> bool:
+        """Ищет слово в отсортированном индексе бинарным поиском."""
+        key = word.encode('utf-8')
+        data, offsets = self._data, self._offsets
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            item = data[offsets[mid]:offsets[mid + 1]]
+            if item < key:
+                lo = mid + 1
+            elif item > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._common or self._lookup(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        """Освобождает отображение индекса и файл."""
+        self._offsets.release()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._index_file is not None:
+            self._index_file.close()
+
+
+@lru_cache(maxsize=8)
+def load_dictionary(path: Optional[str] = None) -> DictionaryIndex:
+    """Открывает словарный индекс и кеширует его на время работы процесса.
+
+    Args:
+        path (Optional[str]): Файл со словами (одно слово в строке, допускается
+            формат "11111<TAB>слово"). Если не задан — только COMMON_WORDS.
+
+    Returns:
+        DictionaryIndex: Индекс слов в нижнем регистре длиной от MIN_WORD_LENGTH.
+    """
+    return DictionaryIndex(path)
+
+
+def _pattern_mask(password: str) -> List[bool]:
+    """Отмечает символы, входящие в последовательности, обходы клавиатуры и повторы."""
+    n = len(password)
+    marked = [False] * n
+    lower = password.lower()
+    run_start = 0
+    for i in range(1, n + 1):
+        if i < n:
+            a, b = lower[i - 1], lower[i]
+            step = ord(b) - ord(a)
+            if (a == b or step in (1, -1) or (a, b) in _KEYBOARD_ADJACENT):
+                continue
+        if i - run_start >= MIN_PATTERN_LENGTH:
+            for j in range(run_start, i):
+                marked[j] = True
+        run_start = i
+    return marked
+
+
+def _dictionary_mask(password: str, dictionary: DictionaryIndex) -> tuple:
+    """Отмечает символы, покрытые словарными словами.
+
+    Кандидаты не длиннее dictionary.max_length, поэтому число проверок
+    линейно по длине пароля.
+
+    Returns:
+        tuple: (список отметок, найденные слова)
+    """
+    n = len(password)
+    marked = [False] * n
+    normalized = password.lower().translate(_LEET_TABLE)
+    found = []
+    covered = 0
+    for start in range(n - MIN_WORD_LENGTH + 1):
+        if start < covered:
+            continue
+        # Ищем самое длинное слово, начинающееся в этой позиции
+        for end in range(min(n, start + dictionary.max_length),
+                         start + MIN_WORD_LENGTH - 1, -1):
+            word = normalized[start:end]
+            if word in dictionary:
+                found.append(word)
+                for j in range(start, end):
+                    marked[j] = True
+                covered = end
+                break
+    return marked, found
+
+
+def score_password(password: str, dictionary: Optional[DictionaryIndex] = None) -> Dict:
+    """Оценивает стойкость пароля.
+
+    Args:
+        password (str): Пароль в открытом виде.
+        dictionary (Optional[DictionaryIndex]): Словарный индекс из
+            load_dictionary. По умолчанию — только COMMON_WORDS.
+
+    Returns:
+        Dict: Словарь с ключами 'length', 'charset', 'entropy', 'score' (0..4),
+        'label' и 'warnings'.
+    """
+    if dictionary is None:
+        dictionary = load_dictionary()
+
+    mask = 0
+    for c in password:
+        code = ord(c)
+        mask |= _CHAR_CLASS[code] if code < 128 else OTHER
+    charset = _CHARSET_SIZE[mask]
+    bits_per_char = math.log2(charset) if charset > 1 else 0.0
+
+    pattern = _pattern_mask(password)
+    in_dictionary, words = _dictionary_mask(password, dictionary)
+    word_bits = math.log2(len(dictionary)) if len(dictionary) > 1 else 1.0
+
+    entropy = len(words) * word_bits
+    warnings = []
+    for i in range(len(password)):
+        if in_dictionary[i]:
+            continue
+        entropy += 1.0 if pattern[i] else bits_per_char
+
+    if words:
+        warnings.append(f"словарные слова: {', '.join(words)}")
+    if any(pattern):
+        warnings.append("последовательности или повторы символов")
+    if bin(mask).count('1') == 1:
+        warnings.append("используется только один тип символов")
+
+    score = sum(entropy >= threshold for threshold in SCORE_THRESHOLDS)
+    return {
+        'length': len(password),
+        'charset': charset,
+        'entropy': round(entropy, 1),
+        'score': score,
+        'label': SCORE_LABELS[score],
+        'warnings': warnings,
+    }
+
+
+def score_passwords(
+    passwords: Iterable[str],
+    dictionary: Optional[DictionaryIndex] = None
+) -> Iterator[Dict]:
+    """Лениво оценивает поток паролей с общим словарным индексом.
+
+    Args:
+        passwords (Iterable[str]): Пароли в открытом виде.
+        dictionary (Optional[DictionaryIndex]): Словарный индекс.
+
+    Yields:
+        Dict: Результат score_password для очередного пароля.
+    """
+    if dictionary is None:
+        dictionary = load_dictionary()
+    for password in passwords:
+        yield score_password(password, dictionary)
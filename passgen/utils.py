@@ -3,26 +3,44 @@
 Содержит функцию проверки корректности входных данных.
 """
 
-def validate_args(length: int, use_special: bool, use_digits: bool, use_uppercase: bool) -> None:
+from typing import Optional
+from .policy import PasswordPolicy
+
+
+def validate_args(length: int, use_special: bool, use_digits: bool, use_uppercase: bool,
+                  count: int = 1, policy: Optional[PasswordPolicy] = None) -> None:
     """Проверяет корректность параметров для генерации пароля.
 
     Проверяет, что длина положительна. Если не выбраны спецсимволы, цифры
     или заглавные буквы — выводит предупреждение, но не прерывает выполнение.
+    Если передана скомпилированная политика, длина проверяется по ней.
 
     Args:
         length (int): Длина пароля.
         use_special (bool): Использовать спецсимволы.
         use_digits (bool): Использовать цифры.
         use_uppercase (bool): Использовать заглавные буквы.
+        count (int): Количество паролей. По умолчанию 1.
+        policy (Optional[PasswordPolicy]): Скомпилированная политика генерации.
 
     Returns:
         None
 
     Raises:
-        ValueError: Если длина пароля <= 0.
+        ValueError: Если длина пароля или количество паролей <= 0, либо длина
+            меньше суммы минимумов политики.
     """
     if length <= 0:
         raise ValueError("Длина пароля должна быть положительным числом")
+    if count <= 0:
+        raise ValueError("Количество паролей должно быть положительным числом")
+    if policy is not None:
+        if length < policy.min_length:
+            raise ValueError(
+                f"Длина пароля {length} меньше суммы минимумов по классам "
+                f"({policy.min_length})"
+            )
+        return
     if not (use_special or use_digits or use_uppercase):
         print("Предупреждение: не выбраны спецсимволы, цифры или заглавные буквы. "
               "Будут использоваться только строчные буквы.")
@@ -0,0 +1,122 @@
+"""Тесты для модуля async_database.py - асинхронного доступа к БД."""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from passgen import async_database
+from passgen.async_database import AsyncPasswordDatabase
+from passgen.crypto_engine import DECRYPT_ERROR
+
+
+def fake_decrypt(token):
+    """Расшифровка-заглушка: запоминает поток, в котором вызвана."""
+    fake_decrypt.threads.add(threading.get_ident())
+    if token == b"bad":
+        raise ValueError("Ошибка расшифровки")
+    return token.decode()
+
+
+fake_decrypt.threads = set()
+
+
+class TestAsyncPasswordDatabase(unittest.IsolatedAsyncioTestCase):
+    """Тестирует AsyncPasswordDatabase с подмененным пулом asyncpg."""
+
+    def setUp(self):
+        self.db = AsyncPasswordDatabase()
+        self.pool = MagicMock()
+        self.pool.execute = AsyncMock()
+        self.pool.fetchrow = AsyncMock()
+        self.pool.fetch = AsyncMock()
+        self.pool.close = AsyncMock()
+        self.db._pool = self.pool
+        fake_decrypt.threads.clear()
+
+    @patch('passgen.async_database.encrypt_token', return_value=b"\x80token")
+    async def test_save_password(self, mock_encrypt):
+        """Тест: пароль шифруется и сохраняется upsert-запросом."""
+        await self.db.save_password("alice", "github", "secret")
+
+        mock_encrypt.assert_called_once_with("secret")
+        query, *params = self.pool.execute.call_args.args
+        self.assertIn("ON CONFLICT (username, service)", query)
+        self.assertEqual(params, ["alice", "github", b"\x80token"])
+
+    @patch('passgen.async_database.decrypt_password', side_effect=fake_decrypt)
+    async def test_concurrent_lookups_decrypt_off_loop(self, mock_decrypt):
+        """Тест: одновременные запросы расшифровываются вне потока цикла событий."""
+        self.pool.fetchrow.side_effect = lambda query, username, service: (
+            (f"{username}@{service}".encode(),))
+
+        results = await asyncio.gather(*(
+            self.db.get_password(f"user{i}", "svc") for i in range(100)
+        ))
+
+        self.assertEqual(results, [f"user{i}@svc" for i in range(100)])
+        self.assertNotIn(threading.get_ident(), fake_decrypt.threads)
+
+    async def test_get_password_missing(self):
+        """Тест: отсутствующая запись дает None без расшифровки."""
+        self.pool.fetchrow.return_value = None
+        self.assertIsNone(await self.db.get_password("alice", "github"))
+
+    @patch('passgen.crypto_engine.decrypt_password', side_effect=fake_decrypt)
+    async def test_search_by_username_and_service(self, mock_decrypt):
+        """Тест поиска: пароли расшифровываются одним пакетом."""
+        self.pool.fetch.return_value = [("github", b"p1"), ("gitlab", b"bad")]
+        self.assertEqual(await self.db.search_by_username("alice"),
+                         [("github", "p1"), ("gitlab", DECRYPT_ERROR)])
+        self.assertEqual(self.pool.fetch.call_args.args[1], "alice")
+
+        self.pool.fetch.return_value = [("bob", b"p3")]
+        self.assertEqual(await self.db.search_by_service("github"), [("bob", "p3")])
+        self.assertIn("WHERE service = $1", self.pool.fetch.call_args.args[0])
+
+    @patch('passgen.crypto_engine.decrypt_password', side_effect=fake_decrypt)
+    async def test_get_all_records(self, mock_decrypt):
+        """Тест: записи возвращаются лениво и расшифровываются пакетом."""
+        self.pool.fetch.return_value = [("alice", "github", b"p1", None)]
+        records = await self.db.get_all_records()
+        self.assertFalse(records[0].is_decrypted)
+
+        await self.db.decrypt_records(records)
+        self.assertEqual(records[0].password, "p1")
+        self.assertNotIn(threading.get_ident(), fake_decrypt.threads)
+
+        await self.db.get_all_records(with_passwords=False)
+        self.assertIn("NULL", self.pool.fetch.call_args.args[0])
+
+    async def test_close(self):
+        """Тест: close закрывает пул asyncpg."""
+        async with self.db:
+            pass
+        self.pool.close.assert_awaited_once()
+        self.assertIsNone(self.db._pool)
+
+    @patch('passgen.async_database.asyncpg', None)
+    async def test_requires_asyncpg(self):
+        """Тест: без asyncpg подключение сообщает о недостающем пакете."""
+        db = AsyncPasswordDatabase()
+        self.assertFalse(async_database.is_available())
+        with self.assertRaises(RuntimeError):
+            await db.get_password("alice", "github")
+
+    async def test_pool_created_once(self):
+        """Тест: одновременные первые запросы создают один пул."""
+        fake_asyncpg = MagicMock()
+        fake_asyncpg.create_pool = AsyncMock(return_value=self.pool)
+        self.pool.fetchrow.return_value = None
+        db = AsyncPasswordDatabase()
+        with patch('passgen.async_database.asyncpg', fake_asyncpg):
+            await asyncio.gather(*(db.get_password("a", "b") for _ in range(10)))
+
+        fake_asyncpg.create_pool.assert_awaited_once()
+        kwargs = fake_asyncpg.create_pool.call_args.kwargs
+        self.assertIn('database', kwargs)
+        self.assertNotIn('dbname', kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Тесты для модуля bench.py - бенчмарков генерации."""
+
+import json
+import string
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from passgen.bench import (
+    bench_ciphers, bench_generate, check_uniformity, chi_square_uniformity, main
+)
+from passgen.generator import random_chars
+from passgen.policy import PasswordPolicy
+
+
+class TestBench(unittest.TestCase):
+    """Тестирует бенчмарки и проверку равномерности."""
+
+    def test_uniform_sample_passes(self):
+        """Тест: несмещенная выборка проходит проверку хи-квадрат."""
+        alphabet = string.ascii_letters + string.digits
+        result = chi_square_uniformity(random_chars(62 * 1000, alphabet), alphabet)
+        self.assertEqual(result['df'], 61)
+        self.assertTrue(result['uniform'])
+
+    def test_modulo_bias_detected(self):
+        """Тест: смещение от взятия байта по модулю обнаруживается."""
+        alphabet = string.ascii_letters + string.digits
+        biased = ''.join(alphabet[b % 62] for b in range(256)) * 400
+        result = chi_square_uniformity(biased, alphabet)
+        self.assertFalse(result['uniform'])
+        self.assertLess(result['p_value'], 0.001)
+
+    def test_bench_generate_rows(self):
+        """Тест структуры результатов замера."""
+        results = bench_generate(lengths=(8,), batch_sizes=(1, 10),
+                                 flag_combinations=((True, True, True),),
+                                 backends=["python"], min_time=0.001)
+        self.assertEqual([r['function'] for r in results],
+                         ["generate_password", "generate_passwords"])
+        self.assertTrue(all(r['passwords_per_sec'] > 0 for r in results))
+        self.assertAlmostEqual(results[1]['bytes_per_sec'],
+                               results[1]['passwords_per_sec'] * 8, delta=1)
+
+    def test_main_outputs_json(self):
+        """Тест вывода отчета в JSON."""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            code = main(["generate", "--quick"])
+        report = json.loads(mock_stdout.getvalue())
+        self.assertEqual(code, 0)
+        self.assertEqual(report['suite'], "generate")
+        self.assertIn("generate_passwords[python, 94]", report['uniformity'])
+
+    def test_check_uniformity_covers_all_paths(self):
+        """Тест: проверяются все алфавиты, многопроцессный путь и политика."""
+        checks = check_uniformity(backends=["python"], sample_size=20000)
+        for size in (26, 36, 52, 58, 62, 68, 84, 94):
+            self.assertIn(f"generate_password[{size}]", checks)
+            self.assertIn(f"generate_passwords[python, {size}]", checks)
+            self.assertIn(f"iter_passwords_parallel[{size}]", checks)
+            self.assertIn(f"policy[{size}, lowercase, positions]", checks)
+        self.assertIn("policy[94, special]", checks)
+        self.assertTrue(all(check['uniform'] for check in checks.values()))
+
+    def test_unshuffled_policy_detected(self):
+        """Тест: обязательные символы на фиксированных местах обнаруживаются."""
+        generate_many = PasswordPolicy.generate_many
+
+        def unshuffled(policy, count):
+            return [''.join(sorted(p)) for p in generate_many(policy, count)]
+
+        with patch.object(PasswordPolicy, 'generate_many', unshuffled):
+            checks = check_uniformity(backends=["python"], sample_size=20000)
+        self.assertFalse(checks["policy[94, digits, positions]"]['uniform'])
+        self.assertTrue(checks["policy[94, digits]"]['uniform'])
+
+    def test_bench_ciphers_rows(self):
+        """Тест сравнения шифров: все шифры и размер токена AEAD меньше Fernet."""
+        results = bench_ciphers(lengths=(16,), batch_size=10, min_time=0.001)
+        sizes = {r['cipher']: r['token_bytes'] for r in results}
+        self.assertEqual(set(sizes), {"fernet", "aes-gcm", "chacha20-poly1305"})
+        self.assertLess(sizes["aes-gcm"], sizes["fernet"])
+        self.assertTrue(all(r['decrypt_per_sec'] > 0 for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Тесты для модуля bloom.py - уникальной генерации на фильтре Блума."""
+
+import unittest
+from passgen.bloom import BloomFilter, iter_unique
+from passgen.generator import iter_passwords
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Тестирует фильтр Блума."""
+
+    def test_sizing(self):
+        """Тест расчета размера: ~14.4 бита и 10 хешей на элемент при p=0.001."""
+        bloom = BloomFilter(100000, 0.001)
+        self.assertEqual(bloom.num_hashes, 10)
+        self.assertAlmostEqual(bloom.num_bits / 100000, 14.38, delta=0.05)
+        self.assertEqual(bloom.size_bytes, (bloom.num_bits + 7) // 8)
+
+    def test_no_false_negatives(self):
+        """Тест отсутствия ложноотрицательных ответов."""
+        bloom = BloomFilter(1000, 0.01)
+        items = [f"item{i}".encode() for i in range(1000)]
+        self.assertFalse(any(bloom.add(item) for item in items[:1]))
+        for item in items[1:]:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertTrue(bloom.add(items[0]))
+
+    def test_false_positive_rate(self):
+        """Тест доли ложных срабатываний около заданной."""
+        bloom = BloomFilter(5000, 0.01)
+        for i in range(5000):
+            bloom.add(f"in{i}".encode())
+        false_positives = sum(f"out{i}".encode() in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.03)
+
+    def test_invalid_parameters(self):
+        """Тест ошибок при некорректных параметрах."""
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+
+class TestIterUnique(unittest.TestCase):
+    """Тестирует отбор уникальных паролей."""
+
+    def test_unique_short_codes(self):
+        """Тест уникальности в пространстве с частыми коллизиями."""
+        # 26^3 = 17576 вариантов: без фильтра повторы в 5000 почти неизбежны
+        source = lambda n: iter_passwords(n, 3, False, False, False, batch_size=500)
+        passwords = [p for b in iter_unique(source, 5000) for p in b]
+        self.assertEqual(len(passwords), 5000)
+        self.assertEqual(len(set(passwords)), 5000)
+
+    def test_exhausted_space(self):
+        """Тест ошибки, когда уникальных паролей не хватает."""
+        source = lambda n: iter_passwords(n, 1, False, False, False)
+        with self.assertRaises(RuntimeError):
+            list(iter_unique(source, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Тесты для модуля cache.py - кеша чтения и уведомлений об изменениях."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from passgen.cache import MISSING, ChangeListener, TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    """Тестирует класс TTLCache."""
+
+    def setUp(self):
+        """Кеш с управляемыми часами."""
+        self.now = 0.0
+        self.cache = TTLCache(maxsize=2, ttl=10, clock=lambda: self.now)
+
+    def test_get_set_and_none_value(self):
+        """Тест чтения, отсутствующего ключа и хранения None."""
+        self.cache.set("a", None)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIs(self.cache.get("b"), MISSING)
+
+    def test_ttl_expiry(self):
+        """Тест устаревания записей."""
+        self.cache.set("a", 1)
+        self.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.now = 10.0
+        self.assertIs(self.cache.get("a"), MISSING)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованной записи."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertIs(self.cache.get("b"), MISSING)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_invalidate_and_clear(self):
+        """Тест удаления записей."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.invalidate("a")
+        self.assertIs(self.cache.get("a"), MISSING)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalid_params(self):
+        """Тест некорректных параметров."""
+        with self.assertRaises(ValueError):
+            TTLCache(maxsize=0)
+
+
+class TestChangeListener(unittest.TestCase):
+    """Тестирует класс ChangeListener."""
+
+    def test_listen_and_poll(self):
+        """Тест подписки и разбора уведомлений."""
+        conn = MagicMock()
+        conn.notifies = []
+        listener = ChangeListener(lambda: conn, "chan")
+
+        self.assertTrue(conn.autocommit)
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with("LISTEN chan")
+
+        conn.notifies.extend([
+            SimpleNamespace(payload='{"username": "u", "service": "s"}'),
+            SimpleNamespace(payload='не json'),
+        ])
+        self.assertEqual(listener.poll(), [("u", "s"), None])
+        self.assertEqual(conn.notifies, [])
+        conn.poll.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
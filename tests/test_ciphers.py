@@ -0,0 +1,57 @@
+"""Тесты для модуля ciphers.py - AEAD-шифров хранилища."""
+
+import unittest
+from cryptography.fernet import Fernet
+from passgen.ciphers import AES_GCM, CHACHA20, NONCE_SIZE, AeadCipher, derive_key
+
+
+class TestAeadCipher(unittest.TestCase):
+    """Тестирует класс AeadCipher."""
+
+    def setUp(self):
+        """Создает ключ в формате файла ключей."""
+        self.key = Fernet.generate_key()
+
+    def test_roundtrip_and_token_layout(self):
+        """Тест шифрования и формата токена для обоих шифров."""
+        for name, version in ((AES_GCM, 0x01), (CHACHA20, 0x02)):
+            with self.subTest(cipher=name):
+                cipher = AeadCipher(name, [self.key])
+                token = cipher.encrypt(b"secret")
+                self.assertEqual(token[0], version)
+                self.assertEqual(len(token), 1 + NONCE_SIZE + len(b"secret") + 16)
+                self.assertEqual(cipher.decrypt(memoryview(token)), b"secret")
+
+    def test_keys_are_separated_per_cipher(self):
+        """Тест: для разных шифров выводятся разные ключи."""
+        self.assertNotEqual(derive_key(self.key, AES_GCM), derive_key(self.key, CHACHA20))
+
+    def test_old_key_still_decrypts(self):
+        """Тест: после ротации старые токены расшифровываются, новые — новым ключом."""
+        old = AeadCipher(AES_GCM, [self.key])
+        token = old.encrypt(b"old")
+        new_key = Fernet.generate_key()
+        rotated = AeadCipher(AES_GCM, [new_key, self.key])
+
+        self.assertEqual(rotated.decrypt(token), b"old")
+        with self.assertRaises(ValueError):
+            old.decrypt(rotated.encrypt(b"new"))
+
+    def test_tampered_or_foreign_token(self):
+        """Тест: измененный токен или токен другого шифра отклоняются."""
+        cipher = AeadCipher(AES_GCM, [self.key])
+        token = bytearray(cipher.encrypt(b"secret"))
+        token[-1] ^= 1
+        with self.assertRaises(ValueError):
+            cipher.decrypt(bytes(token))
+        with self.assertRaises(ValueError):
+            cipher.decrypt(AeadCipher(CHACHA20, [self.key]).encrypt(b"secret"))
+
+    def test_unknown_cipher(self):
+        """Тест неизвестного имени шифра."""
+        with self.assertRaises(ValueError):
+            AeadCipher("des", [self.key])
+
+
+if __name__ == '__main__':
+    unittest.main()
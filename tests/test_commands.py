@@ -1,11 +1,16 @@
 """Тесты для модуля commands.py - обработки команд CLI."""
 
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 from io import StringIO
 import sys
 sys.path.append('.')
 from passgen.commands import handle_commands
+from passgen.pagination import Page
+from passgen.records import PasswordRecord, MASKED_PASSWORD
 
 
 class TestCommands(unittest.TestCase):
@@ -20,9 +25,43 @@ class TestCommands(unittest.TestCase):
             'find_by_username': None,
             'find_by_service': None,
             'find_by_both': None,
+            'find_service_like': None,
+            'find_username_like': None,
             'show_all': False,
+            'masked': False,
+            'limit': None,
+            'after': None,
+            'migrate': False,
+            'import_file': None,
+            'import_format': None,
+            'export_file': None,
+            'export_format': 'csv',
+            'migrate_storage': False,
+            'rekey': False,
             'generate': False,
             'length': 12,
+            'count': 1,
+            'pattern': None,
+            'output': None,
+            'workers': None,
+            'unordered': False,
+            'unique': False,
+            'unique_error_rate': 0.001,
+            'backend': 'python',
+            'require_all': False,
+            'min_uppercase': 0,
+            'min_digits': 0,
+            'min_special': 0,
+            'exclude_ambiguous': False,
+            'alphabet': None,
+            'passphrase': False,
+            'words': 7,
+            'wordlist': 'wordlist.txt',
+            'separator': '-',
+            'score': False,
+            'audit': False,
+            'min_score': 2,
+            'dictionary': None,
             'special': True,
             'digits': True,
             'uppercase': True
@@ -32,7 +71,7 @@ class TestCommands(unittest.TestCase):
             setattr(args, key, value)
         return args
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
     def test_generate_password(self, mock_db_class):
         """Тест команды генерации пароля.
         
@@ -56,8 +95,138 @@ class TestCommands(unittest.TestCase):
         # Проверяем вывод
         self.assertIn("Сгенерирован пароль:", output)
         self.assertIn("Abc123!@#", output)
+        
+        # Без сохранения к БД не подключаемся
+        mock_db_class.assert_not_called()
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
+    def test_generate_batch(self, mock_db_class):
+        """Тест пакетной генерации паролей с --count."""
+        mock_db_class.return_value = MagicMock()
+        args = self.mock_args(generate=True, count=3)
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+             patch('builtins.input') as mock_input:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+
+        self.assertIn("Сгенерировано паролей: 3", output)
+        mock_input.assert_not_called()
+
+    @patch('passgen.commands.create_database')
+    def test_generate_stream_to_stdout(self, mock_db_class):
+        """Тест потоковой генерации в stdout без обращения к БД."""
+        args = self.mock_args(generate=True, count=5, output='-')
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+
+        lines = output.splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(len(line) == 12 for line in lines))
+        mock_db_class.assert_not_called()
+
+    def test_stream_passphrase_missing_wordlist(self):
+        """Тест: ошибка открытия списка слов не выдается за ошибку записи."""
+        args = self.mock_args(generate=True, passphrase=True, count=2, output='-',
+                              wordlist='/nonexistent/words.txt')
+
+        with patch('sys.stderr', new_callable=StringIO) as mock_stderr, \
+             patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+
+        self.assertIn("Ошибка открытия списка слов", mock_stderr.getvalue())
+        self.assertNotIn("Ошибка записи", mock_stderr.getvalue())
+        self.assertEqual(mock_stdout.getvalue(), "")
+
+    def write_wordlist(self, words):
+        """Создает временный список слов и возвращает путь к нему."""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, "words.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(words) + "\n")
+        return path
+
+    def test_passphrase_batch_unique(self):
+        """Тест: --unique в пакете фраз исключает повторы."""
+        args = self.mock_args(generate=True, passphrase=True, count=4, words=1,
+                              unique=True, wordlist=self.write_wordlist("abcd"))
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+
+        phrases = mock_stdout.getvalue().split("=" * 40)[1].split()
+        self.assertEqual(sorted(phrases), ["a", "b", "c", "d"])
+
+    def test_passphrase_batch_unique_exhausted(self):
+        """Тест: --unique сообщает об ошибке, если фраз меньше, чем count."""
+        args = self.mock_args(generate=True, passphrase=True, count=5, words=1,
+                              unique=True, wordlist=self.write_wordlist("ab"))
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+
+        self.assertIn("Ошибка генерации: Недостаточно уникальных", output)
+        self.assertNotIn("Сгенерировано", output)
+
+    def test_stream_unique_exhausted(self):
+        """Тест: исчерпание --unique — ошибка параметров, файл не создается."""
+        output = os.path.join(os.path.dirname(self.write_wordlist("ab")), "out.txt")
+        args = self.mock_args(generate=True, passphrase=True, count=5, words=1,
+                              unique=True, output=output,
+                              wordlist=os.path.join(os.path.dirname(output), "words.txt"))
+
+        with patch('sys.stderr', new_callable=StringIO) as mock_stderr, \
+             patch('sys.stdout', new_callable=StringIO):
+            handle_commands(args)
+
+        self.assertIn("Ошибка параметров: Недостаточно уникальных", mock_stderr.getvalue())
+        self.assertNotIn("Ошибка записи", mock_stderr.getvalue())
+        self.assertFalse(os.path.exists(output))
+        self.assertFalse(os.path.exists(output + ".tmp"))
+
+    def test_passphrase_batch_invalid_count(self):
+        """Тест: неположительное количество фраз отклоняется, как для паролей."""
+        for count in (0, -5):
+            args = self.mock_args(generate=True, passphrase=True, count=count,
+                                  wordlist=self.write_wordlist("ab"))
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+                 patch('builtins.input') as mock_input:
+                handle_commands(args)
+
+            self.assertIn("Ошибка параметров", mock_stdout.getvalue())
+            mock_input.assert_not_called()
+
+    def test_passphrase_batch_score(self):
+        """Тест: --score выводит оценку каждой фразы пакета."""
+        args = self.mock_args(generate=True, passphrase=True, count=3, words=2,
+                              score=True, wordlist=self.write_wordlist(["korova", "moloko"]))
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+
+        phrases = mock_stdout.getvalue().split("=" * 40)[1].strip().splitlines()
+        self.assertEqual(len(phrases), 3)
+        self.assertTrue(all(" бит]" in line for line in phrases))
+
+    @patch('passgen.commands.create_database')
+    def test_generate_with_policy_too_short(self, mock_db_class):
+        """Тест ошибки, когда длина меньше суммы минимумов политики."""
+        mock_db_class.return_value = MagicMock()
+        args = self.mock_args(generate=True, length=3, min_digits=2, min_special=2)
+
+        with patch('passgen.commands.generate_password') as mock_generate, \
+             patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+
+        self.assertIn("Ошибка параметров", output)
+        mock_generate.assert_not_called()
+
+    @patch('passgen.commands.create_database')
     def test_save_password_command(self, mock_db_class):
         """Тест команды сохранения пароля."""
         mock_db = MagicMock()
@@ -73,7 +242,7 @@ class TestCommands(unittest.TestCase):
         mock_db.save_password.assert_called_once_with("user", "service", "mypassword")
         self.assertIn("Пароль сохранен!", output)
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
     def test_save_password_invalid_format(self, mock_db_class):
         """Тест сохранения пароля с неверным форматом."""
         mock_db = MagicMock()
@@ -88,7 +257,7 @@ class TestCommands(unittest.TestCase):
         self.assertIn("Ошибка: неверный формат", output)
         mock_db.save_password.assert_not_called()
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
     def test_find_by_username(self, mock_db_class):
         """Тест поиска по имени пользователя."""
         mock_db = MagicMock()
@@ -109,7 +278,7 @@ class TestCommands(unittest.TestCase):
         self.assertIn("service1", output)
         self.assertIn("service2", output)
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
     def test_find_by_service(self, mock_db_class):
         """Тест поиска по сервису."""
         mock_db = MagicMock()
@@ -130,7 +299,7 @@ class TestCommands(unittest.TestCase):
         self.assertIn("user1", output)
         self.assertIn("user2", output)
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
     def test_show_all_records(self, mock_db_class):
         """Тест показа всех записей."""
         mock_db = MagicMock()
@@ -150,12 +319,143 @@ class TestCommands(unittest.TestCase):
             handle_commands(args)
             output = mock_stdout.getvalue()
         
-        mock_db.get_all_records.assert_called_once()
+        mock_db.get_all_records.assert_called_once_with(with_passwords=True)
+        mock_db.decrypt_records.assert_called_once_with(mock_db.get_all_records.return_value)
         self.assertIn("Всего записей в базе", output)
         self.assertIn("user1", output)
         self.assertIn("service1", output)
     
-    @patch('passgen.commands.PasswordDatabase')
+    @patch('passgen.commands.create_database')
+    def test_show_all_masked(self, mock_db_class):
+        """Тест маскированного списка: пароли не запрашиваются."""
+        mock_db = MagicMock()
+        mock_db_class.return_value = mock_db
+        mock_db.get_all_records.return_value = [
+            PasswordRecord('user1', 'service1', None, '2024-01-01 12:00:00')
+        ]
+        
+        args = self.mock_args(show_all=True, masked=True)
+        
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+        
+        mock_db.get_all_records.assert_called_once_with(with_passwords=False)
+        mock_db.decrypt_records.assert_not_called()
+        self.assertIn("service1", output)
+        self.assertIn(MASKED_PASSWORD, output)
+    
+    @patch('passgen.commands.create_database')
+    def test_find_service_like(self, mock_db_class):
+        """Тест поиска по части названия сервиса."""
+        mock_db = MagicMock()
+        mock_db_class.return_value = mock_db
+        record = PasswordRecord('user1', 'google', None)
+        record._password = 'pass1'
+        mock_db.search_like.return_value = [record]
+        
+        args = self.mock_args(find_service_like="goog")
+        
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+        
+        mock_db.search_like.assert_called_once_with("service", "goog", 20)
+        self.assertIn("google", output)
+        self.assertIn("pass1", output)
+    
+    @patch('passgen.commands.create_database')
+    def test_show_all_page(self, mock_db_class):
+        """Тест постраничного вывода: страница и курсор следующей."""
+        mock_db = MagicMock()
+        mock_db_class.return_value = mock_db
+        mock_db.get_records_page.return_value = Page(
+            [PasswordRecord('user1', 'service1', None, '2024-01-01')], "CURSOR2"
+        )
+        
+        args = self.mock_args(show_all=True, masked=True, limit=1, after="CURSOR1")
+        
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+        
+        mock_db.get_records_page.assert_called_once_with(1, "CURSOR1", False)
+        mock_db.get_all_records.assert_not_called()
+        self.assertIn("service1", output)
+        self.assertIn("Записей на странице: 1", output)
+        self.assertNotIn("Всего записей в базе", output)
+        self.assertIn("--after CURSOR2", output)
+    
+    @patch('passgen.commands.create_database')
+    def test_audit_reports_weak_passwords(self, mock_db_class):
+        """Тест аудита: слабые пароли выводятся, сильные — нет."""
+        mock_db = MagicMock()
+        mock_db_class.return_value = mock_db
+        mock_db.get_all_records.return_value = [
+            {'username': 'u1', 'service': 'weak', 'password': 'qwerty123',
+             'created_at': '2024-01-01'},
+            {'username': 'u2', 'service': 'strong', 'password': 'T7#kq!Vz9@Lm2$Wx',
+             'created_at': '2024-01-01'},
+        ]
+
+        args = self.mock_args(audit=True)
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+            output = mock_stdout.getvalue()
+
+        self.assertIn("u1:weak", output)
+        self.assertNotIn("u2:strong", output)
+        self.assertIn("Проверено записей: 2, слабых: 1", output)
+
+    @patch('passgen.commands.RekeyCheckpoint')
+    @patch('passgen.commands.get_key_manager')
+    @patch('passgen.commands.create_database')
+    def test_rekey_adds_key_before_new_run(self, mock_db_class, mock_manager,
+                                           mock_checkpoint):
+        """Тест перешифрования: новый ключ добавляется только при новом запуске."""
+        mock_db = MagicMock()
+        mock_db_class.return_value = mock_db
+        mock_db.rekey.return_value = {'rekeyed': 5, 'failed': 0}
+        mock_manager.return_value.get_keys.return_value = [b"key"]
+        
+        args = self.mock_args(rekey=True)
+        
+        mock_checkpoint.return_value.exists.return_value = False
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+        mock_manager.return_value.add_key.assert_called_once()
+        self.assertIn("Записей: 5", mock_stdout.getvalue())
+        
+        mock_manager.return_value.add_key.reset_mock()
+        mock_checkpoint.return_value.exists.return_value = True
+        mock_checkpoint.return_value.load.return_value = True
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(args)
+        mock_manager.return_value.add_key.assert_not_called()
+        self.assertIn("Продолжение перешифрования", mock_stdout.getvalue())
+
+    @patch('passgen.commands.create_database')
+    def test_outdated_schema_requires_migrate(self, mock_db_class):
+        """Тест: при устаревшей схеме команда не выполняется, DDL не запускается."""
+        mock_db = MagicMock()
+        mock_db_class.return_value = mock_db
+        mock_db.schema_is_current.return_value = False
+        
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(self.mock_args(show_all=True))
+            output = mock_stdout.getvalue()
+        
+        self.assertIn("--migrate", output)
+        mock_db.get_all_records.assert_not_called()
+        mock_db.migrate.assert_not_called()
+        
+        mock_db.migrate.return_value = [1, 2]
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            handle_commands(self.mock_args(migrate=True))
+        self.assertIn("Применены миграции: 1, 2", mock_stdout.getvalue())
+
+    @patch('passgen.commands.create_database')
     def test_db_connection_error(self, mock_db_class):
         """Тест ошибки подключения к БД."""
         mock_db_class.side_effect = Exception("Connection failed")
@@ -0,0 +1,59 @@
+"""Тесты для модуля crypto_engine.py - пакетного шифрования."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+from passgen import storage
+from passgen.crypto_engine import DECRYPT_ERROR, CryptoEngine
+
+
+class TestCryptoEngine(unittest.TestCase):
+    """Тестирует CryptoEngine во всех режимах."""
+
+    def setUp(self):
+        """Подменяет менеджер ключей на временный файл ключей."""
+        fd, self.key_path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(Fernet.generate_key())
+        self.manager_patch = patch('passgen.storage._key_manager',
+                                   storage.KeyManager(self.key_path))
+        self.manager_patch.start()
+
+    def tearDown(self):
+        """Восстанавливает менеджер ключей и удаляет файл."""
+        self.manager_patch.stop()
+        os.remove(self.key_path)
+
+    def _roundtrip(self, mode):
+        passwords = [f"password-{i}" for i in range(50)]
+        with CryptoEngine(mode, workers=2, chunk_size=8) as engine:
+            tokens = engine.encrypt_many(passwords)
+            tokens[3] = b"\x80broken"
+            tokens[10] = memoryview(tokens[10])
+            decrypted = engine.decrypt_many(tokens)
+        expected = list(passwords)
+        expected[3] = DECRYPT_ERROR
+        self.assertEqual(decrypted, expected)
+
+    def test_serial_mode(self):
+        """Тест последовательного режима с сохранением порядка и ошибок."""
+        self._roundtrip("serial")
+
+    def test_thread_mode(self):
+        """Тест режима пула потоков."""
+        self._roundtrip("thread")
+
+    def test_process_mode(self):
+        """Тест режима пула процессов с собственным KeyManager в каждом."""
+        self._roundtrip("process")
+
+    def test_unknown_mode(self):
+        """Тест ошибки для неизвестного режима."""
+        with self.assertRaises(ValueError):
+            CryptoEngine("gpu")
+
+
+if __name__ == '__main__':
+    unittest.main()
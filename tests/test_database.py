@@ -1,8 +1,16 @@
 """Тесты для модуля database.py - работы с базой данных."""
 
 import unittest
+import json
+import os
+import tempfile
 from unittest.mock import patch, MagicMock
-from passgen.database import PasswordDatabase
+import psycopg2
+import psycopg2.errors
+from passgen.config import get_db_params
+from passgen.database import PasswordDatabase, TOKEN_COLUMN
+from passgen.migrations import LATEST_VERSION, MIGRATIONS, database_id
+from passgen.storage import key_fingerprint
 
 
 class TestPasswordDatabase(unittest.TestCase):
@@ -12,30 +20,68 @@ class TestPasswordDatabase(unittest.TestCase):
         """Подготовка тестового окружения."""
         self.db = PasswordDatabase()
     
+    @patch('passgen.database.write_cached_version')
     @patch('passgen.database.psycopg2.connect')
-    def test_create_table(self, mock_connect):
-        """Тест создания таблицы."""
+    def test_create_table(self, mock_connect, mock_write_cache):
+        """Тест создания таблицы через миграции схемы."""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value.__enter__.return_value = mock_conn
         mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = (False,)
         
         self.db.create_table()
         
-        # Проверяем, что был выполнен SQL запрос
-        mock_cursor.execute.assert_called()
-        self.assertIn("CREATE TABLE IF NOT EXISTS passwords", mock_cursor.execute.call_args[0][0])
+        # Проверяем, что были выполнены все миграции
+        queries = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        self.assertTrue(any("CREATE TABLE IF NOT EXISTS passwords" in q for q in queries))
+        self.assertTrue(any("pg_advisory_xact_lock" in q for q in queries))
+        self.assertEqual(sum("INSERT INTO schema_version" in q for q in queries),
+                         LATEST_VERSION)
         mock_conn.commit.assert_called_once()
+        mock_write_cache.assert_called_once()
     
+    @patch('passgen.database.read_cached_version')
     @patch('passgen.database.psycopg2.connect')
-    @patch('passgen.database.encrypt_password')
+    def test_schema_check_uses_local_cache(self, mock_connect, mock_read_cache):
+        """Тест: при актуальной версии в локальном кеше БД не запрашивается."""
+        mock_read_cache.return_value = LATEST_VERSION
+        
+        self.assertTrue(self.db.schema_is_current())
+        mock_connect.assert_not_called()
+    
+    @patch('passgen.database.write_cached_version')
+    @patch('passgen.database.read_cached_version', return_value=None)
+    @patch('passgen.database.psycopg2.connect')
+    def test_schema_check_queries_version(self, mock_connect, mock_read_cache,
+                                          mock_write_cache):
+        """Тест проверки версии запросом: устаревшая схема не кешируется."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        
+        mock_cursor.fetchone.side_effect = [(True,), (LATEST_VERSION - 1,)]
+        self.assertFalse(self.db.schema_is_current())
+        mock_write_cache.assert_not_called()
+        
+        mock_cursor.fetchone.side_effect = [(True,), (LATEST_VERSION,)]
+        self.assertTrue(self.db.schema_is_current())
+        mock_write_cache.assert_called_once()
+        
+        # Проверка версии не выполняет DDL
+        queries = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        self.assertFalse(any("CREATE" in q or "ALTER" in q for q in queries))
+    
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.database.encrypt_token')
     def test_save_password(self, mock_encrypt, mock_connect):
-        """Тест сохранения пароля."""
+        """Тест сохранения пароля в формате v2."""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value.__enter__.return_value = mock_conn
         mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_encrypt.return_value = "encrypted_password"
+        mock_encrypt.return_value = b"\x80token"
         
         self.db.save_password("user1", "service1", "plain_password")
         
@@ -46,7 +92,9 @@ class TestPasswordDatabase(unittest.TestCase):
         mock_cursor.execute.assert_called_once()
         args = mock_cursor.execute.call_args[0]
         self.assertIn("INSERT INTO passwords", args[0])
-        self.assertEqual(args[1], ("user1", "service1", "encrypted_password"))
+        self.assertIn("encrypted_token", args[0])
+        self.assertEqual(args[1][:2], ("user1", "service1"))
+        self.assertEqual(bytes(args[1][2].adapted), b"\x80token")
     
     @patch('passgen.database.psycopg2.connect')
     @patch('passgen.database.decrypt_password')
@@ -66,13 +114,44 @@ class TestPasswordDatabase(unittest.TestCase):
         # Проверяем SQL запрос
         mock_cursor.execute.assert_called_once()
         args = mock_cursor.execute.call_args[0]
-        self.assertIn("SELECT encrypted_password FROM passwords", args[0])
+        self.assertIn(f"SELECT {TOKEN_COLUMN} FROM passwords", args[0])
         self.assertEqual(args[1], ("user1", "service1"))
         
         # Проверяем дешифровку
         mock_decrypt.assert_called_once_with("encrypted_password")
         self.assertEqual(result, "plain_password")
     
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.database.decrypt_password')
+    def test_get_password_cached(self, mock_decrypt, mock_connect):
+        """Тест кеша: повтор из памяти, сброс по NOTIFY и после сохранения."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        listener_conn = mock_connect.return_value
+        listener_conn.notifies = []
+        mock_cursor.fetchone.return_value = (b"\x80token",)
+        mock_decrypt.return_value = "plain"
+        
+        db = PasswordDatabase(cache=True)
+        
+        self.assertEqual(db.get_password("u", "s"), "plain")
+        self.assertEqual(db.get_password("u", "s"), "plain")
+        self.assertEqual(mock_decrypt.call_count, 1)
+        
+        # Изменение из другого процесса
+        listener_conn.notifies.append(
+            MagicMock(payload='{"username": "u", "service": "s"}'))
+        db.get_password("u", "s")
+        self.assertEqual(mock_decrypt.call_count, 2)
+        
+        # Собственная запись
+        with patch('passgen.database.encrypt_token', return_value=b"\x80new"):
+            db.save_password("u", "s", "new")
+        db.get_password("u", "s")
+        self.assertEqual(mock_decrypt.call_count, 3)
+    
     @patch('passgen.database.psycopg2.connect')
     @patch('passgen.database.decrypt_password')
     def test_get_password_not_found(self, mock_decrypt, mock_connect):
@@ -91,7 +170,7 @@ class TestPasswordDatabase(unittest.TestCase):
         mock_decrypt.assert_not_called()
     
     @patch('passgen.database.psycopg2.connect')
-    @patch('passgen.database.decrypt_password')
+    @patch('passgen.crypto_engine.decrypt_password')
     def test_search_by_username(self, mock_decrypt, mock_connect):
         """Тест поиска по имени пользователя."""
         mock_conn = MagicMock()
@@ -111,7 +190,7 @@ class TestPasswordDatabase(unittest.TestCase):
         # Проверяем SQL запрос
         mock_cursor.execute.assert_called_once()
         args = mock_cursor.execute.call_args[0]
-        self.assertIn("SELECT service, encrypted_password", args[0])
+        self.assertIn(f"SELECT service, {TOKEN_COLUMN}", args[0])
         self.assertEqual(args[1], ("user1",))
         
         # Проверяем результаты
@@ -120,7 +199,7 @@ class TestPasswordDatabase(unittest.TestCase):
         self.assertEqual(results[1], ("service2", "plain2"))
     
     @patch('passgen.database.psycopg2.connect')
-    @patch('passgen.database.decrypt_password')
+    @patch('passgen.crypto_engine.decrypt_password')
     def test_search_by_username_decrypt_error(self, mock_decrypt, mock_connect):
         """Тест обработки ошибки дешифровки при поиске по имени."""
         mock_conn = MagicMock()
@@ -137,7 +216,7 @@ class TestPasswordDatabase(unittest.TestCase):
         self.assertEqual(results[0], ("service1", "[Ошибка расшифровки]"))
     
     @patch('passgen.database.psycopg2.connect')
-    @patch('passgen.database.decrypt_password')
+    @patch('passgen.crypto_engine.decrypt_password')
     def test_get_all_records(self, mock_decrypt, mock_connect):
         """Тест получения всех записей."""
         mock_conn = MagicMock()
@@ -157,6 +236,9 @@ class TestPasswordDatabase(unittest.TestCase):
         # Проверяем SQL запрос
         mock_cursor.execute.assert_called_once()
         
+        # Пароли расшифровываются только при обращении
+        mock_decrypt.assert_not_called()
+        
         # Проверяем результаты
         self.assertEqual(len(results), 2)
         self.assertEqual(results[0]['username'], "user1")
@@ -168,6 +250,373 @@ class TestPasswordDatabase(unittest.TestCase):
         self.assertEqual(results[1]['service'], "service2")
         self.assertEqual(results[1]['password'], "plain2")
         self.assertEqual(results[1]['created_at'], "2024-01-02 13:00:00")
+    
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.crypto_engine.decrypt_password')
+    def test_get_all_records_without_passwords(self, mock_decrypt, mock_connect):
+        """Тест выборки без паролей: запрос не читает зашифрованные значения."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            ("user1", "service1", None, "2024-01-01 12:00:00")
+        ]
+        
+        results = self.db.get_all_records(with_passwords=False)
+        
+        self.assertNotIn(TOKEN_COLUMN, mock_cursor.execute.call_args[0][0])
+        self.assertEqual(results[0].service, "service1")
+        self.assertFalse(results[0].has_password)
+        results[0].password
+        mock_decrypt.assert_not_called()
+
+    
+    @patch('passgen.database.forget_cached_version')
+    @patch('passgen.database.psycopg2.connect')
+    def test_missing_table_resets_schema_cache(self, mock_connect, mock_forget):
+        """Тест: пересозданная база сбрасывает кеш версии и подсказывает --migrate."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.execute.side_effect = psycopg2.errors.UndefinedTable(
+            'relation "passwords" does not exist')
+
+        with self.assertRaises(RuntimeError) as ctx:
+            self.db.get_all_records()
+
+        self.assertIn("--migrate", str(ctx.exception))
+        mock_forget.assert_called_once_with(database_id(get_db_params()))
+    
+    @patch('passgen.database.psycopg2.connect')
+    def test_get_records_page_keyset(self, mock_connect):
+        """Тест страницы: условие по ключу вместо OFFSET и курсор следующей."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            ("u1", "s1", b"t", "2024-01-01"),
+            ("u1", "s2", b"t", "2024-01-01"),
+            ("u2", "s1", b"t", "2024-01-01"),
+        ]
+        
+        first = self.db.get_records_page(2)
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertNotIn("(username, service) >", query)
+        self.assertNotIn("OFFSET", query)
+        self.assertEqual(params, (3,))
+        self.assertEqual([r.service for r in first.items], ["s1", "s2"])
+        self.assertIsNotNone(first.next_cursor)
+        
+        mock_cursor.fetchall.return_value = [("u2", "s1", b"t", "2024-01-01")]
+        second = self.db.get_records_page(2, after=first.next_cursor)
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn("(username, service) > (%s, %s)", query)
+        self.assertEqual(params, ("u1", "s2", 3))
+        self.assertIsNone(second.next_cursor)
+        
+        with self.assertRaises(ValueError):
+            self.db.get_records_page(2, after="испорчен")
+    
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.crypto_engine.decrypt_password')
+    def test_search_by_service_page(self, mock_decrypt, mock_connect):
+        """Тест страницы поиска по сервису."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [("u1", b"t1"), ("u2", b"t2")]
+        mock_decrypt.side_effect = lambda token: token.decode()
+        
+        page = self.db.search_by_service_page("mail", 1)
+        
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertEqual(params, ("mail", 2))
+        self.assertEqual(page.items, [("u1", "t1")])
+        mock_decrypt.assert_called_once()
+        
+        self.db.search_by_service_page("mail", 1, after=page.next_cursor)
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn("username > %s", query)
+        self.assertEqual(params, ("mail", "u1", 2))
+    
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.crypto_engine.decrypt_password')
+    def test_iter_records_server_side_cursor(self, mock_decrypt, mock_connect):
+        """Тест потоковой выборки именованным курсором пакетами fetchmany."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchmany.side_effect = [
+            [("u1", "s1", b"t1", "2024-01-01"), ("u1", "s2", b"t2", "2024-01-01")],
+            [("u2", "s1", b"t3", "2024-01-01")],
+            [],
+        ]
+        mock_decrypt.side_effect = lambda token: token.decode()
+        
+        records = self.db.iter_records(batch_size=2)
+        first = next(records)
+        
+        # Первая запись доступна после первого пакета
+        self.assertEqual(mock_cursor.fetchmany.call_count, 1)
+        self.assertEqual((first.service, first.password), ("s1", "t1"))
+        self.assertEqual([r.password for r in records], ["t2", "t3"])
+        mock_conn.cursor.assert_called_with(name="passgen_export")
+        mock_cursor.fetchmany.assert_called_with(2)
+    
+    @patch('passgen.database.execute_values')
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.crypto_engine.get_encryptor')
+    def test_save_passwords_bulk(self, mock_get_encryptor, mock_connect, mock_execute_values):
+        """Тест пакетного сохранения одним запросом."""
+        mock_conn = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_get_encryptor.return_value = lambda p: b"\x80" + p.encode()
+        
+        saved = self.db.save_passwords([
+            ("u1", "s1", "p1"),
+            ("u2", "s2", "p2"),
+            ("u1", "s1", "p1-new"),
+        ])
+        
+        self.assertEqual(saved, 2)
+        mock_execute_values.assert_called_once()
+        query, values = mock_execute_values.call_args[0][1:3]
+        self.assertIn("ON CONFLICT (username, service)", query)
+        self.assertEqual([v[:2] for v in values], [("u1", "s1"), ("u2", "s2")])
+        self.assertEqual(bytes(values[0][2].adapted), b"\x80p1-new")
+        mock_conn.commit.assert_called_once()
+    
+    @patch('passgen.database.execute_values')
+    @patch('passgen.database.psycopg2.connect')
+    def test_migrate_storage(self, mock_connect, mock_execute_values):
+        """Тест пакетного перевода строк v1 в формат v2."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        
+        # base64(base64url(b"\x80abc")) — значение в формате v1
+        v1_value = "Z0dGaVl3PT0="
+        mock_cursor.fetchall.side_effect = [
+            [(1, v1_value), (2, "не base64!")],
+            [(7, v1_value)],
+            [],
+        ]
+        progress = MagicMock()
+        
+        converted = self.db.migrate_storage(batch_size=2, progress=progress)
+        
+        self.assertEqual(converted, 2)
+        self.assertEqual(mock_conn.commit.call_count, 2)
+        progress.assert_called_with(2)
+        
+        # Следующий пакет выбирается после последнего id предыдущего
+        select_params = [c[0][1] for c in mock_cursor.execute.call_args_list]
+        self.assertEqual(select_params, [(0, 2), (2, 2), (7, 2)])
+        
+        first_values = mock_execute_values.call_args_list[0][0][2]
+        self.assertEqual(len(first_values), 1)
+        self.assertEqual(first_values[0][0], 1)
+        self.assertEqual(bytes(first_values[0][1].adapted), b"\x80abc")
+
+    
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.crypto_engine.get_encryptor')
+    def test_import_records_copy_and_merge(self, mock_get_encryptor, mock_connect):
+        """Тест импорта: COPY каждого пакета и одно слияние в конце."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_get_encryptor.return_value = lambda p: b"\x80" + p.encode()
+        mock_cursor.rowcount = 3
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda sql, f: copied.append(f.read())
+        
+        merged = self.db.import_records([
+            [("u1", "s1", "p1"), ("u,2", "s2", "p2")],
+            [("u1", "s1", "p1-new")],
+        ])
+        
+        self.assertEqual(merged, 3)
+        self.assertEqual(len(copied), 2)
+        self.assertEqual(copied[0].splitlines(),
+                         ['0,u1,s1,\\x' + (b"\x80p1").hex(),
+                          '1,"u,2",s2,\\x' + (b"\x80p2").hex()])
+        self.assertTrue(copied[1].startswith("2,u1,s1,"))
+        
+        queries = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        self.assertIn("CREATE TEMP TABLE", queries[0])
+        self.assertIn("ON CONFLICT", queries[-1])
+        self.assertIn("line DESC", queries[-1])
+        mock_conn.commit.assert_called_once()
+    
+    @patch('passgen.database.execute_values')
+    @patch('passgen.database.psycopg2.connect')
+    @patch('passgen.crypto_engine.rotate_token')
+    @patch('passgen.database.get_key_manager')
+    def test_rekey_resumes_from_checkpoint(self, mock_manager, mock_rotate,
+                                           mock_connect, mock_execute_values):
+        """Тест перешифрования: продолжение с контрольной точки и ее удаление."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_manager.return_value.get_keys.return_value = [b"new-key"]
+        
+        def rotate(token):
+            if token == b"bad":
+                raise ValueError("не расшифровывается")
+            return b"\x80" + token
+        mock_rotate.side_effect = rotate
+        
+        fd, checkpoint_file = tempfile.mkstemp()
+        self.addCleanup(lambda: os.path.exists(checkpoint_file) and os.remove(checkpoint_file))
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': key_fingerprint(b"new-key"), 'last_id': 10,
+                       'rekeyed': 10, 'failed': 0}, f)
+        
+        mock_cursor.fetchall.side_effect = [
+            [(11, b"a"), (12, b"bad")],
+            [(15, b"b")],
+            [],
+        ]
+        saved_states = []
+        
+        def progress(checkpoint):
+            with open(checkpoint_file) as f:
+                saved_states.append(json.load(f)['last_id'])
+        
+        result = self.db.rekey(batch_size=2, checkpoint_file=checkpoint_file,
+                               progress=progress)
+        
+        self.assertEqual(result, {'rekeyed': 12, 'failed': 1})
+        self.assertEqual(saved_states, [12, 15])
+        self.assertFalse(os.path.exists(checkpoint_file))
+        
+        select_params = [c[0][1] for c in mock_cursor.execute.call_args_list]
+        self.assertEqual(select_params, [(10, 2), (12, 2), (15, 2)])
+        self.assertIn("FOR UPDATE", mock_cursor.execute.call_args[0][0])
+        
+        # Строка, которую не удалось расшифровать, не перезаписывается
+        first_values = mock_execute_values.call_args_list[0][0][2]
+        self.assertEqual([row_id for row_id, _ in first_values], [11])
+        self.assertEqual(mock_conn.commit.call_count, 2)
+
+    
+    @patch('passgen.database.psycopg2.connect')
+    def test_search_like_query(self, mock_connect):
+        """Тест поиска по подстроке: экранирование и короткие строки."""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [("u1", "google", b"t", "2024-01-01")]
+        
+        records = self.db.search_like("service", " Goo_g% ", limit=5)
+        
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn("lower(service) LIKE %(prefix)s", query)
+        self.assertIn("service %% %(term)s", query)
+        self.assertEqual(params['prefix'], "goo\\_g\\%%")
+        self.assertEqual(params['substring'], "%Goo\\_g\\%%")
+        self.assertEqual(params['limit'], 5)
+        self.assertEqual(records[0].service, "google")
+        
+        # Для коротких строк — только префикс
+        self.db.search_like("username", "iv")
+        query = mock_cursor.execute.call_args[0][0]
+        self.assertNotIn("ILIKE", query)
+        
+        with self.assertRaises(ValueError):
+            self.db.search_like("encrypted_token", "abc")
+
+    def test_search_like_query_matches_indexes(self):
+        """Тест: запрос использует выражения индексов из миграции 4.
+
+        План на настоящей БД проверяет TestSearchPlans; этот тест без БД
+        следит, чтобы предикаты запроса не разошлись с индексами.
+        """
+        migration_sql = dict((v, sql) for v, _, sql in MIGRATIONS)[4]
+        for column in ("service", "username"):
+            self.assertIn(f"lower({column}) text_pattern_ops", migration_sql)
+            self.assertIn(f"USING gin ({column} gin_trgm_ops)", migration_sql)
+
+            # Длинная строка: префикс по lower(col) LIKE и триграммы ILIKE / %
+            query, params = self.db._search_like_query(column, "goog", 20)
+            where = query.split("WHERE", 1)[1].split("ORDER BY", 1)[0]
+            self.assertIn(f"lower({column}) LIKE %(prefix)s", where)
+            self.assertIn(f"{column} ILIKE %(substring)s", where)
+            self.assertIn(f"{column} %% %(term)s", where)
+            self.assertIn(f"similarity({column}, %(term)s)", query)
+            self.assertEqual(params['prefix'], "goog%")
+
+            # Короткая строка: только префикс, без триграмм
+            query, _ = self.db._search_like_query(column, "go", 20)
+            where = query.split("WHERE", 1)[1].split("ORDER BY", 1)[0]
+            self.assertIn(f"lower({column}) LIKE %(prefix)s", where)
+            self.assertNotIn("ILIKE", where)
+            self.assertNotIn("%%", where)
+
+
+class TestSearchPlans(unittest.TestCase):
+    """Проверяет планы запросов на настоящей БД (пропускается без нее).
+    
+    Миграции применяются во временной схеме внутри транзакции, которая
+    затем откатывается, так что база не изменяется.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Подключение к БД из config.py."""
+        try:
+            cls.conn = psycopg2.connect(connect_timeout=2, **get_db_params())
+        except Exception as e:
+            raise unittest.SkipTest(f"БД недоступна: {e}")
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+    
+    def setUp(self):
+        """Схема с миграциями в откатываемой транзакции."""
+        self.db = PasswordDatabase()
+        self.cur = self.conn.cursor()
+        self.addCleanup(self.conn.rollback)
+        self.cur.execute("CREATE SCHEMA passgen_plan_test")
+        self.cur.execute("SET LOCAL search_path TO passgen_plan_test, public")
+        try:
+            for _, _, sql in MIGRATIONS:
+                self.cur.execute(sql, {'channel': 'passgen_plan_test'})
+        except psycopg2.Error as e:
+            self.skipTest(f"Миграции не применяются (нет прав на pg_trgm?): {e}")
+        # На пустой таблице планировщик и так выбрал бы seq scan; запрещаем
+        # его, чтобы проверить, что запрос вообще может использовать индекс
+        self.cur.execute("SET LOCAL enable_seqscan = off")
+    
+    def plan(self, query: str, params) -> str:
+        self.cur.execute("EXPLAIN " + query, params)
+        return "\n".join(row[0] for row in self.cur.fetchall())
+    
+    def test_like_search_uses_indexes(self):
+        """Тест: поиск по префиксу и подстроке не выполняет seq scan."""
+        for column, term in (("service", "goog"), ("username", "iv")):
+            with self.subTest(column=column, term=term):
+                plan = self.plan(*self.db._search_like_query(column, term, 20))
+                self.assertNotIn("Seq Scan", plan)
+    
+    def test_pages_use_indexes(self):
+        """Тест: страницы по сервису выбираются диапазоном индекса."""
+        query = f"""
+        SELECT username, {TOKEN_COLUMN} FROM passwords
+        WHERE service = %s AND username > %s ORDER BY username LIMIT 21
+        """
+        self.assertNotIn("Seq Scan", self.plan(query, ("mail", "u1")))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,83 @@
+"""Тесты для модуля exporter.py - потокового экспорта записей."""
+
+import csv
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from passgen.crypto_engine import DECRYPT_ERROR
+from passgen.exporter import export_records
+from passgen.importer import ImportReader
+from passgen.records import PasswordRecord
+
+
+def make_records():
+    """Записи с уже известными паролями (без расшифровки)."""
+    created = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    records = []
+    for username, service, password in (("u1", "s,1", "p\"1"), ("u2", "s2", "пароль")):
+        record = PasswordRecord(username, service, None, created)
+        record._password = password
+        records.append(record)
+    return records
+
+
+class TestExporter(unittest.TestCase):
+    """Тестирует export_records."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def test_csv_roundtrip_with_import(self):
+        """Тест: экспорт CSV читается импортом без потерь."""
+        self.assertEqual(export_records(iter(make_records()), self.path, "csv"), 2)
+
+        with open(self.path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]['created_at'], "2024-01-02T03:04:05")
+        self.assertEqual(list(ImportReader(self.path, "csv")),
+                         [[("u1", "s,1", "p\"1"), ("u2", "s2", "пароль")]])
+
+    def test_jsonl(self):
+        """Тест экспорта в JSON Lines."""
+        export_records(iter(make_records()), self.path, "jsonl")
+
+        with open(self.path, encoding='utf-8') as f:
+            items = [json.loads(line) for line in f]
+        self.assertEqual(items[1], {'username': "u2", 'service': "s2",
+                                    'password': "пароль",
+                                    'created_at': "2024-01-02T03:04:05"})
+
+    def test_undecryptable_records_skipped(self):
+        """Тест: запись с ошибкой расшифровки не экспортируется, а сообщается."""
+        records = make_records()
+        records[0]._password = DECRYPT_ERROR
+        skipped = []
+
+        self.assertEqual(export_records(iter(records), self.path, "csv",
+                                        on_skip=skipped.append), 1)
+        self.assertEqual(skipped, [records[0]])
+        self.assertEqual(list(ImportReader(self.path, "csv")),
+                         [[("u2", "s2", "пароль")]])
+
+    def test_file_private(self):
+        """Тест: файл экспорта доступен только владельцу независимо от umask."""
+        os.chmod(self.path, 0o644)
+        old_umask = os.umask(0)
+        try:
+            export_records(iter(make_records()), self.path, "jsonl")
+        finally:
+            os.umask(old_umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_unknown_format(self):
+        """Тест неизвестного формата."""
+        with self.assertRaises(ValueError):
+            export_records([], self.path, "xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
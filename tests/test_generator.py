@@ -2,7 +2,8 @@
 
 import unittest
 import string
-from passgen.generator import generate_password
+from collections import Counter
+from passgen.generator import generate_password, generate_passwords, random_chars
 
 
 class TestPasswordGenerator(unittest.TestCase):
@@ -52,5 +53,39 @@ class TestPasswordGenerator(unittest.TestCase):
                 self.assertEqual(len(password), length)
 
 
+
+class TestBatchGenerator(unittest.TestCase):
+    """Тестирует пакетную генерацию generate_passwords."""
+
+    def test_count_and_length(self):
+        """Тест количества и длины паролей в пакете."""
+        passwords = generate_passwords(100, length=16)
+        self.assertEqual(len(passwords), 100)
+        self.assertTrue(all(len(p) == 16 for p in passwords))
+
+    def test_only_lowercase_when_all_disabled(self):
+        """Тест пакета только из строчных букв при отключенных опциях."""
+        passwords = generate_passwords(50, 20, False, False, False)
+        self.assertTrue(all(c in string.ascii_lowercase for p in passwords for c in p))
+
+    def test_uses_full_alphabet(self):
+        """Тест того, что в пакете встречаются все типы символов."""
+        chars = ''.join(generate_passwords(200, 20))
+        self.assertTrue(any(c in string.ascii_uppercase for c in chars))
+        self.assertTrue(any(c in string.digits for c in chars))
+        self.assertTrue(any(c in string.punctuation for c in chars))
+
+    def test_random_chars_uniform(self):
+        """Тест равномерности отображения байт на алфавит.
+
+        Алфавит из 62 символов не делит 256 нацело, поэтому без отбраковки
+        первые символы встречались бы заметно чаще.
+        """
+        alphabet = string.ascii_letters + string.digits
+        counts = Counter(random_chars(62 * 2000, alphabet))
+        self.assertEqual(set(counts), set(alphabet))
+        self.assertLess(max(counts.values()) / min(counts.values()), 1.5)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
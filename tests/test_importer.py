@@ -0,0 +1,57 @@
+"""Тесты для модуля importer.py - чтения файлов импорта."""
+
+import os
+import tempfile
+import unittest
+from passgen.importer import ImportReader, detect_format
+
+
+class TestImportReader(unittest.TestCase):
+    """Тестирует класс ImportReader."""
+
+    def write(self, suffix: str, text: str) -> str:
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_csv_batches_and_skipped(self):
+        """Тест CSV: пакеты заданного размера и пропуск некорректных строк."""
+        path = self.write(".csv",
+                          "username,service,password\n"
+                          "u1,s1,\"p,1\"\n"
+                          "u2,,p2\n"
+                          f"{'x' * 101},s3,p3\n"
+                          "u4,s4,p4\n"
+                          "u5,s5,p5\n")
+        reader = ImportReader(path, batch_size=2)
+
+        batches = list(reader)
+
+        self.assertEqual(batches, [[("u1", "s1", "p,1"), ("u4", "s4", "p4")],
+                                   [("u5", "s5", "p5")]])
+        self.assertEqual(reader.skipped, 2)
+
+    def test_jsonl(self):
+        """Тест JSON Lines с пустыми и поврежденными строками."""
+        path = self.write(".jsonl",
+                          '{"username": "u1", "service": "s1", "password": "p1"}\n'
+                          '\n'
+                          'не json\n'
+                          '{"username": "u2", "service": "s2"}\n')
+        reader = ImportReader(path)
+
+        self.assertEqual(list(reader), [[("u1", "s1", "p1")]])
+        self.assertEqual(reader.skipped, 2)
+
+    def test_detect_format(self):
+        """Тест определения формата по расширению."""
+        self.assertEqual(detect_format("dump.ndjson"), "jsonl")
+        self.assertEqual(detect_format("dump.csv"), "csv")
+        with self.assertRaises(ValueError):
+            ImportReader("dump.xml", "xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Тесты для модуля migrations.py - версионирования схемы БД."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from passgen.migrations import (
+    LATEST_VERSION, MIGRATIONS, apply_migrations, database_id,
+    forget_cached_version, read_cached_version, write_cached_version
+)
+
+
+class TestMigrations(unittest.TestCase):
+    """Тестирует применение миграций и локальный кеш версий."""
+
+    def test_migrations_ordered(self):
+        """Тест: номера миграций идут подряд с 1."""
+        versions = [version for version, _, _ in MIGRATIONS]
+        self.assertEqual(versions, list(range(1, LATEST_VERSION + 1)))
+
+    def test_apply_only_pending(self):
+        """Тест: применяются только миграции новее текущей версии."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [(True,), (1,)]
+
+        applied = apply_migrations(conn, {'channel': 'chan'})
+
+        self.assertEqual(applied, list(range(2, LATEST_VERSION + 1)))
+        executed = [c[0] for c in cursor.execute.call_args_list]
+        self.assertFalse(any("CREATE TABLE IF NOT EXISTS passwords" in q[0] for q in executed))
+        self.assertIn(({'channel': 'chan'}), [q[1] for q in executed if len(q) > 1])
+        conn.commit.assert_called_once()
+
+    def test_trigger_created_only_if_missing(self):
+        """Тест: триггер не пересоздается, если его уже создал create_table."""
+        sql = dict((v, sql) for v, _, sql in MIGRATIONS)[2]
+        self.assertNotIn("DROP TRIGGER", sql)
+        self.assertIn("IF NOT EXISTS", sql)
+        self.assertIn("pg_trigger", sql)
+
+    def test_local_cache_roundtrip(self):
+        """Тест локального кеша версий по базам."""
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        db_a = database_id({'user': 'u', 'host': 'h', 'port': 5432, 'dbname': 'a'})
+        db_b = database_id({'user': 'u', 'host': 'h', 'port': 5432, 'dbname': 'b'})
+
+        self.assertIsNone(read_cached_version(db_a, path))
+        write_cached_version(db_a, 2, path)
+        write_cached_version(db_b, 1, path)
+        self.assertEqual(read_cached_version(db_a, path), 2)
+        self.assertEqual(read_cached_version(db_b, path), 1)
+
+        forget_cached_version(db_a, path)
+        self.assertIsNone(read_cached_version(db_a, path))
+        self.assertEqual(read_cached_version(db_b, path), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
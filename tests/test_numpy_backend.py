@@ -0,0 +1,65 @@
+"""Тесты для модуля numpy_backend.py - векторизованной генерации паролей."""
+
+import os
+import string
+import subprocess
+import sys
+import unittest
+from collections import Counter
+from unittest.mock import patch
+from passgen import numpy_backend
+from passgen.generator import generate_passwords
+
+
+@unittest.skipUnless(numpy_backend.is_available(), "NumPy не установлен")
+class TestNumpyBackend(unittest.TestCase):
+    """Тестирует векторизованный бэкенд генерации."""
+
+    def test_buffer_length_and_alphabet(self):
+        """Тест длины буфера и принадлежности символов алфавиту."""
+        buf = numpy_backend.random_buffer(10000, string.digits)
+        self.assertEqual(len(buf), 10000)
+        self.assertTrue(set(buf.decode('ascii')) <= set(string.digits))
+
+    def test_uniformity(self):
+        """Тест равномерности для алфавита, не делящего 256 нацело."""
+        alphabet = string.ascii_letters + string.digits
+        counts = Counter(numpy_backend.random_buffer(62 * 2000, alphabet).decode('ascii'))
+        self.assertEqual(set(counts), set(alphabet))
+        self.assertLess(max(counts.values()) / min(counts.values()), 1.5)
+
+    def test_generate_passwords_backend(self):
+        """Тест выбора бэкенда numpy в generate_passwords."""
+        passwords = generate_passwords(100, 14, backend="numpy")
+        self.assertEqual(len(passwords), 100)
+        self.assertTrue(all(len(p) == 14 for p in passwords))
+
+
+class TestNumpyBackendUnavailable(unittest.TestCase):
+    """Тестирует поведение при отсутствии NumPy."""
+
+    def test_raises_without_numpy(self):
+        """Тест ошибки при выборе бэкенда без установленного NumPy."""
+        with patch('passgen.numpy_backend.find_spec', return_value=None):
+            self.assertFalse(numpy_backend.is_available())
+            with self.assertRaises(RuntimeError):
+                generate_passwords(1, 8, backend="numpy")
+
+    def test_numpy_not_imported_on_load(self):
+        """Тест: импорт пакета не загружает NumPy."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, passgen.commands; print('numpy' in sys.modules)"],
+            cwd=root, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_unknown_backend(self):
+        """Тест ошибки при неизвестном бэкенде."""
+        with self.assertRaises(ValueError):
+            generate_passwords(1, 8, backend="fortran")
+
+
+if __name__ == '__main__':
+    unittest.main()
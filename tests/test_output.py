@@ -0,0 +1,79 @@
+"""Тесты для модуля output.py - потоковой записи паролей."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from passgen.generator import iter_passwords
+from passgen.output import write_batches, write_passwords
+
+
+class TestOutput(unittest.TestCase):
+    """Тестирует функции потоковой записи паролей."""
+
+    def test_write_batches(self):
+        """Тест записи пакетов по одному паролю на строку."""
+        stream = StringIO()
+        written = write_batches([["a", "b"], [], ["c"]], stream)
+        self.assertEqual(written, 3)
+        self.assertEqual(stream.getvalue(), "a\nb\nc\n")
+
+    def test_write_to_file(self):
+        """Тест потоковой записи в файл."""
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            written = write_passwords(iter_passwords(1000, 10, batch_size=64), path)
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(path)
+
+        self.assertEqual(written, 1000)
+        self.assertEqual(len(lines), 1000)
+        self.assertTrue(all(len(line) == 10 for line in lines))
+
+    def test_failed_write_leaves_no_file(self):
+        """Тест: ошибка посреди записи не оставляет неполный файл."""
+        path = os.path.join(tempfile.mkdtemp(), "out.txt")
+        self.addCleanup(os.rmdir, os.path.dirname(path))
+
+        def batches():
+            yield ["a", "b"]
+            raise RuntimeError("обрыв")
+
+        with self.assertRaises(RuntimeError):
+            write_passwords(batches(), path)
+        self.assertEqual(os.listdir(os.path.dirname(path)), [])
+
+    def test_symlink_target_kept(self):
+        """Тест: ссылка не заменяется файлом, запись идет в ее цель."""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        target = os.path.join(tmpdir, "target.txt")
+        link = os.path.join(tmpdir, "link.txt")
+        open(target, 'w').close()
+        os.symlink(target, link)
+
+        write_passwords([["a"]], link)
+        self.assertTrue(os.path.islink(link))
+        with open(target, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "a\n")
+
+    def test_write_to_stdout(self):
+        """Тест записи в stdout при output='-'."""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            written = write_passwords([["x1", "x2"]], '-')
+        self.assertEqual(written, 2)
+        self.assertEqual(mock_stdout.getvalue(), "x1\nx2\n")
+
+    def test_iter_passwords_batches(self):
+        """Тест разбиения генерации на пакеты заданного размера."""
+        batches = list(iter_passwords(10, 8, batch_size=4))
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
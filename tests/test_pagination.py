@@ -0,0 +1,36 @@
+"""Тесты для модуля pagination.py - постраничной выборки по ключу."""
+
+import unittest
+from passgen.pagination import decode_cursor, encode_cursor, make_page
+
+
+class TestPagination(unittest.TestCase):
+    """Тестирует курсоры страниц."""
+
+    def test_cursor_roundtrip(self):
+        """Тест кодирования ключа с произвольными символами."""
+        cursor = encode_cursor(("иван", "mail:ru"))
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor, 2), ("иван", "mail:ru"))
+
+    def test_invalid_cursor(self):
+        """Тест поврежденного курсора и курсора другой выборки."""
+        for cursor in ("не курсор", "!!!", encode_cursor(("a",))):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    decode_cursor(cursor, 2)
+
+    def test_make_page(self):
+        """Тест: лишняя строка отрезается и дает курсор."""
+        rows = [("a", 1), ("b", 2), ("c", 3)]
+        page, cursor = make_page(rows, 2, lambda row: row[:1])
+        self.assertEqual(page, rows[:2])
+        self.assertEqual(decode_cursor(cursor, 1), ("b",))
+
+        page, cursor = make_page(rows, 3, lambda row: row[:1])
+        self.assertEqual(page, rows)
+        self.assertIsNone(cursor)
+
+
+if __name__ == '__main__':
+    unittest.main()
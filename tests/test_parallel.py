@@ -0,0 +1,38 @@
+"""Тесты для модуля parallel.py - многопроцессной генерации паролей."""
+
+import string
+import unittest
+from passgen.parallel import iter_passwords_parallel
+
+
+class TestParallelGenerator(unittest.TestCase):
+    """Тестирует функцию iter_passwords_parallel."""
+
+    def test_ordered_batches(self):
+        """Тест упорядоченной генерации в нескольких процессах."""
+        batches = list(iter_passwords_parallel(1000, 10, workers=2, batch_size=64))
+        self.assertEqual([len(b) for b in batches], [64] * 15 + [40])
+        self.assertTrue(all(len(p) == 10 for b in batches for p in b))
+
+    def test_unordered_batches(self):
+        """Тест неупорядоченной генерации: важны только количество и формат."""
+        batches = list(iter_passwords_parallel(
+            1000, 8, False, False, False, workers=2, ordered=False, batch_size=100
+        ))
+        passwords = [p for b in batches for p in b]
+        self.assertEqual(len(passwords), 1000)
+        self.assertTrue(all(c in string.ascii_lowercase for p in passwords for c in p))
+
+    def test_workers_produce_distinct_streams(self):
+        """Тест того, что процессы не выдают одинаковые последовательности."""
+        batches = list(iter_passwords_parallel(400, 16, workers=4, batch_size=50))
+        self.assertEqual(len({tuple(b) for b in batches}), len(batches))
+
+    def test_single_worker_fallback(self):
+        """Тест последовательного режима при workers=1."""
+        batches = list(iter_passwords_parallel(10, 12, workers=1, batch_size=4))
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Тесты для модуля passphrase.py - генерации парольных фраз."""
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from passgen.passphrase import (
+    DEFAULT_WORDS, WORDLIST_FILE, Wordlist, generate_passphrase, generate_passphrases, iter_passphrases
+)
+
+
+class TestPassphrase(unittest.TestCase):
+    """Тестирует список слов в памяти и генерацию парольных фраз."""
+
+    def setUp(self):
+        """Создает временный список слов в формате EFF."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "words.txt")
+        self.words = [f"word{i}" for i in range(100)]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for i, word in enumerate(self.words):
+                f.write(f"{10000 + i}\t{word}\n")
+            f.write("\n")
+
+    def tearDown(self):
+        """Удаляет временный каталог."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_index_lookup(self):
+        """Тест доступа к словам по индексу и пропуска пустых строк."""
+        with Wordlist(self.path) as wordlist:
+            self.assertEqual(len(wordlist), 100)
+            self.assertEqual(wordlist[0], "word0")
+            self.assertEqual(wordlist[99], "word99")
+            with self.assertRaises(IndexError):
+                wordlist[100]
+
+    def test_index_file_reused(self):
+        """Тест повторного использования сохраненного индекса."""
+        Wordlist(self.path).close()
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+        with Wordlist(self.path) as wordlist:
+            self.assertIsNotNone(wordlist._index_map)
+            self.assertEqual(wordlist[42], "word42")
+
+    def test_stale_index_rebuilt(self):
+        """Тест перестроения индекса после изменения списка."""
+        Wordlist(self.path).close()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("alpha\nbeta\n")
+        with Wordlist(self.path) as wordlist:
+            self.assertEqual(len(wordlist), 2)
+            self.assertEqual(wordlist[1], "beta")
+
+    def test_generate_passphrase(self):
+        """Тест генерации фразы из заданного числа слов."""
+        with Wordlist(self.path) as wordlist:
+            phrase = generate_passphrase(wordlist, 5, " ")
+        parts = phrase.split(" ")
+        self.assertEqual(len(parts), 5)
+        self.assertTrue(all(p in self.words for p in parts))
+
+    def test_batch_generation(self):
+        """Тест пакетной и потоковой генерации фраз."""
+        with Wordlist(self.path) as wordlist:
+            phrases = generate_passphrases(20, wordlist, 3)
+            batches = list(iter_passphrases(10, wordlist, 3, batch_size=4))
+        self.assertEqual(len(phrases), 20)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+
+    def test_empty_wordlist(self):
+        """Тест ошибки для пустого списка слов."""
+        empty = os.path.join(self.temp_dir, "empty.txt")
+        open(empty, 'w').close()
+        with self.assertRaises(ValueError):
+            Wordlist(empty)
+
+
+class TestDefaultWordlist(unittest.TestCase):
+    """Тестирует список слов, поставляемый с пакетом."""
+
+    def test_default_wordlist_ships_with_package(self):
+        """Тест: список по умолчанию не зависит от текущего каталога."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        self.addCleanup(os.chdir, cwd)
+
+        # Каталог пакета может быть доступен только для чтения
+        with patch.object(Wordlist, '_index_path', return_value=os.path.join(temp_dir, "idx")):
+            with Wordlist() as wordlist:
+                words = [wordlist[i] for i in range(len(wordlist))]
+        self.assertTrue(os.path.isabs(WORDLIST_FILE))
+        # Фраза по умолчанию не слабее 6 слов Diceware (7776 слов)
+        self.assertGreaterEqual(DEFAULT_WORDS * math.log2(len(words)), 6 * math.log2(7776))
+        self.assertEqual(len(set(words)), len(words))
+        self.assertTrue(all(word.isascii() and word.isalpha() for word in words))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Тесты для модуля pattern.py - генерации паролей по шаблону."""
+
+import re
+import string
+import unittest
+from passgen.pattern import compile_pattern, generate_from_pattern
+
+
+class TestPattern(unittest.TestCase):
+    """Тестирует компиляцию шаблонов и генерацию по ним."""
+
+    def test_compiled_pattern_is_cached(self):
+        """Тест кеширования скомпилированного шаблона."""
+        self.assertIs(compile_pattern("Cvcc-9999"), compile_pattern("Cvcc-9999"))
+
+    def test_format(self):
+        """Тест соответствия паролей шаблону Cvcc-9999-ssss."""
+        punct = re.escape(string.punctuation)
+        regex = re.compile(
+            rf"[B-DF-HJ-NP-TV-XZ][aeiouy][b-df-hj-np-tv-xz]{{2}}-\d{{4}}-[{punct}]{{4}}"
+        )
+        passwords = generate_from_pattern("Cvcc-9999-ssss", 500)
+        self.assertEqual(len(passwords), 500)
+        for password in passwords:
+            self.assertRegex(password, regex)
+
+    def test_escape_literals(self):
+        """Тест экранирования символов классов."""
+        password = generate_from_pattern(r"\9\s-99")[0]
+        self.assertEqual(password[:3], "9s-")
+        self.assertTrue(password[3:].isdigit())
+
+    def test_positions_are_independent(self):
+        """Тест того, что позиции с одним алфавитом не повторяют друг друга."""
+        passwords = generate_from_pattern("99999999", 200)
+        self.assertGreater(len(set(passwords)), 190)
+
+    def test_invalid_patterns(self):
+        """Тест ошибок для пустого шаблона и одиночного обратного слеша."""
+        with self.assertRaises(ValueError):
+            compile_pattern("")
+        with self.assertRaises(ValueError):
+            compile_pattern("abc\\")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Тесты для модуля policy.py - скомпилированных политик генерации."""
+
+import string
+import unittest
+from passgen.policy import AMBIGUOUS_CHARS, compile_policy
+
+
+class TestPasswordPolicy(unittest.TestCase):
+    """Тестирует compile_policy и PasswordPolicy."""
+
+    def test_compiled_policy_is_cached(self):
+        """Тест кеширования политики по параметрам."""
+        self.assertIs(compile_policy(16, require_all=True),
+                      compile_policy(16, require_all=True))
+
+    def test_require_all_guarantees_every_class(self):
+        """Тест наличия каждого класса при require_all даже в коротком пароле."""
+        policy = compile_policy(4, require_all=True)
+        for password in policy.generate_many(500):
+            self.assertEqual(len(password), 4)
+            self.assertTrue(any(c in string.ascii_lowercase for c in password))
+            self.assertTrue(any(c in string.ascii_uppercase for c in password))
+            self.assertTrue(any(c in string.digits for c in password))
+            self.assertTrue(any(c in string.punctuation for c in password))
+
+    def test_minimum_counts(self):
+        """Тест минимального количества символов по классам."""
+        policy = compile_policy(10, False, False, False, min_digits=3, min_uppercase=2)
+        for password in policy.generate_many(200):
+            self.assertGreaterEqual(sum(c in string.digits for c in password), 3)
+            self.assertGreaterEqual(sum(c in string.ascii_uppercase for c in password), 2)
+            self.assertFalse(any(c in string.punctuation for c in password))
+
+    def test_exclude_ambiguous(self):
+        """Тест исключения похожих символов."""
+        policy = compile_policy(64, exclude_ambiguous=True, require_all=True)
+        chars = ''.join(policy.generate_many(50))
+        self.assertFalse(set(chars) & set(AMBIGUOUS_CHARS))
+
+    def test_custom_alphabet(self):
+        """Тест собственного алфавита с обязательной цифрой."""
+        policy = compile_policy(8, alphabet="abc123", require_all=True)
+        self.assertEqual([name for name, _, _ in policy.requirements],
+                         ["lowercase", "digits"])
+        for password in policy.generate_many(100):
+            self.assertTrue(set(password) <= set("abc123"))
+            self.assertTrue(any(c in "123" for c in password))
+
+    def test_required_chars_shuffled(self):
+        """Тест: обязательный символ равновероятно занимает любую позицию."""
+        policy = compile_policy(4, False, True, False, min_digits=1)
+        counts = [0] * 4
+        for password in policy.generate_many(4000):
+            self.assertEqual(len(password), 4)
+            for position, char in enumerate(password):
+                counts[position] += char in string.digits
+        # Ожидается около 1000 + 4000 * 3 * 10/36 / 4 ≈ 1833 на позицию
+        for count in counts:
+            self.assertGreater(count, 1600)
+            self.assertLess(count, 2070)
+
+    def test_non_ascii_alphabet(self):
+        """Тест пакетной генерации из алфавита с не-ASCII символами."""
+        policy = compile_policy(6, alphabet="абв12", require_all=True)
+        for password in policy.generate_many(20):
+            self.assertEqual(len(password), 6)
+            self.assertTrue(set(password) <= set("абв12"))
+            self.assertTrue(any(c in "12" for c in password))
+
+    def test_missing_required_class(self):
+        """Тест ошибки, если в алфавите нет символов обязательного класса."""
+        with self.assertRaises(ValueError):
+            compile_policy(8, alphabet="abc", min_digits=1)
+
+    def test_generate_too_short(self):
+        """Тест ошибки генерации при длине меньше суммы минимумов."""
+        policy = compile_policy(2, min_digits=2, min_special=1)
+        self.assertEqual(policy.min_length, 3)
+        with self.assertRaises(ValueError):
+            policy.generate()
+        with self.assertRaises(ValueError):
+            policy.generate_many(10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Тесты для модуля pool.py - пула соединений."""
+
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from passgen.pool import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Тестирует класс ConnectionPool."""
+
+    def setUp(self):
+        """Каждый вызов psycopg2.connect возвращает новое открытое соединение."""
+        self.connections = []
+        patcher = patch('psycopg2.connect', side_effect=self._connect)
+        self.mock_connect = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _connect(self, **params):
+        conn = MagicMock()
+        conn.closed = 0
+        conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        self.connections.append(conn)
+        return conn
+
+    def test_connection_reused(self):
+        """Тест: последовательные запросы используют одно соединение."""
+        pool = ConnectionPool(minconn=1, maxconn=2, dbname="db")
+        with pool.connection():
+            pass
+        with pool.connection():
+            pass
+        self.assertEqual(self.mock_connect.call_count, 1)
+        self.mock_connect.assert_called_with(dbname="db")
+
+    def test_broken_connection_discarded(self):
+        """Тест: после ошибки связи соединение заменяется новым."""
+        pool = ConnectionPool(minconn=1, maxconn=2)
+        with self.assertRaises(psycopg2.OperationalError):
+            with pool.connection():
+                raise psycopg2.OperationalError("server closed the connection")
+        with pool.connection():
+            pass
+        self.assertEqual(self.mock_connect.call_count, 2)
+        self.connections[0].close.assert_called()
+
+    def test_idle_connection_checked(self):
+        """Тест: простаивавшее соединение проверяется и при ошибке заменяется."""
+        pool = ConnectionPool(minconn=1, maxconn=2, health_check_interval=0)
+        with pool.connection():
+            pass
+        conn = self.connections[0]
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = psycopg2.OperationalError("gone")
+
+        with pool.connection():
+            pass
+        cursor.execute.assert_called_once_with("SELECT 1")
+        conn.close.assert_called()
+        self.assertEqual(self.mock_connect.call_count, 2)
+
+    def test_waits_instead_of_exhausting(self):
+        """Тест: потоков больше, чем соединений, — ошибки исчерпания нет."""
+        pool = ConnectionPool(minconn=0, maxconn=2)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    with pool.connection():
+                        pass
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_invalid_sizes(self):
+        """Тест некорректных размеров пула."""
+        with self.assertRaises(ValueError):
+            ConnectionPool(minconn=3, maxconn=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
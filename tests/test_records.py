@@ -0,0 +1,61 @@
+"""Тесты для модуля records.py - записей с ленивой расшифровкой."""
+
+import unittest
+from unittest.mock import patch
+from passgen.crypto_engine import CryptoEngine, DECRYPT_ERROR
+from passgen.records import PasswordRecord, MASKED_PASSWORD, decrypt_records
+
+
+class TestPasswordRecord(unittest.TestCase):
+    """Тестирует класс PasswordRecord."""
+
+    @patch('passgen.crypto_engine.decrypt_password')
+    def test_lazy_decrypt_once(self, mock_decrypt):
+        """Тест: расшифровка при первом обращении и только один раз."""
+        mock_decrypt.return_value = "plain"
+        record = PasswordRecord("user", "service", b"\x80token", "2024-01-01")
+
+        self.assertFalse(record.is_decrypted)
+        mock_decrypt.assert_not_called()
+        self.assertEqual(record.password, "plain")
+        self.assertEqual(record.password, "plain")
+        mock_decrypt.assert_called_once_with(b"\x80token")
+        self.assertTrue(record.is_decrypted)
+
+    @patch('passgen.crypto_engine.decrypt_password')
+    def test_decrypt_error(self, mock_decrypt):
+        """Тест: поврежденная запись не ломает вывод."""
+        mock_decrypt.side_effect = ValueError("bad token")
+        record = PasswordRecord("user", "service", b"broken")
+        self.assertEqual(record.password, DECRYPT_ERROR)
+
+    def test_masked_record(self):
+        """Тест записи без пароля."""
+        record = PasswordRecord("user", "service")
+        self.assertFalse(record.has_password)
+        self.assertEqual(record.password, MASKED_PASSWORD)
+
+    def test_dict_access_and_slots(self):
+        """Тест доступа по ключу и отсутствия __dict__."""
+        record = PasswordRecord("user", "service", None, "2024-01-01")
+        self.assertEqual(record['username'], "user")
+        self.assertEqual(record['created_at'], "2024-01-01")
+        with self.assertRaises(KeyError):
+            record['_token']
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    @patch('passgen.crypto_engine.decrypt_password')
+    def test_decrypt_records_batch(self, mock_decrypt):
+        """Тест пакетной расшифровки через CryptoEngine."""
+        mock_decrypt.side_effect = lambda token: token.decode()
+        records = [PasswordRecord("u", f"s{i}", f"p{i}".encode()) for i in range(3)]
+
+        decrypt_records(records, CryptoEngine())
+
+        self.assertTrue(all(r.is_decrypted for r in records))
+        self.assertEqual([r.password for r in records], ["p0", "p1", "p2"])
+        self.assertEqual(mock_decrypt.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+"""Интеграционные тесты встроенного хранилища SQLite (без внешних сервисов)."""
+
+import base64
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+
+from passgen.backend import StorageBackend, create_database
+from passgen.records import MASKED_PASSWORD
+from passgen.sqlite_backend import LATEST_VERSION, SQLitePasswordDatabase
+from passgen.storage import KeyManager
+
+
+class TestSQLitePasswordDatabase(unittest.TestCase):
+    """Тестирует SQLitePasswordDatabase на временном файле."""
+
+    def setUp(self):
+        """Создает временный каталог с файлом ключей и базой."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.key_manager = KeyManager(os.path.join(self.tmpdir, "test.key"))
+        key_patch = patch('passgen.storage._key_manager', self.key_manager)
+        key_patch.start()
+        self.addCleanup(key_patch.stop)
+
+        self.path = os.path.join(self.tmpdir, "passgen.db")
+        self.db = SQLitePasswordDatabase(self.path)
+        self.addCleanup(self.db.close)
+        self.db.migrate()
+
+    def test_migrate_creates_schema_in_wal_mode(self):
+        """Тест: миграции применяются один раз, файл в режиме WAL."""
+        self.assertTrue(self.db.schema_is_current())
+        self.assertEqual(self.db.migrate(), [])
+
+        conn = sqlite3.connect(self.path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], LATEST_VERSION)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(passwords)")}
+        self.assertIn("passwords_service_username_idx", indexes)
+        self.assertIn("passwords_service_lower_idx", indexes)
+
+    def test_new_file_is_not_current(self):
+        """Тест: новый файл требует --migrate."""
+        db = SQLitePasswordDatabase(os.path.join(self.tmpdir, "new.db"))
+        self.addCleanup(db.close)
+        self.assertFalse(db.schema_is_current())
+        self.assertEqual(db.migrate(), list(range(1, LATEST_VERSION + 1)))
+
+    def test_save_and_get_password_upsert(self):
+        """Тест: повторное сохранение пары заменяет пароль."""
+        self.db.save_password("alice", "github", "first")
+        self.db.save_password("alice", "github", "second")
+
+        self.assertEqual(self.db.get_password("alice", "github"), "second")
+        self.assertIsNone(self.db.get_password("alice", "gitlab"))
+        self.assertEqual(len(self.db.get_all_records()), 1)
+
+    def test_searches_and_records(self):
+        """Тест поиска по пользователю, сервису и списка всех записей."""
+        self.assertEqual(self.db.save_passwords([
+            ("alice", "github", "p1"), ("alice", "gitlab", "p2"),
+            ("bob", "github", "p3"), ("alice", "github", "p4"),
+        ]), 3)
+
+        self.assertEqual(self.db.search_by_username("alice"),
+                         [("github", "p4"), ("gitlab", "p2")])
+        self.assertEqual(self.db.search_by_service("github"),
+                         [("alice", "p4"), ("bob", "p3")])
+
+        records = self.db.get_all_records()
+        self.assertEqual([(r.username, r.service) for r in records],
+                         [("alice", "github"), ("alice", "gitlab"), ("bob", "github")])
+        self.assertFalse(records[0].is_decrypted)
+        self.db.decrypt_records(records)
+        self.assertEqual([r.password for r in records], ["p4", "p2", "p3"])
+        self.assertIsNotNone(records[0].created_at.year)
+
+        masked = self.db.get_all_records(with_passwords=False)
+        self.assertEqual(masked[0].password, MASKED_PASSWORD)
+
+    def test_pages_follow_cursor(self):
+        """Тест: страницы покрывают все записи без повторов."""
+        self.db.save_passwords((f"user{i:02}", "svc", f"p{i}") for i in range(7))
+
+        seen, cursor = [], None
+        while True:
+            page = self.db.get_records_page(3, cursor)
+            seen.extend(r.username for r in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f"user{i:02}" for i in range(7)])
+
+        page = self.db.search_by_service_page("svc", 5)
+        self.assertEqual(len(page.items), 5)
+        rest = self.db.search_by_service_page("svc", 5, page.next_cursor)
+        self.assertEqual(rest.items, [("user05", "p5"), ("user06", "p6")])
+        self.assertIsNone(rest.next_cursor)
+
+        with self.assertRaises(ValueError):
+            self.db.get_records_page(3, "испорчен")
+
+    def test_search_like_prefix_first(self):
+        """Тест: сначала совпадения по префиксу без учета регистра, затем подстроки."""
+        self.db.save_passwords([
+            ("u", "GitHub", "p1"), ("u", "my-github", "p2"),
+            ("u", "gitlab", "p3"), ("u", "google", "p4"),
+        ])
+
+        found = self.db.search_like("service", "git")
+        self.assertEqual([r.service for r in found], ["GitHub", "gitlab", "my-github"])
+        self.assertEqual(found[0].password, "p1")
+
+        # Короткая строка ищется только по префиксу
+        self.assertEqual([r.service for r in self.db.search_like("service", "g")],
+                         ["GitHub", "gitlab", "google"])
+        self.assertEqual(len(self.db.search_like("service", "git", limit=1)), 1)
+        with self.assertRaises(ValueError):
+            self.db.search_like("password", "x")
+
+    def test_import_last_line_wins(self):
+        """Тест: импорт пакетами, при повторе пары побеждает последняя строка."""
+        self.db.save_password("alice", "github", "old")
+        progress = []
+        merged = self.db.import_records(
+            [[("alice", "github", "new"), ("bob", "x", "1")],
+             [("bob", "x", "2")]],
+            progress=progress.append,
+        )
+
+        self.assertEqual(merged, 2)
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(self.db.get_password("alice", "github"), "new")
+        self.assertEqual(self.db.get_password("bob", "x"), "2")
+
+    def test_import_error_rolls_back(self):
+        """Тест: ошибка посреди импорта не оставляет частичных данных."""
+        def batches():
+            yield [("alice", "github", "p")]
+            raise RuntimeError("обрыв")
+
+        with self.assertRaises(RuntimeError):
+            self.db.import_records(batches())
+        self.assertEqual(self.db.get_all_records(), [])
+
+    def test_iter_records_streams_decrypted(self):
+        """Тест: потоковая выборка в порядке (username, service)."""
+        self.db.save_passwords((f"u{i}", "s", f"p{i}") for i in range(5))
+
+        records = list(self.db.iter_records(batch_size=2))
+        self.assertEqual([r.username for r in records], [f"u{i}" for i in range(5)])
+        self.assertTrue(all(r.is_decrypted for r in records))
+        self.assertEqual(records[4].password, "p4")
+
+    def test_migrate_storage_and_rekey(self):
+        """Тест: строки v1 переводятся в v2 и перешифровываются новым ключом."""
+        old_key = self.key_manager.get_keys()[0]
+        v1 = base64.b64encode(Fernet(old_key).encrypt(b"legacy")).decode()
+        conn = sqlite3.connect(self.path)
+        with conn:
+            conn.execute("INSERT INTO passwords (username, service, encrypted_password) "
+                         "VALUES ('old', 'svc', ?)", (v1,))
+        conn.close()
+        self.db.save_password("new", "svc", "fresh")
+
+        self.assertEqual(self.db.get_password("old", "svc"), "legacy")
+        self.assertEqual(self.db.migrate_storage(), 1)
+        self.assertEqual(self.db.get_password("old", "svc"), "legacy")
+
+        self.key_manager.add_key()
+        checkpoint_file = os.path.join(self.tmpdir, "rekey.checkpoint")
+        result = self.db.rekey(batch_size=1, checkpoint_file=checkpoint_file)
+        self.assertEqual(result, {'rekeyed': 2, 'failed': 0})
+        self.assertFalse(os.path.exists(checkpoint_file))
+
+        # Старый ключ больше не нужен
+        new_key = self.key_manager.get_keys()[0]
+        with open(self.key_manager.path, 'wb') as f:
+            f.write(new_key)
+        self.key_manager.invalidate()
+        self.assertEqual(self.db.search_by_service("svc"),
+                         [("new", "fresh"), ("old", "legacy")])
+
+    def test_connection_per_thread(self):
+        """Тест: каждый поток работает через собственное соединение."""
+        errors = []
+
+        def worker(n):
+            try:
+                self.db.save_password(f"user{n}", "svc", f"p{n}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.db.search_by_service("svc")), 4)
+
+
+class TestCreateDatabase(unittest.TestCase):
+    """Тестирует выбор хранилища по config.BACKEND."""
+
+    def test_sqlite_backend_from_config(self):
+        """Тест: BACKEND = "sqlite" создает хранилище в файле из SQLITE."""
+        path = os.path.join(tempfile.mkdtemp(), "passgen.db")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with patch('passgen.config.BACKEND', 'sqlite'), \
+                patch('passgen.config.SQLITE', {"path": path}):
+            db = create_database()
+        self.addCleanup(db.close)
+
+        self.assertIsInstance(db, SQLitePasswordDatabase)
+        self.assertIsInstance(db, StorageBackend)
+        self.assertEqual(db.path, path)
+
+    def test_unknown_backend(self):
+        """Тест: неизвестное хранилище отклоняется."""
+        with self.assertRaises(ValueError):
+            create_database("mysql")
+
+
+if __name__ == '__main__':
+    unittest.main()
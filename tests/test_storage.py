@@ -6,7 +6,10 @@ import tempfile
 from unittest.mock import patch, mock_open
 from cryptography.fernet import Fernet
 import base64
-from passgen.storage import get_encryption_key, encrypt_password, decrypt_password
+from passgen.storage import (
+    KeyManager, get_encryption_key, encrypt_password, decrypt_password,
+    encrypt_token, convert_v1_to_v2, rotate_token
+)
 
 
 class TestStorage(unittest.TestCase):
@@ -64,7 +67,7 @@ class TestStorage(unittest.TestCase):
         # Создаем временный ключ для теста
         test_key = Fernet.generate_key()
         
-        with patch('passgen.storage.get_encryption_key', return_value=test_key):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
             original_password = "MySuperSecretPassword123!@#"
             
             # Шифруем пароль
@@ -90,7 +93,7 @@ class TestStorage(unittest.TestCase):
         """
         test_key = Fernet.generate_key()
         
-        with patch('passgen.storage.get_encryption_key', return_value=test_key):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
             password1 = "password1"
             password2 = "password2"
             
@@ -106,7 +109,7 @@ class TestStorage(unittest.TestCase):
         """
         test_key = Fernet.generate_key()
         
-        with patch('passgen.storage.get_encryption_key', return_value=test_key):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
             with self.assertRaises(ValueError):
                 decrypt_password("невалидный-base64")
     
@@ -117,12 +120,12 @@ class TestStorage(unittest.TestCase):
         """
         # Шифруем с одним ключом
         key1 = Fernet.generate_key()
-        with patch('passgen.storage.get_encryption_key', return_value=key1):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(key1)):
             encrypted = encrypt_password("test")
         
         # Пытаемся расшифровать с другим ключом
         key2 = Fernet.generate_key()
-        with patch('passgen.storage.get_encryption_key', return_value=key2):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(key2)):
             with self.assertRaises(ValueError):
                 decrypt_password(encrypted)
     
@@ -130,11 +133,33 @@ class TestStorage(unittest.TestCase):
         """Тест шифрования пустого пароля."""
         test_key = Fernet.generate_key()
         
-        with patch('passgen.storage.get_encryption_key', return_value=test_key):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
             encrypted = encrypt_password("")
             decrypted = decrypt_password(encrypted)
             self.assertEqual(decrypted, "")
     
+    def test_v2_token_roundtrip(self):
+        """Тест формата v2: двоичный токен без base64, расшифровка из memoryview."""
+        test_key = Fernet.generate_key()
+        
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
+            token = encrypt_token("пароль")
+            
+            self.assertIsInstance(token, bytes)
+            self.assertEqual(token[0], 0x80)
+            self.assertLess(len(token), len(encrypt_password("пароль")) * 0.6)
+            self.assertEqual(decrypt_password(memoryview(token)), "пароль")
+    
+    def test_reader_accepts_both_formats(self):
+        """Тест чтения v1 как строки, как байт и после конвертации в v2."""
+        test_key = Fernet.generate_key()
+        
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
+            v1 = encrypt_password("secret")
+            self.assertEqual(decrypt_password(v1), "secret")
+            self.assertEqual(decrypt_password(memoryview(v1.encode())), "secret")
+            self.assertEqual(decrypt_password(convert_v1_to_v2(v1)), "secret")
+    
     def test_encrypt_special_characters(self):
         """Тест шифрования паролей со специальными символами."""
         test_key = Fernet.generate_key()
@@ -148,7 +173,7 @@ class TestStorage(unittest.TestCase):
             "null\0byte",
         ]
         
-        with patch('passgen.storage.get_encryption_key', return_value=test_key):
+        with patch('passgen.storage.get_fernet', return_value=Fernet(test_key)):
             for password in test_passwords:
                 with self.subTest(password=password):
                     encrypted = encrypt_password(password)
@@ -156,5 +181,90 @@ class TestStorage(unittest.TestCase):
                     self.assertEqual(decrypted, password)
 
 
+
+class TestKeyManager(unittest.TestCase):
+    """Тестирует кеширование ключей и ротацию через KeyManager."""
+
+    def setUp(self):
+        """Создает файл с одним ключом."""
+        fd, self.key_path = tempfile.mkstemp()
+        self.key = Fernet.generate_key()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.key)
+        self.manager = KeyManager(self.key_path)
+
+    def tearDown(self):
+        """Удаляет файл ключей."""
+        for path in (self.key_path, self.key_path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_fernet_cached_until_file_changes(self):
+        """Тест: файл читается один раз, пока не изменится mtime."""
+        fernet = self.manager.get_fernet()
+        with patch('builtins.open', side_effect=AssertionError("повторное чтение")):
+            self.assertIs(self.manager.get_fernet(), fernet)
+
+        with open(self.key_path, 'wb') as f:
+            f.write(Fernet.generate_key())
+        os.utime(self.key_path, ns=(0, 0))
+        self.assertIsNot(self.manager.get_fernet(), fernet)
+
+    def test_rotation_keeps_old_rows_readable(self):
+        """Тест: после добавления ключа старые токены расшифровываются."""
+        old_token = self.manager.get_fernet().encrypt(b"secret")
+        new_key = self.manager.add_key()
+
+        self.assertEqual(self.manager.get_keys(), [new_key, self.key])
+        fernet = self.manager.get_fernet()
+        self.assertEqual(fernet.decrypt(old_token), b"secret")
+
+        # Новые токены шифруются новым ключом
+        new_token = fernet.encrypt(b"fresh")
+        self.assertEqual(Fernet(new_key).decrypt(new_token), b"fresh")
+        with self.assertRaises(Exception):
+            Fernet(self.key).decrypt(new_token)
+
+    def test_rotate_token_uses_new_key(self):
+        """Тест перешифрования значений v1 и v2 основным ключом."""
+        old_fernet = Fernet(self.key)
+        v1 = base64.b64encode(old_fernet.encrypt(b"v1-secret")).decode()
+        v2 = base64.urlsafe_b64decode(old_fernet.encrypt(b"v2-secret"))
+        new_key = self.manager.add_key()
+
+        with patch('passgen.storage.get_fernet', side_effect=self.manager.get_fernet):
+            for value, expected in ((v1, b"v1-secret"), (memoryview(v2), b"v2-secret")):
+                rotated = rotate_token(value)
+                self.assertEqual(rotated[0], 0x80)
+                token = base64.urlsafe_b64encode(rotated)
+                self.assertEqual(Fernet(new_key).decrypt(token), expected)
+
+            with self.assertRaises(ValueError):
+                rotate_token(b"\x80garbage")
+
+    def test_aead_cipher_reads_fernet_rows(self):
+        """Тест: после переключения на AES-GCM строки Fernet читаются."""
+        with patch('passgen.storage.get_fernet', side_effect=self.manager.get_fernet), \
+                patch('passgen.storage.get_cipher', side_effect=self.manager.get_cipher):
+            fernet_token = encrypt_token("old")
+            with patch('passgen.storage.get_cipher_name', return_value="aes-gcm"):
+                aead_token = encrypt_token("new")
+                rotated = rotate_token(fernet_token)
+
+            self.assertEqual(fernet_token[0], 0x80)
+            self.assertEqual(aead_token[0], 0x01)
+            self.assertLess(len(aead_token), len(fernet_token))
+            self.assertEqual(rotated[0], 0x01)
+            for token, expected in ((fernet_token, "old"), (memoryview(aead_token), "new"),
+                                    (rotated, "old")):
+                self.assertEqual(decrypt_password(token), expected)
+
+    def test_missing_file_creates_key(self):
+        """Тест создания ключа при отсутствии файла."""
+        os.remove(self.key_path)
+        self.assertEqual(len(self.manager.get_keys()), 1)
+        self.assertTrue(os.path.exists(self.key_path))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
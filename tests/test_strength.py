@@ -0,0 +1,124 @@
+"""Тесты для модуля strength.py - оценки стойкости паролей."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from passgen.generator import generate_passwords
+from passgen.strength import (
+    DictionaryIndex, load_dictionary, score_password, score_passwords
+)
+
+
+class TestStrength(unittest.TestCase):
+    """Тестирует функции оценки стойкости паролей."""
+
+    def test_charset_size(self):
+        """Тест определения размера алфавита по классам символов."""
+        self.assertEqual(score_password("abcxyz")['charset'], 26)
+        self.assertEqual(score_password("aB3")['charset'], 62)
+        self.assertEqual(score_password("aB3!")['charset'], 94)
+
+    def test_keyboard_walk_and_sequence(self):
+        """Тест штрафа за обход клавиатуры и последовательности."""
+        walk = score_password("qwertyuiop")
+        random_like = score_password("qjxmtbzkwv")
+        self.assertLess(walk['entropy'], random_like['entropy'])
+        self.assertIn("последовательности или повторы символов", walk['warnings'])
+        self.assertLess(score_password("abcdef123456")['score'], 2)
+
+    def test_dictionary_hit_with_leet(self):
+        """Тест поиска словарного слова с заменами leet."""
+        result = score_password("P@ssw0rd!")
+        self.assertTrue(any("password" in w for w in result['warnings']))
+        self.assertLessEqual(result['score'], 1)
+
+    def test_custom_dictionary(self):
+        """Тест загрузки словаря из файла."""
+        fd, path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write("11111\tkorova\n11112\tmoloko\n")
+        try:
+            dictionary = load_dictionary(path)
+            self.assertIn("korova", dictionary)
+            result = score_password("Korova7", dictionary)
+            self.assertTrue(any("korova" in w for w in result['warnings']))
+        finally:
+            os.remove(path)
+            os.remove(path + ".dictidx")
+
+    def test_generated_passwords_are_strong(self):
+        """Тест высокой оценки случайных паролей длиной 20."""
+        results = list(score_passwords(generate_passwords(100, 20)))
+        self.assertEqual(len(results), 100)
+        self.assertTrue(all(r['score'] >= 3 for r in results))
+
+
+class TestDictionaryIndex(unittest.TestCase):
+    """Тестирует словарный индекс на диске."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, "words.txt")
+        self.write_words("Korova\nmoloko\nёжик\nкот\nkorova\n")
+
+    def write_words(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def open_index(self):
+        index = DictionaryIndex(self.path)
+        self.addCleanup(index.close)
+        return index
+
+    def test_lookup(self):
+        """Тест: поиск бинарным поиском, короткие слова и дубликаты отброшены."""
+        index = self.open_index()
+        for word in ("korova", "moloko", "ёжик", "password"):
+            self.assertIn(word, index)
+        for word in ("кот", "Korova", "korov", "zzzz", "aaaa"):
+            self.assertNotIn(word, index)
+        self.assertEqual(index.max_length, len("trustno1"))
+        self.assertEqual(len(index), 3 + len(index._common))
+
+    def test_index_reused_and_rebuilt(self):
+        """Тест: индекс строится один раз и перестраивается при изменении словаря."""
+        self.open_index()
+        self.assertTrue(os.path.exists(self.path + ".dictidx"))
+        with patch.object(DictionaryIndex, '_build_index') as mock_build:
+            self.assertIn("moloko", self.open_index())
+        mock_build.assert_not_called()
+
+        self.write_words("prostokvasha\n")
+        os.utime(self.path, ns=(0, 0))
+        index = self.open_index()
+        self.assertIn("prostokvasha", index)
+        self.assertNotIn("moloko", index)
+        self.assertEqual(index.max_length, len("prostokvasha"))
+
+    def test_read_only_directory(self):
+        """Тест: без права записи индекс остается в памяти."""
+        real_open = open
+
+        def read_only_open(path, mode='r', *args, **kwargs):
+            if 'w' in mode:
+                raise OSError("только чтение")
+            return real_open(path, mode, *args, **kwargs)
+
+        with patch('builtins.open', read_only_open):
+            index = self.open_index()
+        self.assertIn("moloko", index)
+        self.assertFalse(os.path.exists(self.path + ".dictidx"))
+
+    def test_long_password_checks_only_short_candidates(self):
+        """Тест: кандидаты длиннее самого длинного слова не проверяются."""
+        index = self.open_index()
+        with patch.object(DictionaryIndex, '_lookup', return_value=False) as mock_lookup:
+            score_password("x" * 1000, index)
+        self.assertLessEqual(mock_lookup.call_count, 1000 * index.max_length)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 import unittest
 from unittest.mock import patch
 from io import StringIO
+from passgen.policy import compile_policy
 from passgen.utils import validate_args
 
 
@@ -36,6 +37,20 @@ class TestUtils(unittest.TestCase):
             validate_args(-5, True, True, True)
         self.assertIn("Длина пароля должна быть положительным числом", str(context.exception))
     
+    def test_validate_args_zero_count(self):
+        """Тест ошибки при нулевом количестве паролей."""
+        with self.assertRaises(ValueError) as context:
+            validate_args(10, True, True, True, count=0)
+        self.assertIn("Количество паролей", str(context.exception))
+
+    def test_validate_args_against_policy(self):
+        """Тест проверки длины по скомпилированной политике."""
+        policy = compile_policy(4, min_digits=3, min_special=2)
+        with self.assertRaises(ValueError) as context:
+            validate_args(4, True, True, True, policy=policy)
+        self.assertIn("суммы минимумов", str(context.exception))
+        validate_args(5, True, True, True, policy=policy)
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_warning_when_no_char_types(self, mock_stdout):
         """Тест предупреждения при отсутствии типов символов.